@@ -2,21 +2,70 @@
 Main FastAPI application module.
 Defines API endpoints for authentication, employee data retrieval, and updates.
 """
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from src.backend.database import SessionLocal, engine, Base
-from src.backend import database, models, crud, data_setup
+from src.backend import database, models, crud, data_setup, translation, ml_logic, retraining, feature_store, metrics, query_profiler, request_profiler, tracing, serialization, compression, auth, workers
 from src.backend.migrate_db import migrate_database
+import numpy as np
+import os
 import pandas as pd
+import time
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Applies pending database migrations, loads the attrition model and the feature store once
+    at startup, starts background retraining and releases long-lived resources (translation
+    workers) on shutdown. With several worker processes, the first one to start does the
+    migrations and builds the model and the feature store; the others then reuse them.
+    """
+    with workers.startup_lock():
+        migrate_database(engine)
+        try:
+            ml_logic.ensure_model(engine)
+        except Exception as e:
+            print(f"Attrition model unavailable: {e}")
+        try:
+            model = ml_logic.get_model()
+            with SessionLocal() as db:
+                feature_store.ensure_store(db, model.categories if model else None)
+        except Exception as e:
+            print(f"Feature store unavailable: {e}")
+    retraining.start(database.SQLALCHEMY_DATABASE_URL)
+    yield
+    await retraining.stop()
+    await translation.shutdown()
+
 
-Base.metadata.create_all(bind=engine)
-# Migrate the database to add new columns
-migrate_database()
 app = FastAPI(
     title="RH Performance and Attrition API",
     description="An API to retrieve employees information and performance.",
     version="0.1",
+    lifespan=lifespan,
 ) 
+# Negotiated zstd/brotli/gzip compression of large responses (innermost, so
+# the metrics below record the compressed size and the compression time)
+app.add_middleware(compression.CompressionMiddleware)
+# Bearer token required on every route but auth.PUBLIC_PATHS
+app.add_middleware(auth.AuthMiddleware)
+# Per-route request metrics, exposed on /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(engine)
+# Statement timing, slow-query log and per-request query counts
+app.add_middleware(query_profiler.QueryProfilerMiddleware)
+query_profiler.instrument_engine(engine)
+# Request and SQL spans, continuing the frontend's traceparent
+if tracing.TRACING_ENABLED:
+    app.add_middleware(tracing.TracingMiddleware)
+    tracing.instrument_engine(engine)
+# On-demand CPU/memory profile of single requests (admin token required)
+if request_profiler.PROFILER_ADMIN_TOKEN:
+    app.add_middleware(request_profiler.RequestProfilerMiddleware)
 
 
 # Dependency to get DB session
@@ -45,40 +94,56 @@ async def root():
 
 @app.post("/register",
             summary="Register RH User",
-            description="Register a new RH user with email and password.",
+            description="Register a new RH user with email and password. Unless AUTH_OPEN_REGISTRATION is set, requires the bearer token of an RH user (except for the first account).",
             response_description="Details of the registered RH user.",
             operation_id="register_rh_user",
             tags = ["authentication"],
             #response_model=models.UserRH,
           )
 
-def register(data: dict, db: Session = Depends(get_db)):
+async def register(data: dict, request: Request, db: Session = Depends(get_db)):
     """
     Registers a new HR user.
-    Checks if the email already exists before creating the user.
-    """
-    if crud.get_rh_user(db, data['email']):
+    Checks if the email already exists before creating the user. Only the
+    bcrypt hash of the password is stored; hashing runs on the auth thread pool.
+    """
+    # Closed registration: accounts are created by a logged-in HR user
+    if auth.AUTH_REQUIRED and not auth.AUTH_OPEN_REGISTRATION:
+        claims, _ = auth.bearer_claims(request.scope["headers"])
+        if claims is None and await run_in_threadpool(crud.has_rh_users, db):
+            raise HTTPException(status_code=403, detail="Registration is closed: ask an HR user to create your account.")
+    if await run_in_threadpool(crud.get_rh_user, db, data['email']):
         raise HTTPException(status_code=400, detail="Email already registered.")
-    return crud.create_rh_user(db, data['email'], data['password'])
+    if auth.password_too_long(data['password']):
+        raise HTTPException(status_code=400, detail=f"Password longer than {auth.MAX_PASSWORD_BYTES} bytes.")
+    password_hash = await auth.hash_password_async(data['password'])
+    user = await run_in_threadpool(crud.create_rh_user, db, data['email'], password_hash)
+    return {"email": user.email}
 
 
 
 @app.post("/login",
           summary="Login RH User",
           description="Authenticate an RH user using email and password.",
-          response_description="Login status and message.",
+          response_description="Login status and, on success, a bearer access token.",
           operation_id="login_rh_user",
           tags=["authentication"]
           )
-def login(data: dict, db: Session = Depends(get_db)):
+async def login(data: dict, db: Session = Depends(get_db)):
     """
     Authenticates an HR user.
-    Verifies email and password against the database.
+    Verifies the password against its bcrypt hash on the auth thread pool and
+    returns a signed access token to send as `Authorization: Bearer <token>`.
     """
-    user = crud.get_rh_user(db, data['email'])
-    if not user or user.password != data['password']:
+    user = await run_in_threadpool(crud.get_rh_user, db, data['email'])
+    if not await auth.verify_password_async(data['password'], user.password if user else None):
         return {"status": "error", "message": "Incorrect credentials. Please sign up or try again."}
-    return {"status": "success"}
+    return {
+        "status": "success",
+        "access_token": auth.create_token(user.email),
+        "token_type": "bearer",
+        "expires_in": auth.AUTH_TOKEN_TTL_SECONDS,
+    }
 
 
 
@@ -86,16 +151,19 @@ def login(data: dict, db: Session = Depends(get_db)):
          summary="Get All Employees",
          description="Retrieve a list of all employees in the database.",
          response_description="List of employee objects.",
+         response_model=list[models.EmployeeOut],
+         response_class=serialization.JSONBytesResponse,
          operation_id="get_all_employees",
          tags=["employees"]
          )
 def read_employees(db: Session = Depends(get_db)):
     """
     Retrieves a list of all employees.
+    Rows are read with Core and encoded directly, without building ORM objects.
     """
-    emp = crud.get_employee_data(db)
-    if not emp: raise HTTPException(status_code=404, detail="Employee data not found")
-    return emp
+    keys, rows = crud.get_employee_rows(db)
+    if not rows: raise HTTPException(status_code=404, detail="Employee data not found")
+    return serialization.rows_response(keys, rows)
 
 
 
@@ -103,6 +171,8 @@ def read_employees(db: Session = Depends(get_db)):
          summary="Get Employee by ID",
          description="Retrieve detailed information for a specific employee by their ID.",
          response_description="Employee object.",
+         response_model=models.EmployeeOut,
+         response_class=serialization.JSONBytesResponse,
          operation_id="get_employee_by_id",
          tags=["employees"]
          )
@@ -110,15 +180,17 @@ def read_employee(emp_id: int, db: Session = Depends(get_db)):
     """
     Retrieves detailed information for a specific employee by ID.
     """
-    emp = crud.get_employee(db, emp_id)
-    if not emp: raise HTTPException(status_code=404, detail="Employee not found")
-    return emp
+    keys, row = crud.get_employee_row(db, emp_id)
+    if not row: raise HTTPException(status_code=404, detail="Employee not found")
+    return serialization.row_response(keys, row)
 
 
 @app.get("/sales",
          summary="Get Sales Department Data",
          description="Retrieve all employees belonging to the Sales department.",
          response_description="List of employees in Sales.",
+         response_model=list[models.DepartmentEmployeeOut],
+         response_class=serialization.JSONBytesResponse,
          operation_id="get_sales_data",
          tags=["departments"]
          )
@@ -126,10 +198,10 @@ def get_sales_data(db: Session = Depends(get_db)):
     """
     Retrieves data for all employees in the Sales department.
     """
-    sale_data = crud.get_data_sales_department(db)
+    keys, sale_data = crud.get_department_rows(db, models.Sales)
     if not sale_data:
         raise HTTPException(status_code=404, detail="Sales department data not found")
-    return sale_data
+    return serialization.rows_response(keys, sale_data)
 
 
 # Function to get statistics for Sales department
@@ -140,6 +212,7 @@ def get_sales_data(db: Session = Depends(get_db)):
          operation_id="get_sales_stats",
          tags=["analytics"]
          )
+@workers.cached_by_data_version
 def get_sales_stats(db: Session = Depends(get_db)):
     """
     Calculates and returns key statistics for the Sales department:
@@ -166,6 +239,8 @@ def get_sales_stats(db: Session = Depends(get_db)):
          summary="Get R&D Department Data",
          description="Retrieve all employees belonging to the Research & Development department.",
          response_description="List of employees in R&D.",
+         response_model=list[models.DepartmentEmployeeOut],
+         response_class=serialization.JSONBytesResponse,
          operation_id="get_rd_data",
          tags=["departments"]
          )
@@ -173,10 +248,10 @@ def get_rd_data(db: Session = Depends(get_db)):
     """
     Retrieves data for all employees in the Research & Development department.
     """
-    rd_data = crud.get_data_rd_department(db)
+    keys, rd_data = crud.get_department_rows(db, models.RD)
     if not rd_data:
         raise HTTPException(status_code=404, detail="R&D department data not found")
-    return rd_data
+    return serialization.rows_response(keys, rd_data)
 
 
 # Function to get statistics for R&D department
@@ -187,6 +262,7 @@ def get_rd_data(db: Session = Depends(get_db)):
          operation_id="get_rd_stats",
          tags=["analytics"]
          )
+@workers.cached_by_data_version
 def get_rd_stats(db: Session = Depends(get_db)):
     """
     Calculates and returns key statistics for the R&D department:
@@ -213,6 +289,8 @@ def get_rd_stats(db: Session = Depends(get_db)):
          summary="Get HR Department Data",
          description="Retrieve all employees belonging to the Human Resources department.",
          response_description="List of employees in HR.",
+         response_model=list[models.DepartmentEmployeeOut],
+         response_class=serialization.JSONBytesResponse,
          operation_id="get_hr_data",
          tags=["departments"]
          )
@@ -220,10 +298,10 @@ def get_hr_data(db: Session = Depends(get_db)):
     """
     Retrieves data for all employees in the Human Resources department.
     """
-    hr_data = crud.get_data_hr_department(db)
+    keys, hr_data = crud.get_department_rows(db, models.HR)
     if not hr_data:
         raise HTTPException(status_code=404, detail="HR department data not found")
-    return hr_data
+    return serialization.rows_response(keys, hr_data)
 
 
 
@@ -235,6 +313,7 @@ def get_hr_data(db: Session = Depends(get_db)):
          operation_id="get_hr_stats",
          tags=["analytics"]
          )
+@workers.cached_by_data_version
 def get_hr_stats(db: Session = Depends(get_db)):
     """
     Calculates and returns key statistics for the HR department:
@@ -265,6 +344,7 @@ def get_hr_stats(db: Session = Depends(get_db)):
          operation_id="get_global_stats",
          tags=["analytics"]
          )
+@workers.cached_by_data_version
 def get_stats(db: Session = Depends(get_db)):
     """
     Calculates and returns global statistics for the entire company:
@@ -320,10 +400,10 @@ def update_evaluation_note(data: dict, db: Session = Depends(get_db)):
     """
     Updates the specific evaluation note (0-10) for an employee.
     """
-    emp = crud.get_employee(db, data['id'])
+    emp = crud.update_employee_evaluation_note(db, data['id'], data['evaluation_note'])
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
-    return crud.update_employee_evaluation_note(db, data['id'], data['evaluation_note'])
+    return emp
 
 @app.post("/update_comment",
           summary="Update Employee Comment",
@@ -336,10 +416,10 @@ def update_comment(data: dict, db: Session = Depends(get_db)):
     """
     Updates the textual comment/feedback for an employee.
     """
-    emp = crud.get_employee(db, data['id'])
+    emp = crud.update_employee_comment(db, data['id'], data['comment'])
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
-    return crud.update_employee_comment(db, data['id'], data['comment'])
+    return emp
 
 
 @app.post("/add_employee",
@@ -394,14 +474,367 @@ def add_employee(data: dict, db: Session = Depends(get_db)):
         db.add(new_emp)
         db.commit()
         db.refresh(new_emp)
-        
-        return {
-            "status": "success", 
-            "id": new_id, 
-            "message": "Employee successfully registered.",
-            "data": emp_data
-        }
-        
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    # The employee is committed: a failure below must not turn into an error
+    # that makes the client retry (duplicate id, or a second employee with auto_id)
+    try:
+        feature_store.upsert_employee(emp_data, workers.data_version(db))
+        retraining.record_change()
+    except Exception as e:
+        print(f"Employee {new_id} saved, but the feature store/retraining update failed: {e}")
+
+    return {
+        "status": "success", 
+        "id": new_id, 
+        "message": "Employee successfully registered.",
+        "data": emp_data
+    }
+
+
+@app.post("/translate",
+          summary="Translate Labels",
+          description="Translate one or more UI labels with the shared Helsinki-NLP model. Concurrent requests are micro-batched.",
+          response_description="The translated labels, in the same order as the input.",
+          operation_id="translate_labels",
+          tags=["localization"]
+          )
+async def translate(data: dict):
+    """
+    Translates a list of labels (`texts`) or a single label (`text`)
+    from `source` to `target` language (defaults: en -> fr).
+    """
+    texts = data.get("texts") or ([data["text"]] if data.get("text") else [])
+    if not texts or not all(isinstance(t, str) for t in texts):
+        raise HTTPException(status_code=400, detail="Provide 'texts' as a list of strings.")
+    source, target = data.get("source", "en"), data.get("target", "fr")
+    if not translation.is_supported(source, target):
+        raise HTTPException(status_code=400, detail=f"Unsupported language pair: {source}->{target}.")
+    try:
+        translations = await translation.translate(texts, source, target)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Translation unavailable: {e}")
+    return {"translations": translations}
+
+
+@app.get("/translate/stats",
+         summary="Translation Model Statistics",
+         description="Loads, cache hits, evictions and resident models of the translator registry.",
+         response_description="Translator registry statistics.",
+         operation_id="get_translation_stats",
+         tags=["localization"]
+         )
+def get_translation_stats():
+    """
+    Returns the translator registry statistics and the supported languages.
+    """
+    return {**translation.registry.stats(), "languages": translation.SUPPORTED_LANGUAGES}
+
+
+@app.post("/predict_attrition",
+          summary="Predict Employee Attrition",
+          description="Predict the probability that an employee leaves, optionally simulating extra years at the company and an extra monthly salary.",
+          response_description="Attrition probability, prediction and model version.",
+          operation_id="predict_attrition",
+          tags=["machine learning"]
+          )
+def predict_attrition(data: dict, db: Session = Depends(get_db)):
+    """
+    Predicts attrition for an existing employee (`id`) or for the employee
+    details given in `employee`, with optional `extra_years` and `extra_salary`.
+    """
+    model = ml_logic.get_model()
+    if model is None:
+        raise HTTPException(status_code=503, detail="Attrition model is not available.")
+
+    if data.get("employee"):
+        if not isinstance(data["employee"], dict):
+            raise HTTPException(status_code=400, detail="'employee' must be an object.")
+        # Features checked here, so bad input is a 400 and not a confident
+        # probability for an employee the caller did not describe
+        employee_data = dict(data["employee"])
+        missing = [col for col in ml_logic.NUMERIC_FEATURES + ml_logic.CATEGORICAL_FEATURES
+                   if employee_data.get(col) in (None, "")]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Missing required fields: {', '.join(missing)}.")
+        invalid = []
+        for col in ml_logic.NUMERIC_FEATURES:
+            try:
+                employee_data[col] = float(employee_data[col])
+            except (TypeError, ValueError):
+                invalid.append(col)
+        if invalid:
+            raise HTTPException(status_code=400, detail=f"Non-numeric values for: {', '.join(invalid)}.")
+    else:
+        emp = crud.get_employee(db, data.get("id"))
+        if not emp:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        employee_data = {col: getattr(emp, col) for col in ml_logic.NUMERIC_FEATURES + ml_logic.CATEGORICAL_FEATURES}
+
+    try:
+        extra_years = int(data.get("extra_years", 0))
+        extra_salary = float(data.get("extra_salary", 0))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid 'extra_years' or 'extra_salary'.")
+
+    probability = ml_logic.predict_attrition_proba(employee_data, extra_years, extra_salary, model=model)
+    return {
+        "id": data.get("id"),
+        "probability": round(probability, 4),
+        "prediction": "Partira" if probability > ml_logic.ATTRITION_THRESHOLD else "Restera",
+        "model_version": model.version,
+    }
+
+
+@app.post("/score_employees",
+          summary="Batch Score Attrition Risk",
+          description="Compute the attrition risk of all employees (or one `department`) and store it in their score.",
+          response_description="Number of rows scored, timings and throughput.",
+          operation_id="score_employees",
+          tags=["machine learning"]
+          )
+def score_employees(data: dict = None, db: Session = Depends(get_db)):
+    """
+    Refreshes `employees.score` with the attrition probability predicted
+    by the current model, for the whole company or one department.
+    """
+    if ml_logic.get_model() is None:
+        raise HTTPException(status_code=503, detail="Attrition model is not available.")
+    department = (data or {}).get("department")
+    result = ml_logic.score_employees(db, department)
+    if not result["rows"]:
+        raise HTTPException(status_code=404, detail="No employees to score.")
+    return result
+
+
+@app.post("/simulate_attrition",
+          summary="Simulate Retention Scenarios",
+          description="Attrition probability over a grid of monthly salary raises x extra years at the company, for one employee (`id`), several (`ids`) or a `department`.",
+          response_description="Mean probability grid (raises x years) and optionally one grid per employee.",
+          operation_id="simulate_attrition",
+          tags=["machine learning"]
+          )
+def simulate_attrition(data: dict, db: Session = Depends(get_db)):
+    """
+    Scores the full what-if grid in one model call. Set `detail` to true to
+    also receive the grid of each employee.
+    """
+    start = time.perf_counter()
+    model = ml_logic.get_model()
+    if model is None:
+        raise HTTPException(status_code=503, detail="Attrition model is not available.")
+
+    ids = data.get("ids") or ([data["id"]] if data.get("id") is not None else None)
+    if not ids and not data.get("department"):
+        raise HTTPException(status_code=400, detail="Provide 'id', 'ids' or 'department'.")
+    if ids is not None:
+        try:
+            # Converted once here: the store and the database paths index by int
+            if not isinstance(ids, list):
+                raise TypeError
+            ids = [int(i) for i in ids]
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="'id' and 'ids' must be integer employee ids.")
+    try:
+        salary_raises = [float(v) for v in data.get("salary_raises", np.linspace(0, 2000, 9))]
+        extra_years = [float(v) for v in data.get("extra_years", range(0, 6))]
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="'salary_raises' and 'extra_years' must be lists of numbers.")
+
+    emp_ids, X = feature_store.employee_matrix(db, model, data.get("department"), ids)
+    if not len(emp_ids):
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    try:
+        grid = ml_logic.simulate_grid(X, salary_raises, extra_years, model=model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = {
+        "salary_raises": salary_raises,
+        "extra_years": extra_years,
+        "employees": int(len(emp_ids)),
+        "mean_probability": grid.mean(axis=0).round(4).tolist(),
+        "model_version": model.version,
+    }
+    if data.get("detail"):
+        result["per_employee"] = {int(emp_id): g.round(4).tolist() for emp_id, g in zip(emp_ids, grid)}
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+@app.post("/optimize_raises",
+          summary="Optimize Raise Budget",
+          description="Split a monthly raise `budget` across a `department` (or the whole company) to minimize expected attrition.",
+          response_description="Raise per employee and the expected drop in attrition.",
+          operation_id="optimize_raises",
+          tags=["machine learning"]
+          )
+def optimize_raises(data: dict, db: Session = Depends(get_db)):
+    """
+    Allocates the budget in steps of `step` (default 100) up to `max_raise`
+    (default 2000) per employee. Only employees receiving a raise are listed.
+    """
+    start = time.perf_counter()
+    model = ml_logic.get_model()
+    if model is None:
+        raise HTTPException(status_code=503, detail="Attrition model is not available.")
+    try:
+        budget = float(data["budget"])
+        step = float(data.get("step", 100))
+        max_raise = float(data.get("max_raise", 2000))
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Provide a numeric 'budget' (and optional 'step', 'max_raise').")
+    if budget < 0 or step <= 0 or max_raise < step:
+        raise HTTPException(status_code=400, detail="Invalid 'budget', 'step' or 'max_raise'.")
+
+    emp_ids, X = feature_store.employee_matrix(db, model, data.get("department"))
+    if not len(emp_ids):
+        raise HTTPException(status_code=404, detail="No employees found.")
+
+    try:
+        raises, before, after = ml_logic.optimize_raise_budget(X, budget, step, max_raise, model=model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    order = np.argsort(-raises)
+    allocation = [
+        {
+            "id": int(emp_ids[i]),
+            "raise": float(raises[i]),
+            "probability_before": round(float(before[i]), 4),
+            "probability_after": round(float(after[i]), 4),
+        }
+        for i in order if raises[i] > 0
+    ]
+    return {
+        "department": data.get("department"),
+        "budget": budget,
+        "spent": float(raises.sum()),
+        "employees": int(len(emp_ids)),
+        "expected_leavers_before": round(float(before.sum()), 2),
+        "expected_leavers_after": round(float(after.sum()), 2),
+        "expected_drop": round(float(before.sum() - after.sum()), 2),
+        "allocation": allocation,
+        "model_version": model.version,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+@app.get("/predict_attrition/cache_stats",
+         summary="Prediction Cache Statistics",
+         description="Hits, misses, evictions and hit rate of the attrition prediction cache.",
+         response_description="Prediction cache statistics.",
+         operation_id="get_prediction_cache_stats",
+         tags=["monitoring"]
+         )
+def get_prediction_cache_stats():
+    """
+    Returns the prediction cache statistics and the served model version.
+    """
+    model = ml_logic.get_model()
+    return {**ml_logic.prediction_cache.stats(), "model_version": model.version if model else None}
+
+
+@app.post("/retrain",
+          summary="Retrain Attrition Model",
+          description="Start a background retraining of the attrition model. The new model replaces the served one only if it validates.",
+          response_description="Whether a retraining job was started.",
+          operation_id="retrain_model",
+          tags=["machine learning"],
+          status_code=202
+          )
+def retrain_model():
+    """
+    Starts a retraining job in a separate process.
+    """
+    if retraining.manager is None:
+        raise HTTPException(status_code=503, detail="Retraining is not available.")
+    if not retraining.manager.trigger("manual"):
+        raise HTTPException(status_code=409, detail="A retraining job is already running.")
+    return {"status": "started"}
+
+
+@app.get("/retrain/status",
+         summary="Retraining Status",
+         description="Served model version, pending data changes and the outcome of the last retraining.",
+         response_description="Retraining status.",
+         operation_id="get_retraining_status",
+         tags=["machine learning"]
+         )
+def get_retraining_status():
+    """
+    Returns the state of background retraining.
+    """
+    if retraining.manager is None:
+        raise HTTPException(status_code=503, detail="Retraining is not available.")
+    return retraining.manager.status()
+
+
+@app.get("/feature_store/stats",
+         summary="Feature Store Statistics",
+         description="Rows, capacity and size of the memory-mapped employee feature matrix.",
+         response_description="Feature store statistics.",
+         operation_id="get_feature_store_stats",
+         tags=["monitoring"]
+         )
+def get_feature_store_stats():
+    """
+    Returns the state of the feature store.
+    """
+    return feature_store.store.stats()
+
+
+@app.get("/workers/status",
+         summary="Worker Process Status",
+         description="Process answering the request, its role, the shared data version, the hit rate of its analytics cache and the memory of its translation models.",
+         response_description="Worker process status.",
+         operation_id="get_worker_status",
+         tags=["monitoring"]
+         )
+def get_worker_status(db: Session = Depends(get_db)):
+    """
+    Returns the state of this worker process.
+    """
+    model = ml_logic.get_model()
+    return {
+        "pid": os.getpid(),
+        "web_concurrency": workers.WEB_CONCURRENCY,
+        "leader": workers.is_leader(),
+        "data_version": workers.data_version(db),
+        "model_version": model.version if model else None,
+        "stats_cache": workers.stats_cache.stats(),
+        # Translation models are loaded per worker, unlike the shared data
+        "translator_memory_mb": translation.registry.stats()["resident_memory_mb"],
+    }
+
+
+@app.get("/metrics",
+         summary="Prometheus Metrics",
+         description="Request counts, latency and response size histograms, in-flight requests and DB queries per route, in Prometheus text format.",
+         response_description="Metrics in Prometheus text exposition format.",
+         response_class=PlainTextResponse,
+         operation_id="get_metrics",
+         tags=["monitoring"]
+         )
+def get_metrics():
+    """
+    Returns the request metrics of this worker process.
+    """
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/profiler/queries",
+         summary="Query Profiler Report",
+         description="Recent slow queries with their query plan and requests that repeated the same statement (N+1).",
+         response_description="Statement totals, slow queries and repeated-statement reports.",
+         operation_id="get_query_profile",
+         tags=["monitoring"]
+         )
+def get_query_profile():
+    """
+    Returns the query profiler report of this worker process.
+    """
+    return query_profiler.profiler.stats()
@@ -8,12 +8,11 @@ import sys
 import os
 
 import streamlit as st
-import requests
-from transformers import pipeline
 
 # Ensure project root is on sys.path so `import src` works inside containers
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from src import *
+from src.frontend import api_client
 
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 
@@ -75,7 +74,7 @@ if not st.session_state.logged_in:
                 if not email_reg or not pw_reg:
                     st.error("Incorrect credentials.")
                 else:
-                    res = requests.post(f"{API_URL}/register", json={"email": email_reg, "password": pw_reg})
+                    res = api_client.request("post", f"{API_URL}/register", json={"email": email_reg, "password": pw_reg})
                     if res.status_code == 200:
                         st.success("Account created! Please log in.")
                         # remember email for the login step
@@ -104,13 +103,15 @@ if not st.session_state.logged_in:
                 if not email_log or not pw_log:
                     st.error("Incorrect credentials.")
                 else:
-                    res = requests.post(f"{API_URL}/login", json={"email": email_log, "password": pw_log})
+                    res = api_client.request("post", f"{API_URL}/login", json={"email": email_log, "password": pw_log})
                     try:
                         payload = res.json()
                     except Exception:
                         st.error("Login error (invalid server response).")
                         st.stop()
                     if payload.get("status") == "success":
+                        # Sent as a bearer token by api_client on every API call
+                        st.session_state.auth_token = payload.get("access_token")
                         st.session_state.logged_in = True
                         _try_rerun()
                     else:
@@ -193,6 +194,7 @@ with st.sidebar:
 
     if st.button("Log out"):
         st.session_state.update({"logged_in": False})
+        st.session_state.pop("auth_token", None)
         _try_rerun()
 
 st.markdown("<div style='margin-top:-24px;'></div>", unsafe_allow_html=True)
@@ -270,6 +272,10 @@ elif page == "Help":
     except Exception as e:
         st.error(f"Error loading help page: {e}")
 
+# Debug panel (sidebar): phase breakdown of the page rendered above
+from src.frontend.profiler import render_profiler_panel
+render_profiler_panel()
+
 st.markdown("<div style='height: 120px'></div>", unsafe_allow_html=True)
 st.markdown(" ") 
 st.markdown(" ")
@@ -0,0 +1,247 @@
+"""
+Load benchmark of the FastAPI backend.
+Serves app/fastapi_app.py with uvicorn against synthetic databases of several
+sizes and drives a weighted mix of dashboard requests at fixed concurrency
+levels, reporting throughput and p50/p95/p99 latency per endpoint.
+
+Usage:
+    python benchmarks/bench_api.py --sizes 1470,100000 --concurrency 1,8,32 --duration 10 --json results.json
+    python benchmarks/bench_api.py --workers 1,4 --sizes 100000   # scaling with uvicorn worker processes
+    python benchmarks/bench_api.py --baseline results.json   # compare with a previous run
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# (weight, operation, method, path, body): {id} is replaced by a random employee id
+REQUEST_MIX = [
+    (10, "get_global_stats", "GET", "/stats", None),
+    (6, "get_sales_stats", "GET", "/sales/sales_stats", None),
+    (6, "get_rd_stats", "GET", "/rd/rd_stats", None),
+    (6, "get_hr_stats", "GET", "/hr/hr_stats", None),
+    (40, "get_employee_by_id", "GET", "/employee/{id}", None),
+    (2, "get_all_employees", "GET", "/employee", None),
+    (1, "get_sales_data", "GET", "/sales", None),
+    (1, "get_rd_data", "GET", "/rd", None),
+    (1, "get_hr_data", "GET", "/hr", None),
+    (6, "update_employee_score", "POST", "/update_score", {"score": 0.5}),
+    (6, "update_evaluation_note", "POST", "/update_evaluation_note", {"evaluation_note": 7.5}),
+    (6, "update_employee_comment", "POST", "/update_comment", {"comment": "Benchmark comment"}),
+]
+# Account the load clients log in with (created on first use)
+BENCH_USER = {"email": "bench@example.com", "password": "bench-password"}
+# Endpoints returning whole tables are left out of the mix above this many employees
+FULL_LIST_MAX_ROWS = 100_000
+FULL_LIST_OPERATIONS = {"get_all_employees", "get_sales_data", "get_rd_data", "get_hr_data"}
+
+
+def percentiles(latencies_ms):
+    if not latencies_ms:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {"p50_ms": round(float(p50), 2), "p95_ms": round(float(p95), 2), "p99_ms": round(float(p99), 2)}
+
+
+def prepare_database(data_dir, rows, seed):
+    """Generates (or reuses) a synthetic database with `rows` employees."""
+    db_path = data_dir / f"bench_{rows}.db"
+    if db_path.exists():
+        with sqlite3.connect(db_path) as conn:
+            if conn.execute("SELECT count(*) FROM employees").fetchone()[0] == rows:
+                return db_path
+    from src.backend.synthetic_data import generate_database
+
+    generate_database(db_path, rows, seed=seed)
+    return db_path
+
+
+def start_server(db_path, port, work_dir, workers=1):
+    """Starts uvicorn (with `workers` processes) on the given database and waits until it answers."""
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "FEATURE_STORE_DIR": str(work_dir / f"feature_store_{db_path.stem}"),
+        # Trained once at the first start, then reused for every size
+        "MODEL_DIR": os.environ.get("MODEL_DIR", str(work_dir / "models")),
+        # Benchmark writes must not start background retrainings
+        "RETRAIN_AFTER_CHANGES": "0",
+        "RETRAIN_INTERVAL_SECONDS": "0",
+        "WEB_CONCURRENCY": str(workers),
+        "WORKER_STATE_DIR": str(work_dir / "workers"),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.fastapi_app:app", "--port", str(port), "--log-level", "warning",
+         "--workers", str(workers)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 600
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/", timeout=1).ok:
+                return server
+        except requests.RequestException:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start in time")
+
+
+def authenticate(base_url):
+    """Registers the benchmark user if needed; returns its Authorization header."""
+    requests.post(f"{base_url}/register", json=BENCH_USER, timeout=30)
+    payload = requests.post(f"{base_url}/login", json=BENCH_USER, timeout=30).json()
+    return {"Authorization": f"Bearer {payload['access_token']}"}
+
+
+def run_load(base_url, mix, employee_ids, concurrency, duration, seed, headers=None):
+    """Drives `concurrency` clients for `duration` seconds; returns latencies per operation."""
+    weights = [entry[0] for entry in mix]
+    samples = {entry[1]: [] for entry in mix}
+    errors = {entry[1]: 0 for entry in mix}
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client(worker):
+        rng = random.Random(seed + worker)
+        session = requests.Session()
+        session.headers.update(headers or {})
+        while time.perf_counter() < stop_at:
+            _, operation, method, path, body = rng.choices(mix, weights)[0]
+            emp_id = rng.choice(employee_ids)
+            url = base_url + path.format(id=emp_id)
+            start = time.perf_counter()
+            try:
+                if method == "GET":
+                    ok = session.get(url, timeout=120).ok
+                else:
+                    ok = session.post(url, json={**body, "id": emp_id}, timeout=120).ok
+            except requests.RequestException:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                samples[operation].append(elapsed)
+                errors[operation] += not ok
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the FastAPI backend under load.")
+    parser.add_argument("--sizes", default="1470,100000", help="Comma-separated numbers of employees.")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated numbers of concurrent clients.")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load per concurrency level.")
+    parser.add_argument("--workers", default="1", help="Comma-separated numbers of uvicorn worker processes.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="Where generated databases are kept (default: a temporary directory).")
+    parser.add_argument("--json", help="Optional path to write the results as JSON.")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against.")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    levels = [int(c) for c in args.concurrency.split(",")]
+    worker_counts = [int(w) for w in args.workers.split(",")]
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_api_"))
+    data_dir = Path(args.data_dir) if args.data_dir else work_dir
+    data_dir.mkdir(parents=True, exist_ok=True)
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    results = []
+    for rows in sizes:
+        db_path = prepare_database(data_dir, rows, args.seed)
+        with sqlite3.connect(db_path) as conn:
+            employee_ids = [r[0] for r in conn.execute("SELECT id FROM employees")]
+        mix = [e for e in REQUEST_MIX if rows <= FULL_LIST_MAX_ROWS or e[1] not in FULL_LIST_OPERATIONS]
+        if len(mix) < len(REQUEST_MIX):
+            print(f"{rows} employees: full-table endpoints left out of the mix.")
+
+        for workers in worker_counts:
+            server = start_server(db_path, args.port, work_dir, workers)
+            try:
+                headers = authenticate(base_url)
+                # Warm-up: first request of each endpoint (caches, lazy imports)
+                run_load(base_url, mix, employee_ids, 1, min(2.0, args.duration), args.seed, headers)
+                for concurrency in levels:
+                    samples, errors, elapsed = run_load(base_url, mix, employee_ids, concurrency, args.duration,
+                                                        args.seed, headers)
+                    all_latencies = [ms for latencies in samples.values() for ms in latencies]
+                    results.append({
+                        "rows": rows,
+                        "workers": workers,
+                        "concurrency": concurrency,
+                        "requests": len(all_latencies),
+                        "errors": sum(errors.values()),
+                        "throughput_rps": round(len(all_latencies) / elapsed, 1),
+                        **percentiles(all_latencies),
+                        "operations": {
+                            operation: {"requests": len(latencies), "errors": errors[operation], **percentiles(latencies)}
+                            for operation, latencies in samples.items() if latencies
+                        },
+                    })
+            finally:
+                server.terminate()
+                server.wait()
+
+    print(f"\n{'rows':>9} {'workers':>7} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for r in results:
+        print(f"{r['rows']:>9} {r['workers']:>7} {r['concurrency']:>5} {r['throughput_rps']:>9.1f} {r['p50_ms']:>9.2f} "
+              f"{r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['errors']:>7}")
+
+    slowest = max(results, key=lambda r: (r["rows"], r["concurrency"], r["workers"]))
+    print(f"\nPer endpoint at {slowest['rows']} employees, {slowest['workers']} worker(s), "
+          f"concurrency {slowest['concurrency']}:")
+    for operation, stats in sorted(slowest["operations"].items(), key=lambda item: -(item[1]["p95_ms"] or 0)):
+        print(f"  {operation:<26} {stats['requests']:>7} req  p50 {stats['p50_ms']:>9.2f}  "
+              f"p95 {stats['p95_ms']:>9.2f}  p99 {stats['p99_ms']:>9.2f}")
+
+    if args.baseline:
+        baseline = {(r["rows"], r.get("workers", 1), r["concurrency"]): r
+                    for r in json.loads(Path(args.baseline).read_text())["results"]}
+        print("\nChange vs baseline (negative latency / positive throughput is better):")
+        for r in results:
+            before = baseline.get((r["rows"], r["workers"], r["concurrency"]))
+            if before:
+                print(f"  {r['rows']:>9} x {r['workers']}w x {r['concurrency']:<3} req/s {r['throughput_rps'] / before['throughput_rps'] - 1:+.1%}"
+                      f"  p95 {r['p95_ms'] / before['p95_ms'] - 1:+.1%}  p99 {r['p99_ms'] / before['p99_ms'] - 1:+.1%}")
+
+    if args.json:
+        try:
+            commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip() or None
+        except OSError:
+            commit = None
+        Path(args.json).write_text(json.dumps({
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "duration_s": args.duration,
+            "results": results,
+        }, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
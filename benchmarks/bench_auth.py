@@ -0,0 +1,166 @@
+"""
+Benchmark of the authentication path.
+Measures bcrypt and token costs in process, the per-request overhead of the
+auth middleware, then login throughput under concurrency against a uvicorn
+server, with the latency of regular requests served during the login burst.
+
+Usage:
+    python benchmarks/bench_auth.py --concurrency 1,4,16 --duration 10 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_api import BENCH_USER, authenticate, percentiles, prepare_database, start_server  # noqa: E402
+
+
+def per_call_us(func, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def middleware_overhead_us(n):
+    """Time added per request by AuthMiddleware, on a no-op ASGI app."""
+    from src.backend import auth
+
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message):
+        pass
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    token = auth.create_token(BENCH_USER["email"])
+    headers = [(b"host", b"bench"), (b"accept", b"*/*"), (b"authorization", f"Bearer {token}".encode())]
+    middleware = auth.AuthMiddleware(endpoint)
+
+    async def run(app):
+        start = time.perf_counter()
+        for _ in range(n):
+            await app({"type": "http", "method": "GET", "path": "/stats", "headers": headers}, receive, send)
+        return (time.perf_counter() - start) / n * 1e6
+
+    bare = asyncio.run(run(endpoint))
+    return asyncio.run(run(middleware)) - bare
+
+
+def login_burst(base_url, concurrency, duration, probe_headers, employee_ids):
+    """`concurrency` clients log in continuously while one client reads employees."""
+    logins, probe = [], []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def login_client():
+        session = requests.Session()
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            ok = session.post(f"{base_url}/login", json=BENCH_USER, timeout=60).json().get("status") == "success"
+            with lock:
+                logins.append((time.perf_counter() - start) * 1000)
+                errors[0] += not ok
+
+    def probe_client():
+        session = requests.Session()
+        session.headers.update(probe_headers)
+        i = 0
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            session.get(f"{base_url}/employee/{employee_ids[i % len(employee_ids)]}", timeout=60)
+            probe.append((time.perf_counter() - start) * 1000)
+            i += 1
+
+    threads = [threading.Thread(target=login_client) for _ in range(concurrency)]
+    threads.append(threading.Thread(target=probe_client))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "logins_per_s": round(len(logins) / elapsed, 1),
+        "login_errors": errors[0],
+        "login": percentiles(logins),
+        "probe": percentiles(probe),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark password hashing, tokens and login throughput.")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated numbers of concurrent logins.")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of login burst per level.")
+    parser.add_argument("--rows", type=int, default=1470, help="Employees in the benchmark database.")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="Where generated databases are kept (default: a temporary directory).")
+    parser.add_argument("--json", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    from src.backend import auth
+
+    password_hash = auth.hash_password(BENCH_USER["password"])
+    token = auth.create_token(BENCH_USER["email"])
+    in_process = {
+        "bcrypt_rounds": auth.BCRYPT_ROUNDS,
+        "hash_ms": round(per_call_us(lambda: auth.hash_password(BENCH_USER["password"]), 5) / 1000, 1),
+        "verify_ms": round(per_call_us(lambda: auth.verify_password(BENCH_USER["password"], password_hash), 5) / 1000, 1),
+        "create_token_us": round(per_call_us(lambda: auth.create_token(BENCH_USER["email"]), 20000), 2),
+        "verify_token_us": round(per_call_us(lambda: auth.verify_token(token), 20000), 2),
+        "middleware_overhead_us": round(middleware_overhead_us(20000), 2),
+    }
+    print(f"bcrypt (rounds {in_process['bcrypt_rounds']}): hash {in_process['hash_ms']} ms, "
+          f"verify {in_process['verify_ms']} ms")
+    print(f"token: create {in_process['create_token_us']} us, verify {in_process['verify_token_us']} us, "
+          f"middleware overhead {in_process['middleware_overhead_us']} us/request")
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_auth_"))
+    data_dir = Path(args.data_dir) if args.data_dir else work_dir
+    data_dir.mkdir(parents=True, exist_ok=True)
+    db_path = prepare_database(data_dir, args.rows, args.seed)
+    with sqlite3.connect(db_path) as conn:
+        employee_ids = [r[0] for r in conn.execute("SELECT id FROM employees LIMIT 1000")]
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    bursts = []
+    server = start_server(db_path, args.port, work_dir)
+    try:
+        headers = authenticate(base_url)
+        baseline = login_burst(base_url, 0, min(args.duration, 5), headers, employee_ids)["probe"]
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            bursts.append(login_burst(base_url, concurrency, args.duration, headers, employee_ids))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"\nGET /employee/{{id}} without logins: p50 {baseline['p50_ms']} ms, p95 {baseline['p95_ms']} ms")
+    print(f"{'logins':>7} {'login/s':>9} {'login p50':>10} {'login p95':>10} {'read p50':>9} {'read p95':>9}")
+    for b in bursts:
+        print(f"{b['concurrency']:>7} {b['logins_per_s']:>9.1f} {b['login']['p50_ms']:>10.1f} {b['login']['p95_ms']:>10.1f} "
+              f"{b['probe']['p50_ms']:>9.2f} {b['probe']['p95_ms']:>9.2f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "in_process": in_process, "probe_baseline": baseline, "bursts": bursts,
+        }, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
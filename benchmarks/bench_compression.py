@@ -0,0 +1,126 @@
+"""
+Benchmark of the response compression codecs on the employee list payloads.
+Measures compressed size, compression/decompression time and the resulting
+response time at several network bandwidths for gzip, brotli and zstd levels.
+
+Usage:
+    python benchmarks/bench_compression.py --sizes 1470,20000,100000 --bandwidth-mbps 100,1000 --json results.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_api import prepare_database  # noqa: E402
+
+LEVELS = {"gzip": [1, 3, 6, 9], "br": [1, 4, 5, 9], "zstd": [1, 3, 6, 12]}
+
+
+def decompressor(encoding):
+    import zlib
+
+    if encoding == "gzip":
+        return lambda data: zlib.decompress(data, 31)
+    if encoding == "br":
+        import brotli
+        return brotli.decompress
+    import zstandard
+    return zstandard.ZstdDecompressor().decompress
+
+
+def median_time(func, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def endpoint_payloads(db_path):
+    """JSON bodies of /employee and /sales, encoded as the API does."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from src.backend import crud, models, serialization
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with Session(engine) as db:
+        payloads = {
+            "get_all_employees": serialization.rows_response(*crud.get_employee_rows(db)).body,
+            "get_sales_data": serialization.rows_response(*crud.get_department_rows(db, models.Sales)).body,
+        }
+    engine.dispose()
+    return payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gzip/brotli/zstd on the API payloads.")
+    parser.add_argument("--sizes", default="1470,20000,100000", help="Comma-separated numbers of employees.")
+    parser.add_argument("--bandwidth-mbps", default="100,1000", help="Network bandwidths used for the response time.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="Where generated databases are kept (default: a temporary directory).")
+    parser.add_argument("--json", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    from src.backend import compression
+
+    bandwidths = [float(b) for b in args.bandwidth_mbps.split(",")]
+    data_dir = Path(args.data_dir) if args.data_dir else Path(tempfile.mkdtemp(prefix="bench_compression_"))
+    data_dir.mkdir(parents=True, exist_ok=True)
+    missing = [e for e in LEVELS if e not in compression.CODECS]
+    if missing:
+        print(f"Skipping {', '.join(missing)} (module not installed).")
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        payloads = endpoint_payloads(prepare_database(data_dir, size, args.seed))
+        for operation, body in payloads.items():
+            rows = [{"encoding": "identity", "level": None, "bytes": len(body), "compress_ms": 0.0, "decompress_ms": 0.0}]
+            for encoding, levels in LEVELS.items():
+                if encoding not in compression.CODECS:
+                    continue
+                decompress = decompressor(encoding)
+                for level in levels:
+                    compress_s, compressed = median_time(lambda: compression.compress(body, encoding, level), args.repeat)
+                    decompress_s, restored = median_time(lambda: decompress(compressed), args.repeat)
+                    if restored != body:
+                        raise RuntimeError(f"{encoding} {level}: round trip mismatch")
+                    rows.append({"encoding": encoding, "level": level, "bytes": len(compressed),
+                                 "compress_ms": compress_s * 1000, "decompress_ms": decompress_s * 1000})
+            for row in rows:
+                row["ratio"] = round(len(body) / row["bytes"], 1)
+                row["configured"] = row["level"] == compression.route_level(operation, row["encoding"]) \
+                    if row["encoding"] in compression.DEFAULT_LEVELS else False
+                # Compression + transfer + decompression, for each bandwidth
+                row["response_ms"] = {
+                    str(mbps): round(row["compress_ms"] + row["bytes"] * 8 / (mbps * 1000) + row["decompress_ms"], 1)
+                    for mbps in bandwidths
+                }
+                row["compress_ms"] = round(row["compress_ms"], 2)
+                row["decompress_ms"] = round(row["decompress_ms"], 2)
+            results.append({"rows": size, "operation": operation, "codecs": rows})
+
+    for r in results:
+        print(f"\n{r['operation']} at {r['rows']} employees ({r['codecs'][0]['bytes'] / 1e6:.2f} MB raw)")
+        print(f"  {'codec':<10} {'bytes':>11} {'ratio':>6} {'comp ms':>9} {'decomp ms':>10} "
+              + " ".join(f"{f'@{b:g}Mb/s ms':>14}" for b in bandwidths))
+        for c in r["codecs"]:
+            name = c["encoding"] + (f" {c['level']}" if c["level"] is not None else "") + (" *" if c["configured"] else "")
+            print(f"  {name:<10} {c['bytes']:>11,} {c['ratio']:>6.1f} {c['compress_ms']:>9.2f} {c['decompress_ms']:>10.2f} "
+                  + " ".join(f"{c['response_ms'][str(b)]:>14.1f}" for b in bandwidths))
+    print("\n* level configured for the route in src/backend/compression.py")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"bandwidth_mbps": bandwidths, "results": results}, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark of attrition inference: scikit-learn predict_proba versus the
+flat-array NumPy traversal exported by src/backend/forest.py.
+
+Usage:
+    python benchmarks/bench_inference.py --repeat 20
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.backend.database import engine
+from src.backend.forest import NumpyForest
+from src.backend.ml_logic import load_training_frame, train_model
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+def time_call(fn, X, repeat):
+    """Median wall time of fn(X) in milliseconds."""
+    fn(X)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark attrition inference backends.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    df = load_training_frame(engine)
+    model = train_model(df)
+    forest = NumpyForest.from_sklearn(model.estimator)
+    X_all = model.encode_frame(df)
+    print(f"{forest.n_trees} trees, max depth {forest.max_depth}, {model.n_features} features")
+
+    results = []
+    for size in BATCH_SIZES:
+        X = np.resize(X_all, (size, X_all.shape[1]))
+        repeat = args.repeat if size <= 1000 else max(3, args.repeat // 5)
+        sk_ms = time_call(model.estimator.predict_proba, X, repeat)
+        np_ms = time_call(forest.predict_proba, X, repeat)
+        diff = float(np.abs(model.estimator.predict_proba(X) - forest.predict_proba(X)).max())
+        results.append({
+            "rows": size,
+            "sklearn_ms": round(sk_ms, 3),
+            "numpy_ms": round(np_ms, 3),
+            "speedup": round(sk_ms / np_ms, 1),
+            "max_abs_diff": diff,
+        })
+
+    cols = list(results[0].keys())
+    print(" | ".join(f"{c:>12}" for c in cols))
+    for r in results:
+        print(" | ".join(f"{str(r[c]):>12}" for c in cols))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
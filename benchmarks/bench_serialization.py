@@ -0,0 +1,111 @@
+"""
+Benchmark of the employee list serialization paths.
+Compares the former path of /employee and the department endpoints (ORM objects
+encoded by FastAPI's jsonable_encoder) with Core rows encoded by orjson.
+
+Usage:
+    python benchmarks/bench_serialization.py --sizes 1470,20000,100000 --repeat 3 --json results.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_api import prepare_database  # noqa: E402
+
+
+def timed(func, repeat):
+    """Runs `func` `repeat` times; returns (median seconds, last result)."""
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def run_size(db_path, model, repeat):
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from src.backend import crud, serialization
+
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    # Whole endpoint body: query, objects and JSON encoding
+    def orm_endpoint():
+        with Session(engine) as db:
+            return JSONResponse(jsonable_encoder(db.query(model).all())).body
+
+    def core_endpoint():
+        with Session(engine) as db:
+            keys, rows = crud.get_department_rows(db, model)
+            return serialization.rows_response(keys, rows).body
+
+    # Encoding only, on rows already loaded
+    with Session(engine) as db:
+        objects = db.query(model).all()
+        keys, rows = crud.get_department_rows(db, model)
+        orm_encode_s, legacy_body = timed(lambda: JSONResponse(jsonable_encoder(objects)).body, repeat)
+        core_encode_s, fast_body = timed(lambda: serialization.rows_response(keys, rows).body, repeat)
+    orm_total_s, _ = timed(orm_endpoint, repeat)
+    core_total_s, _ = timed(core_endpoint, repeat)
+    engine.dispose()
+
+    if json.loads(legacy_body) != json.loads(fast_body):
+        raise RuntimeError(f"{model.__tablename__}: both paths must produce the same JSON")
+    n = len(rows)
+    return {
+        "table": model.__tablename__,
+        "rows": n,
+        "bytes": len(fast_body),
+        "orm_encode_rows_per_s": round(n / orm_encode_s),
+        "core_encode_rows_per_s": round(n / core_encode_s),
+        "encode_speedup": round(orm_encode_s / core_encode_s, 1),
+        "orm_endpoint_ms": round(orm_total_s * 1000, 1),
+        "core_endpoint_ms": round(core_total_s * 1000, 1),
+        "endpoint_speedup": round(orm_total_s / core_total_s, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ORM/jsonable_encoder vs Core/orjson serialization.")
+    parser.add_argument("--sizes", default="1470,20000,100000", help="Comma-separated numbers of employees.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="Where generated databases are kept (default: a temporary directory).")
+    parser.add_argument("--json", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    from src.backend import models
+
+    data_dir = Path(args.data_dir) if args.data_dir else Path(tempfile.mkdtemp(prefix="bench_serialization_"))
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        db_path = prepare_database(data_dir, size, args.seed)
+        for model in (models.Employee, models.Sales):
+            results.append(run_size(db_path, model, args.repeat))
+
+    print(f"\n{'table':<10} {'rows':>8} {'MB':>7} {'ORM enc rows/s':>15} {'Core enc rows/s':>16} {'x':>6} "
+          f"{'ORM ms':>9} {'Core ms':>9} {'x':>6}")
+    for r in results:
+        print(f"{r['table']:<10} {r['rows']:>8} {r['bytes'] / 1e6:>7.1f} {r['orm_encode_rows_per_s']:>15,} "
+              f"{r['core_encode_rows_per_s']:>16,} {r['encode_speedup']:>6.1f} {r['orm_endpoint_ms']:>9.1f} "
+              f"{r['core_endpoint_ms']:>9.1f} {r['endpoint_speedup']:>6.1f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"repeat": args.repeat, "results": results}, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark of the translation model served by the backend /translate endpoint.
+Compares the default fp32 pipeline with the optimized (int8, thread-tuned) one.
+Memory figures are for one process: each API worker loads its own pipelines.
+
+Usage:
+    python benchmarks/bench_translator.py --repeat 5 --threads 2 --batch-size 8
+"""
+import argparse
+import json
+import multiprocessing as mp
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Labels similar to the ones rendered by the dashboard
+SAMPLE_LABELS = [
+    "Performance by Department",
+    "Work-Life Balance Distribution by Department",
+    "Attrition Rate (%) by Job Role",
+    "Job Satisfaction Distribution by Role",
+    "Sales Department data",
+    "Research & Development Department data",
+    "Human Resources Department data",
+    "Unable to retrieve statistics",
+    "Evaluation and Comment",
+    "Recently Added Employees (Session)",
+    "Enter all employee details below. Default values are provided for ease of use.",
+    "Analyze the information above, then add or modify the rating and comment if necessary.",
+]
+
+
+def peak_rss_mb():
+    """Returns the peak resident memory of the current process in MB (None if unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in KB on Linux, in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_mode(optimized, threads, batch_size, repeat, queue):
+    """Loads one translator variant and measures it. Runs in a child process."""
+    from src.backend.translation import build_translator, translate_batch
+
+    start = time.perf_counter()
+    translator = build_translator("en", "fr", optimized=optimized,
+                                  num_threads=threads, batch_size=batch_size)
+    load_s = time.perf_counter() - start
+    rss_after_load = peak_rss_mb()
+
+    # Warm-up pass so the first measured call is not a cold start
+    translate_batch(translator, SAMPLE_LABELS[:1], batch_size)
+
+    single, batch = [], []
+    for _ in range(repeat):
+        for label in SAMPLE_LABELS:
+            t0 = time.perf_counter()
+            translate_batch(translator, [label], batch_size)
+            single.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        translate_batch(translator, SAMPLE_LABELS, batch_size)
+        batch.append((time.perf_counter() - t0) * 1000)
+
+    queue.put({
+        "mode": "optimized" if optimized else "default",
+        "load_s": round(load_s, 2),
+        "single_p50_ms": round(statistics.median(single), 1),
+        "single_max_ms": round(max(single), 1),
+        "batch_p50_ms": round(statistics.median(batch), 1),
+        "labels_per_s": round(len(SAMPLE_LABELS) / (statistics.median(batch) / 1000), 1),
+        "rss_after_load_mb": round(rss_after_load, 1) if rss_after_load else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1) if peak_rss_mb() else None,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the translation model.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--json", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    # Each variant runs in a fresh process so memory figures are not mixed up
+    ctx = mp.get_context("spawn")
+    results = []
+    for optimized in (False, True):
+        queue = ctx.Queue()
+        proc = ctx.Process(target=run_mode,
+                           args=(optimized, args.threads, args.batch_size, args.repeat, queue))
+        proc.start()
+        results.append(queue.get())
+        proc.join()
+
+    cols = list(results[0].keys())
+    print(" | ".join(f"{c:>17}" for c in cols))
+    for r in results:
+        print(" | ".join(f"{str(r[c]):>17}" for c in cols))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
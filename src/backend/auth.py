@@ -0,0 +1,199 @@
+"""
+Authentication module.
+bcrypt password hashing on a dedicated thread pool, short-lived HMAC-signed
+access tokens verified in memory, and the ASGI middleware enforcing them.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import bcrypt
+
+from . import workers
+
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "1") == "1"
+# Signing key of the access tokens. Without one, a random key is drawn at
+# startup: tokens then die with the process. With several workers the key is
+# drawn once and shared through a file, so any worker accepts any token.
+AUTH_SECRET = os.getenv("AUTH_SECRET", "").encode() or (
+    workers.shared_secret("auth_secret") if workers.WEB_CONCURRENCY > 1 else secrets.token_bytes(32)
+)
+AUTH_TOKEN_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_TTL_SECONDS", "1800"))
+# bcrypt cost: 2**rounds iterations, about 0.2 s per hash at 12
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads hashing passwords; bcrypt releases the GIL, so up to one per core is useful
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", str(os.cpu_count() or 2)))
+# Nice value of the hashing threads (Linux). Raising it makes the scheduler
+# favour regular requests over logins when the CPU is saturated
+AUTH_HASH_NICE = int(os.getenv("AUTH_HASH_NICE", "0"))
+# bcrypt only uses (and bcrypt >= 5 only accepts) the first 72 bytes
+MAX_PASSWORD_BYTES = 72
+# Self-service sign-up. Off by default: /register then needs the token of an
+# HR user, except for the first account of an empty database
+AUTH_OPEN_REGISTRATION = os.getenv("AUTH_OPEN_REGISTRATION", "0") == "1"
+
+# Reachable without a token (health check, account creation, scraping, docs,
+# and the UI labels translated on the login page)
+PUBLIC_PATHS = {
+    "/", "/register", "/login", "/translate", "/metrics",
+    "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json",
+}
+
+def _lower_thread_priority():
+    if sys.platform.startswith("linux") and AUTH_HASH_NICE:
+        try:
+            # On Linux, PRIO_PROCESS with a thread id sets that thread's nice value only
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), AUTH_HASH_NICE)
+        except OSError:
+            pass
+
+
+# Kept apart from the request threadpool, so a burst of logins cannot starve
+# the other endpoints of threads
+_hash_pool = ThreadPoolExecutor(max_workers=AUTH_HASH_WORKERS, thread_name_prefix="auth-hash",
+                                initializer=_lower_thread_priority)
+
+
+def password_too_long(password):
+    return len(password.encode("utf-8")) > MAX_PASSWORD_BYTES
+
+
+@lru_cache(maxsize=1)
+def dummy_hash():
+    """Hash checked for unknown emails, so login time does not reveal which accounts exist."""
+    return hash_password(secrets.token_urlsafe(16))
+
+
+def hash_password(password):
+    """bcrypt hash of `password` (salted, BCRYPT_ROUNDS cost) as a string."""
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(BCRYPT_ROUNDS)).decode("ascii")
+
+
+def verify_password(password, password_hash):
+    """Checks `password` against a bcrypt hash (False for anything else)."""
+    if not password_hash or not password_hash.startswith("$2") or password_too_long(password):
+        return False
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("ascii"))
+    except ValueError:
+        return False
+
+
+async def hash_password_async(password):
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, hash_password, password)
+
+
+async def verify_password_async(password, password_hash):
+    """verify_password on the hash pool; checks a dummy hash when `password_hash` is None."""
+    loop = asyncio.get_running_loop()
+    if password_hash is None:
+        await loop.run_in_executor(_hash_pool, verify_password, password, dummy_hash())
+        return False
+    return await loop.run_in_executor(_hash_pool, verify_password, password, password_hash)
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def create_token(subject, ttl=AUTH_TOKEN_TTL_SECONDS, now=None):
+    """Signed access token `payload.signature` (base64url) for `subject`, valid `ttl` seconds."""
+    issued = int(time.time() if now is None else now)
+    payload = _b64encode(json.dumps({"sub": subject, "iat": issued, "exp": issued + ttl},
+                                    separators=(",", ":")).encode())
+    signature = _b64encode(hmac.new(AUTH_SECRET, payload, hashlib.sha256).digest())
+    return (payload + b"." + signature).decode("ascii")
+
+
+def verify_token(token, now=None):
+    """Returns the claims of a valid, unexpired token, else None. No database access."""
+    try:
+        payload, signature = token.encode("ascii").split(b".")
+        expected = _b64encode(hmac.new(AUTH_SECRET, payload, hashlib.sha256).digest())
+        if not hmac.compare_digest(signature, expected):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, UnicodeError):
+        return None
+    if claims.get("exp", 0) <= (time.time() if now is None else now):
+        return None
+    return claims
+
+
+def bearer_claims(headers):
+    """
+    Claims of the `Authorization: Bearer` token in ASGI `headers`, and the
+    reason when there is no valid one.
+    """
+    for name, value in headers:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            claims = verify_token(token.strip()) if scheme.lower() == "bearer" else None
+            return claims, None if claims else "Invalid or expired token"
+    return None, "Not authenticated"
+
+
+def _unauthorized(detail):
+    body = json.dumps({"detail": detail}).encode()
+    return [
+        {
+            "type": "http.response.start",
+            "status": 401,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"www-authenticate", b"Bearer"),
+            ],
+        },
+        {"type": "http.response.body", "body": body},
+    ]
+
+
+class AuthMiddleware:
+    """
+    Pure ASGI middleware requiring a valid `Authorization: Bearer <token>` on
+    every path but PUBLIC_PATHS. The user's email is put in
+    `scope["state"]["user"]`. Past half its lifetime, a renewed token is sent
+    back in `X-Refreshed-Token` so active sessions do not expire.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not AUTH_REQUIRED or scope["path"] in PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        claims, detail = bearer_claims(scope["headers"])
+        if claims is None:
+            for message in _unauthorized(detail):
+                await send(message)
+            return
+
+        scope.setdefault("state", {})["user"] = claims["sub"]
+        if claims["exp"] - time.time() > AUTH_TOKEN_TTL_SECONDS / 2:
+            await self.app(scope, receive, send)
+            return
+
+        refreshed = create_token(claims["sub"]).encode()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-refreshed-token", refreshed)]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,163 @@
+"""
+Response compression module.
+ASGI middleware compressing large responses with the best encoding the client
+accepts (zstd, brotli or gzip), at a level chosen per route.
+"""
+import os
+import zlib
+
+import anyio
+
+try:
+    import brotli
+except ImportError:  # brotli is optional: gzip/zstd only
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional: gzip/brotli only
+    zstandard = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "1") == "1"
+# Smaller bodies are sent as is (a single employee is ~750 bytes of JSON)
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+# Bodies above this size are compressed in a worker thread, not on the event loop
+COMPRESSION_THREAD_BYTES = int(os.getenv("COMPRESSION_THREAD_BYTES", "262144"))
+# Server preference when the client accepts several encodings equally
+COMPRESSION_ENCODINGS = [e.strip() for e in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",") if e.strip()]
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# Default levels: best ratio still well under a millisecond per 10 KB
+DEFAULT_LEVELS = {"gzip": 6, "br": 5, "zstd": 3}
+# Full-table endpoints (MBs of JSON) favour compression speed: at 20k employees
+# zstd 1 / brotli 1 / gzip 3 shrink the 15 MB body 11-15x in 27-84 ms, where the
+# default levels take 40-240 ms (see benchmarks/bench_compression.py)
+BULK_LEVELS = {"gzip": 3, "br": 1, "zstd": 1}
+ROUTE_LEVELS = {
+    "get_all_employees": BULK_LEVELS,
+    "get_sales_data": BULK_LEVELS,
+    "get_rd_data": BULK_LEVELS,
+    "get_hr_data": BULK_LEVELS,
+}
+
+
+def _gzip(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    return compressor.compress(data) + compressor.flush()
+
+
+def _brotli(data, level):
+    return brotli.compress(data, quality=level)
+
+
+def _zstd(data, level):
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+CODECS = {"gzip": _gzip}
+if brotli is not None:
+    CODECS["br"] = _brotli
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+
+
+def compress(data, encoding, level=None):
+    """Compresses `data` with `encoding` ("gzip", "br" or "zstd") at `level` (its default if None)."""
+    return CODECS[encoding](data, DEFAULT_LEVELS[encoding] if level is None else level)
+
+
+def negotiate(accept_encoding, available=None):
+    """
+    Picks the encoding for an `Accept-Encoding` header value: highest q-value
+    first, then the server preference order. Returns None for identity.
+    """
+    available = [e for e in COMPRESSION_ENCODINGS if e in CODECS] if available is None else available
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def route_level(operation, encoding):
+    return ROUTE_LEVELS.get(operation, DEFAULT_LEVELS).get(encoding, DEFAULT_LEVELS[encoding])
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing complete JSON/text responses of at least
+    COMPRESSION_MIN_BYTES. Streaming responses, already encoded bodies and
+    clients without a supported `Accept-Encoding` are passed through.
+    """
+
+    def __init__(self, app, minimum_size=COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether compressing is worth it
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = start["headers"] = list(start.get("headers", []))
+            content_type = next((v for k, v in headers if k == b"content-type"), b"").decode("latin-1")
+            if (message.get("more_body", False) or len(body) < self.minimum_size
+                    or any(k == b"content-encoding" for k, _ in headers)
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)):
+                await send(start)
+                await send(message)
+                return
+
+            route = scope.get("route")
+            level = route_level(getattr(route, "operation_id", None), encoding)
+            if len(body) >= COMPRESSION_THREAD_BYTES:
+                body = await anyio.to_thread.run_sync(compress, body, encoding, level)
+            else:
+                body = compress(body, encoding, level)
+            start["headers"] = [(k, v) for k, v in headers if k != b"content-length"] + [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,3 +1,5 @@
+import pandas as pd
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
 from . import models
 
@@ -7,12 +9,28 @@ def get_employee_data(db: Session):
 def get_employee(db: Session, emp_id: int):
     return db.query(models.Employee).filter(models.Employee.id == emp_id).first()
 
+def get_employee_rows(db: Session):
+    """All employees as Core row tuples (no ORM objects); returns (column names, rows)."""
+    result = db.execute(select(models.Employee.__table__))
+    return list(result.keys()), result.all()
+
+def get_employee_row(db: Session, emp_id: int):
+    """One employee as a Core row tuple (None if missing); returns (column names, row)."""
+    table = models.Employee.__table__
+    result = db.execute(select(table).where(table.c.id == emp_id))
+    return list(result.keys()), result.first()
+
+def get_department_rows(db: Session, model):
+    """All rows of a department table (models.Sales, models.RD, models.HR) as Core row tuples."""
+    result = db.execute(select(model.__table__))
+    return list(result.keys()), result.all()
+
 def get_max_id(db: Session):
     max_id = db.query(models.Employee.id).order_by(models.Employee.id.desc()).first()
     return max_id[0] if max_id else 0
 
-def create_rh_user(db: Session, email: str, password: str):
-    db_user = models.UserRH(email=email, password=password)
+def create_rh_user(db: Session, email: str, password_hash: str):
+    db_user = models.UserRH(email=email, password=password_hash)
     db.add(db_user)
     db.commit()
     return db_user
@@ -20,8 +38,12 @@ def create_rh_user(db: Session, email: str, password: str):
 def get_rh_user(db: Session, email: str):
     return db.query(models.UserRH).filter(models.UserRH.email == email).first()
 
+def has_rh_users(db: Session):
+    return db.query(models.UserRH.email).first() is not None
+
 def update_employee_score(db: Session, emp_id: int, score: float):
-    emp = db.query(models.Employee).filter(models.Employee.id == emp_id).first()
+    # Session.get reuses a row already loaded in this session instead of querying it again
+    emp = db.get(models.Employee, emp_id)
     if emp:
         emp.score = score
         db.commit()
@@ -37,15 +59,50 @@ def get_data_hr_department(db: Session):
     return db.query(models.HR).all()
 
 def update_employee_evaluation_note(db: Session, emp_id: int, evaluation_note: float):
-    emp = db.query(models.Employee).filter(models.Employee.id == emp_id).first()
+    # Session.get reuses a row already loaded in this session instead of querying it again
+    emp = db.get(models.Employee, emp_id)
     if emp:
         emp.evaluation_note = evaluation_note
         db.commit()
     return emp
 
 def update_employee_comment(db: Session, emp_id: int, comment: str):
-    emp = db.query(models.Employee).filter(models.Employee.id == emp_id).first()
+    # Session.get reuses a row already loaded in this session instead of querying it again
+    emp = db.get(models.Employee, emp_id)
     if emp:
         emp.comment = comment
         db.commit()
-    return emp
\ No newline at end of file
+    return emp
+
+def get_employee_features(db: Session, columns, department=None, ids=None):
+    """Loads `id` plus the given columns for all employees (or one department / some ids) in one query."""
+    table = models.Employee.__table__
+    query = select(table.c.id, *[table.c[col] for col in columns])
+    if department:
+        query = query.where(table.c.Department == department)
+    if ids is not None:
+        query = query.where(table.c.id.in_([int(i) for i in ids]))
+    return pd.read_sql(query, db.connection())
+
+def iter_employee_features(db: Session, columns, chunksize):
+    """Streams `id` plus the given columns of all employees, ordered by id, in DataFrame chunks."""
+    table = models.Employee.__table__
+    query = select(table.c.id, *[table.c[col] for col in columns]).order_by(table.c.id)
+    return pd.read_sql(query, db.connection(), chunksize=chunksize)
+
+def get_distinct_values(db: Session, columns):
+    """Returns the sorted distinct non-null values of each column."""
+    table = models.Employee.__table__
+    return {
+        col: sorted(str(v) for (v,) in db.execute(select(table.c[col]).distinct()) if v is not None)
+        for col in columns
+    }
+
+def update_employee_scores(db: Session, ids, scores):
+    """Writes many scores back in a single executemany UPDATE."""
+    table = models.Employee.__table__
+    stmt = update(table).where(table.c.id == bindparam("emp_id")).values(score=bindparam("new_score"))
+    params = [{"emp_id": int(emp_id), "new_score": float(score)} for emp_id, score in zip(ids, scores)]
+    if params:
+        db.connection().execute(stmt, params)
+    db.commit()
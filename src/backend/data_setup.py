@@ -1,74 +1,270 @@
-import kagglehub
+"""
+Database bootstrap module.
+Builds the SQLite database from the IBM HR attrition CSV (local file or Kaggle
+download), only when it is missing or its data version is outdated.
+"""
 import pandas as pd
 import os
+import sqlite3
+import time
 from pathlib import Path
 from sqlalchemy import create_engine
+from sqlalchemy.schema import CreateTable
 
-#  Useful colomns
-useful_cols = ['id','Age', 'Attrition',
-               'Department', 'Education', 'JobRole', 
-                'MonthlyIncome', 'EnvironmentSatisfaction',
-                'JobInvolvement', 'RelationshipSatisfaction', 
-                'PerformanceRating', 'JobSatisfaction','WorkLifeBalance']
-
-organized_cols = [col for col in useful_cols if col != "Department"]
-
-# Function to retrieve the useful part of the dataset specific for each department
-def data_department(department_name, data_df):
-    use_df = data_df[useful_cols]
-    data_dep =  use_df[use_df["Department"] == department_name]
-    data_dep = data_dep.reset_index(drop=True)
-    data_dep = data_dep.drop(columns=["Department"])
-    data_dep = data_dep[organized_cols]
-    return data_dep
-
-def setup_db():
+try:
+    import kagglehub
+except ImportError:  # Offline installs: HR_DATASET_CSV must point to the CSV
+    kagglehub = None
+
+KAGGLE_DATASET = "pavansubhasht/ibm-hr-analytics-attrition-dataset"
+CSV_FILE = "WA_Fn-UseC_-HR-Employee-Attrition.csv"
+DB_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "hr_database.db"
+# Local copy of the dataset CSV; when set, no network access is needed
+HR_DATASET_CSV = os.getenv("HR_DATASET_CSV")
+# Stored in PRAGMA user_version; bump it whenever the ingested schema or data changes
+DATA_VERSION = 2
+
+# Rows read from the CSV and inserted per executemany call
+INGEST_CHUNK_ROWS = int(os.getenv("INGEST_CHUNK_ROWS", "50000"))
+
+# Department tables, filled from the employees table after loading
+DEPARTMENT_TABLES = {
+    "sales": "Sales",
+    "RD": "Research & Development",
+    "HR": "Human Resources",
+}
+# Columns added for HR follow-up, with their initial values
+HR_DEFAULTS = {'score': 0.0, 'evaluation_note': None, 'comment': ""}
+
+
+def _csv_dtypes(table):
+    """
+    Maps the CSV columns to pandas dtypes matching the declared schema.
+    Integers are parsed as float64 (NumPy dtypes parse much faster than the
+    nullable ones and still accept missing values) and cast back on insert.
+    """
+    dtypes = {}
+    for column in table.columns:
+        # We use EmployeeNumber as the ID
+        name = 'EmployeeNumber' if column.name == 'id' else column.name
+        dtypes[name] = "float64" if column.type.python_type in (int, float) else "object"
+    return dtypes
+
+
+def _column_values(series, python_type):
+    """Converts a pandas column to Python values, with None for missing ones."""
+    if not series.hasnans:
+        return series.astype("int64").tolist() if python_type is int else series.tolist()
+    values = series.astype(object).where(series.notna(), None)
+    if python_type is int:
+        values = values.map(lambda v: v if v is None else int(v))
+    return values.tolist()
+
+
+def dataset_csv_path(csv_path=None):
+    """
+    Returns the path of the dataset CSV: `csv_path`, then HR_DATASET_CSV,
+    then the Kaggle download (cached by kagglehub after the first run).
+    """
+    csv_path = csv_path or HR_DATASET_CSV
+    if csv_path:
+        return Path(csv_path)
+    if kagglehub is None:
+        raise RuntimeError("kagglehub is not installed: set HR_DATASET_CSV to a local copy of the dataset.")
     print("Downloading data...")
-    path = kagglehub.dataset_download("pavansubhasht/ibm-hr-analytics-attrition-dataset")
-    csv_file = "WA_Fn-UseC_-HR-Employee-Attrition.csv"
-    # define the database path
-    db_path = Path(__file__).resolve().parent.parent.parent / "data" / "hr_database.db"
+    return Path(kagglehub.dataset_download(KAGGLE_DATASET)) / CSV_FILE
+
+
+def database_version(db_path=DB_PATH):
+    """
+    Returns the data version of an existing database, 0 when the file is
+    missing or holds no employees table.
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return 0
+    conn = sqlite3.connect(str(db_path))
+    try:
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='employees'"
+        ).fetchone()
+        return conn.execute("PRAGMA user_version").fetchone()[0] if has_table else 0
+    finally:
+        conn.close()
+
+
+def has_current_schema(db_path=DB_PATH):
+    """
+    True when the tables filled by load_employees all exist with their
+    declared columns (extra ones are ignored) and employees were loaded.
+    """
+    # Imported here: models imports database, which bootstraps through this module
+    from . import models
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        for name in ["employees", *DEPARTMENT_TABLES]:
+            present = {row[1] for row in conn.execute(f'PRAGMA table_info("{name}")')}
+            if not {column.name for column in models.Base.metadata.tables[name].columns} <= present:
+                return False
+        return conn.execute("SELECT EXISTS (SELECT 1 FROM employees)").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def stamp_version(db_path=DB_PATH):
+    """Marks a database as holding the current DATA_VERSION."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute(f"PRAGMA user_version = {DATA_VERSION}")
+    finally:
+        conn.close()
+
+
+def load_employees(db_path, chunks):
+    """
+    Loads employee rows into `db_path` and stamps it with DATA_VERSION.
+
+    The employees, sales, RD and HR tables are recreated from the declared
+    models (typed columns, primary keys). Each chunk is inserted with one
+    executemany in a single transaction; the department tables are filled
+    with INSERT ... SELECT and indexes are built once everything is loaded,
+    so memory stays bounded by one chunk.
+
+    Args:
+        db_path (Path): SQLite database file.
+        chunks (iterable): DataFrames named after the Employee columns;
+            missing columns are stored as NULL (HR_DEFAULTS for HR columns).
+
+    Returns:
+        dict: Rows loaded per table and ingestion throughput.
+    """
+    # Imported here: models imports database, which bootstraps through this module
+    from . import models, workers
+
+    db_path = Path(db_path)
     print(db_path)
-    csv_path = os.path.join(path, csv_file)
-    df = pd.read_csv(csv_path)
-    
-    # Added default evaluation score, evaluation note and comments column for HR.
-    df['score'] = 0.0
-    df['evaluation_note'] = None
-    df['comment'] = ""
-    
-    # We use EmployeeNumber as the ID
-    df = df.rename(columns={'EmployeeNumber': 'id'})
-    
+    employees = models.Employee.__table__
+    departments = {name: models.Base.metadata.tables[name] for name in DEPARTMENT_TABLES}
+    columns = [column.name for column in employees.columns]
+    types = {column.name: column.type.python_type for column in employees.columns}
+    insert_sql = f"INSERT INTO employees ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
     # Ensure parent directory exists so SQLite can create the file
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    engine = create_engine('sqlite:////' + str(db_path))
-    if df.to_sql('employees', engine, if_exists='replace', index=False):
-        print(f"'hr_database.db' database created with {len(df)} employees.")
-        
-    else:
-        print("Error creating the database.")
-    
-    # Sales department
-    sales_df = data_department("Sales", df)
-    
-    if sales_df.to_sql('sales', engine, if_exists='replace', index=False):
-        print(f"Sales table created with {len(sales_df)} employees.")
-    else:
-        print("Error creating the Sales table.")
-    
-    # Research & Development department
-    rnd_df = data_department("Research & Development", df)
-    if rnd_df.to_sql('RD', engine, if_exists='replace', index=False):
-        print(f"RD table created with {len(rnd_df)} employees.")
-    else:
-        print("Error creating the RD table.")
-    
-    # Human Resources department
-    hr_df = data_department("Human Resources", df)
-    if hr_df.to_sql('HR', engine, if_exists='replace', index=False):
-        print(f"HR table created with {len(hr_df)} employees.")
-    else:
-        print("Error creating the HR table.")
+    engine = create_engine('sqlite:///' + str(db_path))
+    start = time.perf_counter()
+    stats = {}
+    with engine.begin() as conn:
+        # pysqlite only opens transactions before DML: begin explicitly so a
+        # failed load also rolls back the table drops
+        conn.exec_driver_sql("BEGIN")
+        for table in [employees, *departments.values()]:
+            table.drop(conn, checkfirst=True)
+            # Indexes are created after loading, not with the table
+            conn.execute(CreateTable(table))
+
+        rows = 0
+        for chunk in chunks:
+            values = [
+                _column_values(chunk[name], types[name]) if name in chunk
+                else [HR_DEFAULTS.get(name)] * len(chunk)
+                for name in columns
+            ]
+            conn.exec_driver_sql(insert_sql, list(zip(*values)))
+            rows += len(chunk)
+        stats['employees'] = rows
+        loaded = time.perf_counter()
+        print(f"'{db_path.name}' database created with {rows} employees "
+              f"({rows / max(loaded - start, 1e-9):,.0f} rows/s).")
+
+        for name, department in DEPARTMENT_TABLES.items():
+            table_columns = ', '.join(f'"{column.name}"' for column in departments[name].columns)
+            result = conn.exec_driver_sql(
+                f'INSERT INTO "{name}" ({table_columns}) SELECT {table_columns} '
+                f'FROM employees WHERE Department = ? ORDER BY id',
+                (department,),
+            )
+            stats[name] = result.rowcount
+            print(f"{name} table created with {result.rowcount} employees.")
+
+        for table in [employees, *departments.values()]:
+            for index in table.indexes:
+                index.create(conn)
+        # The data-version triggers were dropped with the tables: reinstall
+        # them and invalidate the caches of running workers
+        workers.install_data_version(conn)
+        workers.bump_data_version(conn)
+        # Stamped last, so an interrupted ingest is redone on the next start
+        conn.exec_driver_sql(f"PRAGMA user_version = {DATA_VERSION}")
+    engine.dispose()
+
+    elapsed = time.perf_counter() - start
+    stats.update(seconds=round(elapsed, 3), rows_per_second=round(rows / elapsed, 1) if elapsed else None)
+    print(f"Ingestion finished in {elapsed:.2f}s (indexes built in {time.perf_counter() - loaded:.2f}s).")
+    return stats
+
+
+def read_dataset(csv_path=None, chunk_rows=INGEST_CHUNK_ROWS):
+    """Yields the dataset CSV in chunks, typed after the Employee model."""
+    from . import models
+
+    dtypes = _csv_dtypes(models.Employee.__table__)
+    for chunk in pd.read_csv(dataset_csv_path(csv_path), dtype=dtypes,
+                             usecols=lambda c: c in dtypes, chunksize=chunk_rows):
+        # We use EmployeeNumber as the ID
+        yield chunk.rename(columns={'EmployeeNumber': 'id'})
+
+
+def setup_db(db_path=DB_PATH, csv_path=None, chunk_rows=INGEST_CHUNK_ROWS):
+    """
+    Streams the dataset CSV into `db_path` in chunks of `chunk_rows` rows
+    (see load_employees).
+
+    Args:
+        db_path (Path): SQLite database file.
+        csv_path (str): Dataset CSV (defaults to HR_DATASET_CSV, then Kaggle).
+        chunk_rows (int): Rows per chunk.
+
+    Returns:
+        dict: Rows loaded per table and ingestion throughput.
+    """
+    # Resolved (or downloaded) before any table is touched
+    source = dataset_csv_path(csv_path)
+    return load_employees(db_path, read_dataset(source, chunk_rows))
+
+
+def bootstrap_db(db_path=DB_PATH, csv_path=None, force=False, chunk_rows=INGEST_CHUNK_ROWS):
+    """
+    Builds the database only when it is missing or older than DATA_VERSION,
+    so restarts do not re-download or re-ingest the dataset. An unversioned
+    database whose tables already have the declared columns is stamped
+    instead.
+
+    Returns:
+        bool: True if the database was (re)built.
+    """
+    version = database_version(db_path)
+    if not force and version >= DATA_VERSION:
+        return False
+    # Built before databases were versioned (e.g. the bundled one): the
+    # migrations bring it up to date, a rebuild would lose its rows
+    if not force and version == 0 and Path(db_path).exists() and has_current_schema(db_path):
+        stamp_version(db_path)
+        print(f"Unversioned database with the current schema: stamped with data version {DATA_VERSION}.")
+        return False
+    print(f"Database data version {version} < {DATA_VERSION}: building it.")
+    setup_db(db_path, csv_path, chunk_rows)
+    return True
+
+
 if __name__ == "__main__":
-    setup_db()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the HR database from the attrition dataset.")
+    parser.add_argument("--csv", help="Local dataset CSV (defaults to HR_DATASET_CSV, then Kaggle).")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the database is up to date.")
+    parser.add_argument("--chunk-rows", type=int, default=INGEST_CHUNK_ROWS, help="Rows per ingestion chunk.")
+    args = parser.parse_args()
+    if not bootstrap_db(csv_path=args.csv, force=args.force, chunk_rows=args.chunk_rows):
+        print(f"Database is up to date (data version {DATA_VERSION}).")
@@ -3,10 +3,11 @@ Database configuration module.
 Sets up the SQLite database connection and SQLAlchemy session factory.
 """
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from .data_setup import setup_db
+from .data_setup import bootstrap_db
+from . import workers
 from pathlib import Path
 
 
@@ -24,18 +25,41 @@ else:
 	# #print(f"DATA DIR:{data_dir}")
     
 	# # ensure data dir exists (no-op if it does)
-	try:
-		#os.makedirs(data_dir, exist_ok=True)
-		setup_db()
-	except Exception:
-		pass
+	#os.makedirs(data_dir, exist_ok=True)
 	#db_path = os.path.join(data_dir, "hr_database.db")
 	SQLALCHEMY_DATABASE_URL = f"sqlite:////{db_path}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+# WAL lets readers run while another worker writes; writers wait up to the
+# busy timeout for the write lock instead of failing with "database is locked"
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_SECONDS = float(os.getenv("SQLITE_BUSY_TIMEOUT_SECONDS", "30"))
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL,
+                       connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_SECONDS})
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+	cursor = dbapi_connection.cursor()
+	cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+	# NORMAL is durable in WAL mode except for the last commits on power loss
+	cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+	cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Only builds the database when it is missing or outdated (see data_setup.DATA_VERSION).
+# Runs after Base is defined: the ingester creates the tables declared in models.
+if not env_db:
+	try:
+		# Workers starting together: the first builds, the others find it up to date
+		with workers.startup_lock():
+			bootstrap_db(db_path)
+	except Exception as e:
+		print(f"Database bootstrap failed: {e}")
+
 # Quick helper for debugging (uncomment if needed)
 # if __name__ == '__main__':
 #      print('Using DB:', SQLALCHEMY_DATABASE_URL)
\ No newline at end of file
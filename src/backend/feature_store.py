@@ -0,0 +1,317 @@
+"""
+Feature store module.
+Keeps the encoded employee feature matrix (float32) in memory-mapped files
+with a row index keyed by employee id, patched incrementally on writes and
+shared by every worker process through the page cache.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import func
+
+from . import crud, models, workers
+from .ml_logic import CATEGORICAL_FEATURES, NUMERIC_FEATURES, FeatureEncoder
+
+FEATURE_STORE_DIR = Path(os.getenv(
+    "FEATURE_STORE_DIR", Path(__file__).resolve().parent.parent.parent / "data" / "feature_store"
+))
+FEATURE_STORE_ENABLED = os.getenv("FEATURE_STORE_ENABLED", "1") == "1"
+# Rows read from the database per chunk when building the store
+BUILD_CHUNK_ROWS = 50_000
+
+
+class FeatureStore:
+    """
+    Memory-mapped matrix of encoded employees.
+
+    Files: `features.f32` (capacity x n_features), `ids.i64` (employee id
+    per row, -1 when unused) and `meta.json` (categories, row count, capacity,
+    a generation bumped by every rebuild and the database data version the
+    rows reflect).
+    Writers take an exclusive file lock; readers notice appended rows through
+    the modification time of `meta.json`.
+    """
+
+    def __init__(self, path=FEATURE_STORE_DIR):
+        self.path = Path(path)
+        self.encoder = None
+        self.n_rows = 0
+        self.capacity = 0
+        self.generation = 0
+        self.data_version = None
+        self._features = None
+        self._ids = None
+        self._row_of = {}
+        self._meta_mtime = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._features is not None
+
+    @property
+    def feature_names(self):
+        return self.encoder.feature_names if self.encoder else []
+
+    def _file(self, name):
+        return self.path / name
+
+    def _write_meta(self):
+        meta = {
+            "categories": self.encoder.categories, "n_rows": self.n_rows,
+            "capacity": self.capacity, "generation": self.generation,
+            "data_version": self.data_version,
+        }
+        tmp = self._file("meta.json.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self._file("meta.json"))
+        self._meta_mtime = self._file("meta.json").stat().st_mtime_ns
+
+    def _map(self):
+        shape = (self.capacity, self.encoder.n_features)
+        self._features = np.memmap(self._file("features.f32"), dtype=np.float32, mode="r+", shape=shape)
+        self._ids = np.memmap(self._file("ids.i64"), dtype=np.int64, mode="r+", shape=(self.capacity,))
+
+    def _index_rows(self, start):
+        for row, emp_id in enumerate(self._ids[start:self.n_rows].tolist(), start):
+            self._row_of[emp_id] = row
+
+    def _allocate(self, capacity):
+        """Creates (or grows) the backing files to hold `capacity` rows."""
+        n_features = self.encoder.n_features
+        with open(self._file("features.f32"), "ab") as f:
+            f.truncate(capacity * n_features * 4)
+        with open(self._file("ids.i64"), "ab") as f:
+            f.truncate(capacity * 8)
+        old_capacity, self.capacity = self.capacity, capacity
+        self._map()
+        self._ids[old_capacity:capacity] = -1
+
+    def build(self, db, categories=None):
+        """
+        Rebuilds the store from the employees table, reading it in chunks.
+        `categories` fixes the one-hot layout (e.g. the served model's).
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            self._build(db, categories)
+
+    def _build(self, db, categories):
+        # Read before the rows, so the store is never older than its version
+        self.data_version = workers.data_version(db)
+        total = db.query(func.count(models.Employee.id)).scalar() or 0
+        columns = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+        if categories is None:
+            categories = crud.get_distinct_values(db, CATEGORICAL_FEATURES)
+        self.encoder = FeatureEncoder(categories)
+        # A new generation tells other processes to re-map the new files;
+        # numbered after meta.json, as another process may have rebuilt since
+        meta_path = self._file("meta.json")
+        on_disk = json.loads(meta_path.read_text(encoding="utf-8")).get("generation", 0) if meta_path.exists() else 0
+        self.generation = max(self.generation, on_disk) + 1
+        for name in ("features.f32", "ids.i64"):
+            self._file(name).unlink(missing_ok=True)
+        self.capacity, self.n_rows, self._row_of = 0, 0, {}
+        self._allocate(max(total, 1024))
+
+        for chunk in crud.iter_employee_features(db, columns, BUILD_CHUNK_ROWS):
+            end = self.n_rows + len(chunk)
+            self._features[self.n_rows:end] = self.encoder.encode_frame(chunk)
+            self._ids[self.n_rows:end] = chunk['id'].to_numpy()
+            self.n_rows = end
+        self._features.flush()
+        self._ids.flush()
+        self._index_rows(0)
+        self._write_meta()
+
+    def sync(self, db, version):
+        """
+        Rebuilds the store (same layout) when it is older than the database
+        `version`. Checked again under the file lock: another worker may have
+        rebuilt it meanwhile.
+        """
+        with self._lock, self._locked():
+            self._reload_meta()
+            if self.data_version == version:
+                return False
+            print(f"Feature store is at data version {self.data_version}, the database at {version}: rebuilding it.")
+            self._build(db, self.encoder.categories)
+            return True
+
+    def open(self):
+        """Maps an existing store. Returns False if there is none."""
+        meta_path = self._file("meta.json")
+        if not meta_path.exists():
+            return False
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        self.encoder = FeatureEncoder(meta["categories"])
+        self.capacity, self.n_rows = meta["capacity"], meta["n_rows"]
+        self.generation = meta.get("generation", 0)
+        self.data_version = meta.get("data_version")
+        self._meta_mtime = meta_path.stat().st_mtime_ns
+        self._map()
+        self._row_of = {}
+        self._index_rows(0)
+        return True
+
+    def _reload_meta(self):
+        meta = json.loads(self._file("meta.json").read_text(encoding="utf-8"))
+        if meta.get("generation", 0) != self.generation:
+            self.open()
+            return
+        start = self.n_rows
+        if meta["capacity"] != self.capacity:
+            self.capacity = meta["capacity"]
+            self._map()
+        self.n_rows = meta["n_rows"]
+        self.data_version = meta.get("data_version")
+        self._meta_mtime = self._file("meta.json").stat().st_mtime_ns
+        self._index_rows(start)
+
+    def refresh(self):
+        """Picks up rows appended by other processes (cheap when nothing changed)."""
+        if not self.is_open:
+            return
+        try:
+            mtime = self._file("meta.json").stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._meta_mtime:
+            with self._lock:
+                self._reload_meta()
+
+    def upsert(self, record, data_version=None):
+        """
+        Encodes one employee dict and patches (or appends) its row;
+        `data_version` is the database version read after that employee's write.
+        """
+        if not self.is_open:
+            return
+        with self._lock, self._locked():
+            self._reload_meta()
+            emp_id = int(record["id"])
+            row = self._row_of.get(emp_id)
+            if row is None:
+                if self.n_rows == self.capacity:
+                    self._allocate(self.capacity * 2)
+                row = self.n_rows
+                self.n_rows += 1
+                self._ids[row] = emp_id
+                self._row_of[emp_id] = row
+            self._features[row] = self.encoder.encode_records([record])[0]
+            # Only when this write is the one change since the store's version:
+            # otherwise another process wrote too, and the next read rebuilds
+            if data_version is not None and self.data_version is not None and data_version == self.data_version + 1:
+                self.data_version = data_version
+            self._write_meta()
+
+    def _locked(self):
+        return workers.FileLock(self.path / ".lock")
+
+    def matrix(self, feature_names=None, department=None, ids=None):
+        """
+        Returns (employee ids, feature matrix) for all rows, one department or
+        some ids. With `feature_names` the columns are aligned to that layout
+        (missing columns are zeros); otherwise the stored layout is returned.
+        """
+        self.refresh()
+        X = self._features[:self.n_rows]
+        emp_ids = np.asarray(self._ids[:self.n_rows])
+
+        if ids is not None:
+            rows = np.asarray([self._row_of[i] for i in map(int, ids) if i in self._row_of], dtype=np.int64)
+            X, emp_ids = X[rows], emp_ids[rows]
+        if department is not None:
+            name = f"Department={department}"
+            if name not in self.feature_names:
+                return emp_ids[:0], np.zeros((0, len(feature_names or self.feature_names)), dtype=np.float32)
+            mask = X[:, self.feature_names.index(name)] == 1.0
+            X, emp_ids = X[mask], emp_ids[mask]
+
+        if feature_names is not None and feature_names != self.feature_names:
+            position = {name: i for i, name in enumerate(self.feature_names)}
+            aligned = np.zeros((len(X), len(feature_names)), dtype=np.float32)
+            for j, name in enumerate(feature_names):
+                if name in position:
+                    aligned[:, j] = X[:, position[name]]
+            X = aligned
+        return emp_ids, np.asarray(X)
+
+    def stats(self):
+        return {
+            "open": self.is_open,
+            "rows": self.n_rows,
+            "capacity": self.capacity,
+            "features": len(self.feature_names),
+            "size_mb": round(self.capacity * len(self.feature_names) * 4 / (1024 * 1024), 2),
+            "path": str(self.path),
+        }
+
+
+store = FeatureStore()
+
+
+def ensure_store(db, categories=None):
+    """
+    Opens the feature store, rebuilding it when it is missing or does not
+    match the employees table (different row count or max id) or the
+    database was written since (another data version, e.g. an update made
+    by a script or a worker that could not patch the store).
+    """
+    if not FEATURE_STORE_ENABLED:
+        return None
+    count, max_id = db.query(func.count(models.Employee.id), func.max(models.Employee.id)).one()
+    if store.open() and store.n_rows == (count or 0) and (
+        store.n_rows == 0 or int(store._ids[:store.n_rows].max()) == max_id
+    ) and store.data_version == workers.data_version(db):
+        return store
+    store.build(db, categories)
+    return store
+
+
+def upsert_employee(record, data_version=None):
+    """Patches the store after an employee write (no-op if the store is closed)."""
+    if FEATURE_STORE_ENABLED and store.is_open:
+        store.upsert(record, data_version)
+
+
+def ensure_layout(db, encoder):
+    """
+    Rebuilds the store in `encoder`'s one-hot layout when it lacks some of
+    its columns (a retrained model saw new categories): matrix() would fill
+    them with zeros and the scores would be wrong.
+    """
+    store.refresh()
+    missing = set(encoder.feature_names).difference(store.feature_names)
+    if missing:
+        print(f"Feature store lacks {len(missing)} columns of the served model "
+              f"({', '.join(sorted(missing)[:3])}...): rebuilding it.")
+        store.build(db, encoder.categories)
+
+
+def ensure_current(db):
+    """
+    Rebuilds the store when the database was written without patching it
+    (bulk loads, migrations, other processes): its data version then differs
+    from the database's. Costs one single-row query when both match.
+    """
+    version = workers.data_version(db)
+    store.refresh()
+    if version is not None and store.data_version != version:
+        store.sync(db, version)
+
+
+def employee_matrix(db, encoder, department=None, ids=None):
+    """
+    Returns (employee ids, feature matrix in `encoder`'s layout), from the
+    feature store when it is open, otherwise from a database query.
+    """
+    if FEATURE_STORE_ENABLED and store.is_open:
+        ensure_layout(db, encoder)
+        ensure_current(db)
+        return store.matrix(encoder.feature_names, department, ids)
+    df = crud.get_employee_features(db, NUMERIC_FEATURES + CATEGORICAL_FEATURES, department, ids)
+    return df['id'].to_numpy(), encoder.encode_frame(df)
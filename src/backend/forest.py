@@ -0,0 +1,117 @@
+"""
+Dependency-free inference for tree ensembles.
+Exports a trained scikit-learn random forest to flat NumPy arrays and
+evaluates it with a vectorized traversal (no scikit-learn needed at serving time).
+"""
+import numpy as np
+
+# Rows evaluated at once; keeps the (rows x trees) working arrays cache-sized
+CHUNK_ROWS = 256
+
+
+class NumpyForest:
+    """
+    A random forest flattened into node arrays shared by all trees.
+
+    Leaves point to themselves with a threshold of +inf, so every tree can be
+    walked for exactly `max_depth` steps without per-node branching.
+    """
+
+    def __init__(self, feature, threshold, left, right, leaf_proba, roots, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        # Largest float32 <= each threshold: for float32 inputs `x <= t32` is
+        # exactly `x <= threshold`, with half the memory traffic
+        t32 = threshold.astype(np.float32)
+        self._threshold32 = np.where(t32 > threshold, np.nextafter(t32, np.float32(-np.inf)), t32)
+        # children[2 * node + 1] is the left child, children[2 * node] the right one,
+        # so the next node is a single gather indexed by the comparison result
+        self._children = np.column_stack([right, left]).ravel()
+
+    @classmethod
+    def from_sklearn(cls, estimator):
+        """Builds the flat arrays from a fitted RandomForestClassifier (binary)."""
+        features, thresholds, lefts, rights, probas, roots = [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for tree in (est.tree_ for est in estimator.estimators_):
+            n = tree.node_count
+            nodes = np.arange(n, dtype=np.int32) + offset
+            is_leaf = tree.children_left < 0
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, nodes, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, nodes, tree.children_right + offset).astype(np.int32))
+            counts = tree.value[:, 0, :]
+            probas.append(counts[:, 1] / counts.sum(axis=1))
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            np.concatenate(features), np.concatenate(thresholds),
+            np.concatenate(lefts), np.concatenate(rights),
+            np.concatenate(probas), np.asarray(roots, dtype=np.int32), max_depth,
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _positive_proba(self, X):
+        flat = X.ravel()
+        row_offsets = (np.arange(len(X), dtype=np.int32) * np.int32(X.shape[1]))[:, None]
+        idx = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        # Gathers write into buffers reused at every level: large batches are
+        # bound by memory traffic, not by the comparisons
+        position = np.empty_like(idx)
+        value = np.empty(idx.shape, dtype=np.float32)
+        threshold = np.empty(idx.shape, dtype=np.float32)
+        go_left = np.empty(idx.shape, dtype=bool)
+        for _ in range(self.max_depth):
+            np.take(self.feature, idx, out=position)
+            position += row_offsets
+            np.take(flat, position, out=value)
+            np.take(self._threshold32, idx, out=threshold)
+            np.less_equal(value, threshold, out=go_left)
+            idx *= 2
+            idx += go_left
+            np.take(self._children, idx, out=idx)
+        return self.leaf_proba[idx].mean(axis=1)
+
+    def predict_proba(self, X):
+        """Returns class probabilities with the same layout as scikit-learn, shape (n, 2)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        positive = np.concatenate([
+            self._positive_proba(X[start:start + CHUNK_ROWS])
+            for start in range(0, len(X), CHUNK_ROWS)
+        ]) if len(X) else np.empty(0)
+        return np.column_stack([1.0 - positive, positive])
+
+    def to_arrays(self):
+        return {
+            "feature": self.feature, "threshold": self.threshold,
+            "left": self.left, "right": self.right, "leaf_proba": self.leaf_proba,
+            "roots": self.roots, "max_depth": np.asarray(self.max_depth),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"],
+                   arrays["leaf_proba"], arrays["roots"], arrays["max_depth"])
+
+
+def verify_export(estimator, forest, X, atol=1e-6):
+    """Checks that the exported forest reproduces predict_proba on X (raises if not)."""
+    expected = estimator.predict_proba(X)
+    actual = forest.predict_proba(X)
+    diff = float(np.abs(expected - actual).max()) if len(X) else 0.0
+    if diff > atol:
+        raise ValueError(f"Exported forest differs from scikit-learn by {diff:.2e} (tolerance {atol:.0e}).")
+    return diff
@@ -0,0 +1,215 @@
+"""
+Request metrics module.
+ASGI middleware recording per-route request counts, latency and response size
+histograms, in-flight requests and DB query counts, rendered in Prometheus text format.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Statements of the current request; a mutable object so the statements run
+# in threadpool endpoints (which run in a copy of the context) are seen here
+_request_queries = ContextVar("request_queries", default=None)
+
+
+class RequestQueries:
+    """Statements executed while serving one request: count, time and totals per SQL text."""
+
+    __slots__ = ("count", "total_ms", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements = {}  # SQL text -> [executions, total ms]
+
+    def add(self, statement, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.statements[statement] = [1, elapsed_ms]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed_ms
+
+    def repeated(self, threshold):
+        """Statements executed at least `threshold` times, most frequent first."""
+        return sorted(
+            ({"statement": sql, "executions": n, "total_ms": round(ms, 2)}
+             for sql, (n, ms) in self.statements.items() if n >= threshold),
+            key=lambda item: -item["executions"],
+        )
+
+
+def track_request_queries():
+    """
+    Returns (statements of the current request, reset token). The outermost
+    middleware asking creates them and gets the token; inner ones share them
+    and get None.
+    """
+    queries = _request_queries.get()
+    if queries is not None:
+        return queries, None
+    queries = RequestQueries()
+    return queries, _request_queries.set(queries)
+
+
+def release_request_queries(token):
+    """Ends the request's statement tracking if `token` (from track_request_queries) created it."""
+    if token is not None:
+        _request_queries.reset(token)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (counts per upper bound, sum and total count)."""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines, cumulative = [], 0
+        for bound, n in zip(self.bounds + ("+Inf",), self.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RouteMetrics:
+    """Metrics of one route (operation_id)."""
+
+    __slots__ = ("responses", "latency", "size", "queries")
+
+    def __init__(self):
+        self.responses = {}  # (method, status) -> count
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+
+
+class MetricsRegistry:
+    """
+    In-process metrics store. Updated only from the event loop (the middleware
+    records after each response), so no locking is needed on the hot path.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.in_flight = 0
+
+    def record(self, operation, method, status, seconds, size, queries):
+        route = self.routes.get(operation)
+        if route is None:
+            route = self.routes[operation] = RouteMetrics()
+        key = (method, status)
+        route.responses[key] = route.responses.get(key, 0) + 1
+        route.latency.observe(seconds)
+        route.size.observe(size)
+        route.queries.observe(queries)
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Responses sent, per route, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        routes = sorted(self.routes.items())
+        for operation, route in routes:
+            for (method, status), n in sorted(route.responses.items()):
+                lines.append(f'http_requests_total{{operation="{operation}",method="{method}",status="{status}"}} {n}')
+        for name, attr, help_text in (
+            ("http_request_duration_seconds", "latency", "Request latency in seconds."),
+            ("http_response_size_bytes", "size", "Response body size in bytes."),
+            ("http_request_db_queries", "queries", "Database statements executed per request."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for operation, route in routes:
+                lines += getattr(route, attr).render(name, f'operation="{operation}"')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def _operation(scope):
+    route = scope.get("route")
+    return getattr(route, "operation_id", None) or getattr(route, "name", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request and recording it in `registry`."""
+
+    def __init__(self, app, metrics=registry):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response = {"status": 500, "size": 0}
+        queries, token = track_request_queries()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.metrics.in_flight -= 1
+            release_request_queries(token)
+            self.metrics.record(_operation(scope), scope["method"], response["status"],
+                                elapsed, response["size"], queries.count)
+
+
+# Called as hook(conn, cursor, statement, parameters, elapsed_ms, executemany)
+# after every statement (e.g. the slow-query log of query_profiler)
+statement_hooks = []
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    queries = _request_queries.get()
+    if queries is not None:
+        queries.add(statement, elapsed_ms)
+    for hook in statement_hooks:
+        hook(conn, cursor, statement, parameters, elapsed_ms, executemany)
+
+
+def instrument_engine(engine):
+    """Times the statements executed on `engine`, for the current request and the statement_hooks."""
+    if not event.contains(engine, "after_cursor_execute", _after_execute):
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
@@ -1,51 +1,165 @@
 """
-Migration script to add evaluation_note and comment columns
-to the employees table if they do not already exist.
+Versioned schema migrations.
+Applies the ordered MIGRATIONS exactly once per database, recording each one
+in the schema_migrations table; startup only compares version numbers.
 """
-import sqlite3
-from pathlib import Path
-
-def migrate_database():
-    """Adds evaluation_note and comment columns to the employees table."""
-    db_path = Path(__file__).resolve().parent.parent.parent / "data" / "hr_database.db"
-    
-    if not db_path.exists():
-        print(f"Database not found: {db_path}")
-        print("The database will be created automatically on next startup.")
+import os
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table, inspect, func, select
+
+from .database import Base, engine as default_engine
+
+# Rows touched per transaction by data backfills
+MIGRATION_BATCH_ROWS = int(os.getenv("MIGRATION_BATCH_ROWS", "10000"))
+
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+    Column("duration_s", Float),
+)
+
+
+def add_column(engine, table, column, ddl_type):
+    """Adds a column unless it already exists (databases built before the runner)."""
+    if column in {col["name"] for col in inspect(engine).get_columns(table)}:
         return
-    
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    
-    try:
-        # Check if columns already exist
-        cursor.execute("PRAGMA table_info(employees)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        # Add evaluation_note if it doesn't exist
-        if 'evaluation_note' not in columns:
-            print("Adding column 'evaluation_note'...")
-            cursor.execute("ALTER TABLE employees ADD COLUMN evaluation_note REAL")
-            print("✓ Column 'evaluation_note' added successfully.")
-        else:
-            print("✓ Column 'evaluation_note' already exists.")
-        
-        # Add comment if it doesn't exist
-        if 'comment' not in columns:
-            print("Adding column 'comment'...")
-            cursor.execute("ALTER TABLE employees ADD COLUMN comment TEXT")
-            print("✓ Column 'comment' added successfully.")
-        else:
-            print("✓ Column 'comment' already exists.")
-        
-        conn.commit()
-        print("\n✅ Migration completed successfully!")
-        
-    except Exception as e:
-        conn.rollback()
-        print(f"Error during migration: {e}")
-    finally:
-        conn.close()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {ddl_type}')
+    print(f"✓ Column '{table}.{column}' added.")
+
+
+def build_indexes(engine, tables):
+    """Builds the declared indexes of `tables` that are missing, one transaction per index."""
+    for name in tables:
+        for index in Base.metadata.tables[name].indexes:
+            with engine.begin() as conn:
+                index.create(conn, checkfirst=True)
+
+
+def backfill(engine, table, assignment, condition, batch_rows=MIGRATION_BATCH_ROWS):
+    """
+    Runs `UPDATE table SET assignment WHERE condition` over id ranges of
+    `batch_rows`, committing after each one so writers are never blocked
+    for long.
+    """
+    with engine.connect() as conn:
+        low, high = conn.exec_driver_sql(f'SELECT min(id), max(id) FROM "{table}"').one()
+    if low is None:
+        return 0
+    updated = 0
+    for start in range(low, high + 1, batch_rows):
+        with engine.begin() as conn:
+            result = conn.exec_driver_sql(
+                f'UPDATE "{table}" SET {assignment} WHERE id >= ? AND id < ? AND ({condition})',
+                (start, start + batch_rows),
+            )
+            updated += result.rowcount
+    return updated
+
+
+def _create_tables(engine):
+    # Tables declared in models that do not exist yet (e.g. users_rh)
+    from . import models  # noqa: F401  (registers the tables on Base)
+    Base.metadata.create_all(bind=engine)
+
+
+def _add_hr_columns(engine):
+    add_column(engine, "employees", "score", "FLOAT")
+    add_column(engine, "employees", "evaluation_note", "FLOAT")
+    add_column(engine, "employees", "comment", "VARCHAR")
+
+
+def _build_indexes(engine):
+    # Id indexes come first: the backfills below scan id ranges
+    build_indexes(engine, ["employees", "sales", "RD", "HR", "users_rh"])
+
+
+def _backfill_hr_defaults(engine):
+    updated = backfill(engine, "employees", "score = 0.0", "score IS NULL")
+    updated += backfill(engine, "employees", "comment = ''", "comment IS NULL")
+    print(f"✓ {updated} HR follow-up values backfilled.")
+
+
+def _hash_plaintext_passwords(engine):
+    # Accounts created before bcrypt hashing stored the password itself
+    from .auth import hash_password
+    with engine.begin() as conn:
+        rows = conn.exec_driver_sql(
+            "SELECT email, password FROM users_rh WHERE password IS NOT NULL AND password NOT LIKE '$2%'"
+        ).all()
+        for email, password in rows:
+            conn.exec_driver_sql("UPDATE users_rh SET password = ? WHERE email = ?", (hash_password(password), email))
+    print(f"✓ {len(rows)} RH user passwords hashed.")
+
+
+def _track_data_version(engine):
+    # Counter read by the caches of every worker (see workers.py)
+    from .workers import install_data_version
+    with engine.begin() as conn:
+        install_data_version(conn)
+    print("✓ Data version counter and triggers installed.")
+
+
+# (version, name, function(engine)): append only, never reorder or edit applied ones
+MIGRATIONS = [
+    (1, "create_declared_tables", _create_tables),
+    (2, "add_employee_hr_columns", _add_hr_columns),
+    (3, "build_declared_indexes", _build_indexes),
+    (4, "backfill_hr_defaults", _backfill_hr_defaults),
+    (5, "hash_plaintext_passwords", _hash_plaintext_passwords),
+    (6, "track_data_version", _track_data_version),
+]
+
+
+def current_version(engine=default_engine):
+    """Returns the highest applied migration version (0 for a fresh database)."""
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        return conn.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+
+
+def migrate_database(engine=default_engine):
+    """
+    Applies the pending migrations in order.
+
+    Args:
+        engine (Engine): Database to migrate (defaults to the DATABASE_URL one).
+
+    Returns:
+        list: Versions applied by this call (empty when already up to date).
+    """
+    version = current_version(engine)
+    pending = [m for m in MIGRATIONS if m[0] > version]
+    if not pending:
+        return []
+
+    applied = []
+    for number, name, migration in pending:
+        print(f"Applying migration {number:03d} {name}...")
+        start = time.perf_counter()
+        migration(engine)
+        duration = time.perf_counter() - start
+        with engine.begin() as conn:
+            conn.execute(schema_migrations.insert().values(
+                version=number, name=name,
+                applied_at=datetime.now(timezone.utc), duration_s=round(duration, 3),
+            ))
+        applied.append(number)
+    print(f"\n✅ Database migrated to version {applied[-1]}.")
+    return applied
+
 
 if __name__ == "__main__":
-    migrate_database()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply pending database migrations.")
+    parser.add_argument("--status", action="store_true", help="Only print the current and latest versions.")
+    args = parser.parse_args()
+    if args.status:
+        print(f"Database version {current_version()} (latest {MIGRATIONS[-1][0]}).")
+    elif not migrate_database():
+        print(f"Database is up to date (version {MIGRATIONS[-1][0]}).")
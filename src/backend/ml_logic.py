@@ -1,24 +1,559 @@
+"""
+Machine learning logic for attrition prediction.
+Trains a RandomForest on the employees table, saves versioned artifacts
+(model and encoders) and serves predictions from the model loaded at startup.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
 
-# Note: In production, the model should be pre-trained and saved (pickle)
+from .forest import NumpyForest, verify_export
+from .prediction_cache import PredictionCache
+
+# Folder holding the versioned model artifacts
+MODEL_DIR = Path(os.getenv("MODEL_DIR", Path(__file__).resolve().parent.parent.parent / "data" / "models"))
+CURRENT_POINTER = "attrition_current.json"
+# 'numpy' serves the exported forest without scikit-learn, 'sklearn' the pickled estimator
+INFERENCE_BACKEND = os.getenv("ATTRITION_INFERENCE", "numpy")
+# Opt-in: with the numpy backend, batches at least this large (in scored rows,
+# i.e. employees x scenarios) use the pickled scikit-learn estimator. It costs
+# the scikit-learn import and a second copy of the forest in every worker;
+# 0 (default) keeps every call on NumPy
+BATCH_ESTIMATOR_ROWS = int(os.getenv("ATTRITION_BATCH_ESTIMATOR_ROWS", "0"))
+
+# Probability above which an employee is predicted to leave
+ATTRITION_THRESHOLD = float(os.getenv("ATTRITION_THRESHOLD", "0.4"))
+# Largest number of scenarios (employees x raises x years) scored in one simulation
+MAX_SIMULATION_CELLS = int(os.getenv("MAX_SIMULATION_CELLS", "200000"))
+# Share of employees (picked by id) kept out of training to evaluate models
+HOLDOUT_PERCENT = 20
+
+NUMERIC_FEATURES = [
+    'Age', 'DailyRate', 'DistanceFromHome', 'Education', 'EnvironmentSatisfaction',
+    'HourlyRate', 'JobInvolvement', 'JobLevel', 'JobSatisfaction', 'MonthlyIncome',
+    'MonthlyRate', 'NumCompaniesWorked', 'PercentSalaryHike', 'PerformanceRating',
+    'RelationshipSatisfaction', 'StockOptionLevel', 'TotalWorkingYears',
+    'TrainingTimesLastYear', 'WorkLifeBalance', 'YearsAtCompany', 'YearsInCurrentRole',
+    'YearsSinceLastPromotion', 'YearsWithCurrManager',
+]
+CATEGORICAL_FEATURES = [
+    'BusinessTravel', 'Department', 'EducationField', 'Gender',
+    'JobRole', 'MaritalStatus', 'OverTime',
+]
+TARGET = 'Attrition'
+
+
+class FeatureEncoder:
+    """
+    Encodes employees into a float32 feature matrix.
+
+    Numeric columns are copied as-is and categorical columns are one-hot
+    encoded with a fixed list of categories; unknown categories encode to
+    all zeros.
+    """
+
+    def __init__(self, categories):
+        self.categories = categories
+        self.feature_names = list(NUMERIC_FEATURES)
+        self._offsets = {}
+        self._index = {}
+        for col in CATEGORICAL_FEATURES:
+            self._offsets[col] = len(self.feature_names)
+            self._index[col] = {value: i for i, value in enumerate(categories[col])}
+            self.feature_names.extend(f"{col}={value}" for value in categories[col])
+
+    @classmethod
+    def from_frame(cls, df):
+        """Builds an encoder with the categories present in a DataFrame."""
+        return cls({col: sorted(df[col].dropna().astype(str).unique().tolist()) for col in CATEGORICAL_FEATURES})
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def encode_frame(self, df):
+        """Encodes a DataFrame of employees into a float32 feature matrix."""
+        X = np.zeros((len(df), self.n_features), dtype=np.float32)
+        X[:, :len(NUMERIC_FEATURES)] = (
+            df.reindex(columns=NUMERIC_FEATURES).apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy()
+        )
+        rows = np.arange(len(df))
+        for col in CATEGORICAL_FEATURES:
+            values = df[col].astype(str) if col in df else pd.Series([''] * len(df))
+            codes = pd.Categorical(values, categories=self.categories[col]).codes
+            known = codes >= 0
+            X[rows[known], self._offsets[col] + codes[known]] = 1.0
+        return X
+
+    def encode_records(self, records):
+        """Encodes a list of employee dicts (fast path for single requests)."""
+        X = np.zeros((len(records), self.n_features), dtype=np.float32)
+        for i, record in enumerate(records):
+            X[i, :len(NUMERIC_FEATURES)] = [float(record.get(col) or 0) for col in NUMERIC_FEATURES]
+            for col in CATEGORICAL_FEATURES:
+                pos = self._index[col].get(str(record.get(col)))
+                if pos is not None:
+                    X[i, self._offsets[col] + pos] = 1.0
+        return X
+
+
+class AttritionModel(FeatureEncoder):
+    """
+    A trained attrition classifier together with its categorical encoders.
+    """
+
+    def __init__(self, estimator, categories, version=0, trained_at=None, metrics=None,
+                 batch_loader=None):
+        super().__init__(categories)
+        self.estimator = estimator
+        self._batch_loader = batch_loader
+        self._batch_estimator = None
+        self.version = version
+        self.trained_at = trained_at
+        self.metrics = metrics or {}
+
+    def predict_proba(self, X):
+        """Returns the probability of attrition for each row of X."""
+        if self._batch_loader is not None and BATCH_ESTIMATOR_ROWS and len(X) >= BATCH_ESTIMATOR_ROWS:
+            if self._batch_estimator is None:
+                try:
+                    self._batch_estimator = self._batch_loader()
+                except Exception as e:
+                    print(f"Batch estimator unavailable, staying on the NumPy forest: {e}")
+                    self._batch_loader = None
+                    return self.estimator.predict_proba(X)[:, 1]
+                print(f"Loaded the scikit-learn estimator of model v{self.version} "
+                      f"for batches of {BATCH_ESTIMATOR_ROWS}+ rows.")
+            return self._batch_estimator.predict_proba(X)[:, 1]
+        return self.estimator.predict_proba(X)[:, 1]
+
+    def to_artifact(self):
+        return {
+            "estimator": self.estimator,
+            "categories": self.categories,
+            "version": self.version,
+            "trained_at": self.trained_at,
+            "metrics": self.metrics,
+        }
+
+    @classmethod
+    def from_artifact(cls, artifact):
+        return cls(artifact["estimator"], artifact["categories"], artifact["version"],
+                   artifact.get("trained_at"), artifact.get("metrics"))
+
+
+def load_training_frame(bind):
+    """Reads the labelled employees used for training in a single query."""
+    columns = ", ".join(f'"{col}"' for col in ['id'] + NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET])
+    query = f"SELECT {columns} FROM employees WHERE Attrition IN ('Yes', 'No')"
+    return pd.read_sql(query, bind)
+
+
+def holdout_mask(ids):
+    """
+    True for the employees of the evaluation holdout. Chosen from the id
+    alone, so an employee stays on the same side in every data snapshot:
+    no trained model has seen the holdout of any later snapshot.
+    """
+    hashed = np.asarray(ids, dtype=np.uint64) * np.uint64(2654435761) % np.uint64(2 ** 32)
+    return hashed % np.uint64(100) < HOLDOUT_PERCENT
+
+
+def holdout_auc(model, df):
+    """ROC AUC of a model on the holdout employees of `df` (encoded with its own categories)."""
+    from sklearn.metrics import roc_auc_score
+
+    holdout = df[holdout_mask(df['id'])]
+    return round(float(roc_auc_score(holdout[TARGET] == 'Yes', model.predict_proba(model.encode_frame(holdout)))), 4)
+
+
+def train_model(df, n_estimators=200, max_depth=12, random_state=42):
+    """
+    Fits the attrition classifier on a DataFrame of labelled employees.
+
+    The holdout employees (see holdout_mask) are left out of training and
+    used for the reported metrics.
+
+    Args:
+        df (DataFrame): Employees with 'id', feature columns and 'Attrition'.
+        n_estimators (int): Number of trees in the forest.
+        max_depth (int): Maximum depth of each tree.
+        random_state (int): Seed for reproducible training.
+
+    Returns:
+        AttritionModel: The trained (not yet saved) model.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import accuracy_score, roc_auc_score
+
+    model = AttritionModel(None, FeatureEncoder.from_frame(df).categories)
+    X = model.encode_frame(df)
+    y = (df[TARGET] == 'Yes').to_numpy(dtype=np.int8)
+    test = holdout_mask(df['id'])
+
+    model.estimator = RandomForestClassifier(
+        n_estimators=n_estimators, max_depth=max_depth, min_samples_leaf=2,
+        class_weight="balanced_subsample", n_jobs=-1, random_state=random_state,
+    ).fit(X[~test], y[~test])
+    proba = model.estimator.predict_proba(X[test])[:, 1]
+    model.metrics = {
+        "roc_auc": round(float(roc_auc_score(y[test], proba)), 4),
+        "accuracy": round(float(accuracy_score(y[test], proba > ATTRITION_THRESHOLD)), 4),
+        "n_rows": int(len(df)),
+        "n_train_rows": int((~test).sum()),
+    }
+
+    # Single-threaded prediction avoids joblib overhead on per-request calls
+    model.estimator.n_jobs = 1
+    model.metrics["numpy_export_max_diff"] = verify_export(
+        model.estimator, NumpyForest.from_sklearn(model.estimator), X
+    )
+    model.trained_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    return model
+
+
+def _artifact_path(version, model_dir=MODEL_DIR):
+    return Path(model_dir) / f"attrition_v{version}.joblib"
+
+
+def _numpy_artifact_path(version, model_dir=MODEL_DIR):
+    return Path(model_dir) / f"attrition_v{version}.npz"
+
+
+def list_versions(model_dir=MODEL_DIR):
+    """Returns the versions of the saved artifacts, in ascending order."""
+    return sorted(int(p.stem.split("_v")[-1]) for p in Path(model_dir).glob("attrition_v*.joblib"))
+
+
+def current_version(model_dir=MODEL_DIR):
+    """Returns the version currently promoted for serving (None if no model)."""
+    pointer = Path(model_dir) / CURRENT_POINTER
+    if pointer.exists():
+        return json.loads(pointer.read_text(encoding="utf-8"))["version"]
+    versions = list_versions(model_dir)
+    return versions[-1] if versions else None
+
+
+def save_model(model, model_dir=MODEL_DIR, promote=True):
+    """
+    Saves a model as the next versioned artifact and, if `promote`, marks it
+    as the version to serve. Files are written then renamed so readers never
+    see a partial artifact.
+    """
+    import joblib
+
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    versions = list_versions(model_dir)
+    model.version = (versions[-1] + 1) if versions else 1
+
+    # Flat-array export served without scikit-learn (see forest.py)
+    forest = model.estimator if isinstance(model.estimator, NumpyForest) else NumpyForest.from_sklearn(model.estimator)
+    meta = {key: value for key, value in model.to_artifact().items() if key != "estimator"}
+    npz_path = _numpy_artifact_path(model.version, model_dir)
+    tmp = npz_path.with_suffix(".tmp.npz")
+    np.savez(tmp, meta=np.asarray(json.dumps(meta)), **forest.to_arrays())
+    os.replace(tmp, npz_path)
+
+    path = _artifact_path(model.version, model_dir)
+    tmp = path.with_suffix(".tmp")
+    joblib.dump(model.to_artifact(), tmp)
+    os.replace(tmp, path)
+
+    if promote:
+        promote_version(model.version, model_dir)
+    return path
+
+
+def promote_version(version, model_dir=MODEL_DIR):
+    """Atomically marks a saved version as the one to serve."""
+    pointer = Path(model_dir) / CURRENT_POINTER
+    tmp = pointer.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"version": version}), encoding="utf-8")
+    os.replace(tmp, pointer)
+
+
+def load_model(version=None, model_dir=MODEL_DIR, backend=None):
+    """
+    Loads a saved model (the current version by default). Returns None if missing.
+
+    With the 'numpy' backend the flat-array export is used when present, so
+    neither joblib nor scikit-learn is imported.
+    """
+    version = version if version is not None else current_version(model_dir)
+    if version is None:
+        return None
+
+    npz_path = _numpy_artifact_path(version, model_dir)
+    if (backend or INFERENCE_BACKEND) == "numpy" and npz_path.exists():
+        with np.load(npz_path, allow_pickle=False) as arrays:
+            meta = json.loads(str(arrays["meta"]))
+            forest = NumpyForest.from_arrays({key: arrays[key] for key in arrays.files if key != "meta"})
+        model = AttritionModel.from_artifact({**meta, "estimator": forest})
+        if _artifact_path(version, model_dir).exists():
+            model._batch_loader = lambda: _load_joblib(version, model_dir)["estimator"]
+        return model
+
+    if not _artifact_path(version, model_dir).exists():
+        return None
+    return AttritionModel.from_artifact(_load_joblib(version, model_dir))
+
+
+def _load_joblib(version, model_dir=MODEL_DIR):
+    import joblib
+
+    return joblib.load(_artifact_path(version, model_dir))
+
+
+# Model served by the API, loaded once at startup
+_model = None
+# (model dir, pointer file mtime) when _model was last checked against the
+# promoted version; None until ensure_model ran
+_pointer_state = None
+_reload_lock = threading.Lock()
+# Cache of interactive predictions (single employees, what-if grids)
+prediction_cache = PredictionCache()
+
+
+def _pointer_mtime(model_dir):
+    try:
+        return (Path(model_dir) / CURRENT_POINTER).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def refresh_model():
+    """
+    Switches to the version promoted by another worker process (retraining
+    runs in one worker only). Costs a stat() of the pointer file when
+    nothing changed.
+    """
+    global _pointer_state
+    if _pointer_state is None:
+        return _model
+    model_dir, seen = _pointer_state
+    mtime = _pointer_mtime(model_dir)
+    if mtime is None or mtime == seen:
+        return _model
+    with _reload_lock:
+        if _pointer_state[1] != mtime:
+            version = current_version(model_dir)
+            if _model is None or _model.version != version:
+                model = load_model(version, model_dir)
+                if model is None:
+                    print(f"Attrition model v{version} is promoted but cannot be loaded.")
+                else:
+                    model.predict_proba(np.zeros((1, model.n_features), dtype=np.float32))
+                    set_model(model)
+            _pointer_state = (model_dir, mtime)
+    return _model
+
+
+def get_model():
+    """Returns the model currently served by the API (None if not loaded)."""
+    return refresh_model()
+
+
+def set_model(model):
+    """Replaces the model served by the API."""
+    global _model
+    _model = model
+    # Entries of the previous version can no longer be hit: free them
+    prediction_cache.clear()
+
+
+def ensure_model(bind, model_dir=MODEL_DIR):
+    """
+    Loads the current model artifact, training and saving a first version
+    from the database if none exists yet.
+    """
+    global _pointer_state
+    model = load_model(model_dir=model_dir)
+    if model is None:
+        print("No attrition model found, training a new one...")
+        model = train_model(load_training_frame(bind))
+        save_model(model, model_dir)
+        print(f"Attrition model v{model.version} trained (ROC AUC {model.metrics['roc_auc']}).")
+        # Serve what was saved, through the configured inference backend
+        model = load_model(model.version, model_dir) or model
+    # Later promotions by other workers are picked up by refresh_model
+    _pointer_state = (model_dir, _pointer_mtime(model_dir))
+    set_model(model)
+    return model
+
+
+def _apply_changes(record, extra_years, extra_salary):
+    record = dict(record)
+    record['MonthlyIncome'] = (record.get('MonthlyIncome') or 0) + extra_salary
+    record['YearsAtCompany'] = (record.get('YearsAtCompany') or 0) + extra_years
+    return record
+
+
+def predict_attrition_proba(employee_data, extra_years=0, extra_salary=0, model=None):
+    """
+    Returns the probability that an employee leaves, after simulating
+    additional years at the company and an additional monthly salary.
+    """
+    model = model or get_model()
+    if model is None:
+        raise RuntimeError("Attrition model is not loaded.")
+    X = model.encode_records([_apply_changes(employee_data, extra_years, extra_salary)])
+    return float(prediction_cache.predict(model, X)[0])
+
+
+def score_employees(db, department=None, model=None):
+    """
+    Computes the attrition risk of all employees (or one department) and
+    stores it in `employees.score`.
+
+    Features are read from the feature store (or in one query), scored in
+    one vectorized predict_proba call and written back in one bulk UPDATE.
+
+    Returns:
+        dict: Number of rows scored, timings and throughput.
+    """
+    from . import crud, feature_store
+
+    model = model or get_model()
+    if model is None:
+        raise RuntimeError("Attrition model is not loaded.")
+
+    start = time.perf_counter()
+    ids, X = feature_store.employee_matrix(db, model, department)
+    loaded = time.perf_counter()
+    scores = model.predict_proba(X).round(4) if len(X) else np.array([])
+    scored = time.perf_counter()
+    crud.update_employee_scores(db, ids, scores)
+    end = time.perf_counter()
+
+    return {
+        "rows": int(len(ids)),
+        "department": department,
+        "model_version": model.version,
+        "load_s": round(loaded - start, 4),
+        "predict_s": round(scored - loaded, 4),
+        "update_s": round(end - scored, 4),
+        "total_s": round(end - start, 4),
+        "rows_per_second": round(len(ids) / (end - start), 1) if end > start else None,
+    }
+
+
+def simulate_grid(X, salary_raises, extra_years, model=None):
+    """
+    Scores every combination of salary raise and extra tenure for each
+    employee in a single model call.
+
+    The scenario tensor is built by broadcasting the encoded employees
+    against the raise and tenure axes, then flattened for predict_proba.
+
+    Args:
+        X (ndarray): Encoded employees, shape (n, n_features).
+        salary_raises (list): Monthly salary increases to simulate.
+        extra_years (list): Additional years at the company to simulate.
+
+    Returns:
+        ndarray: Attrition probabilities, shape (n, len(salary_raises), len(extra_years)).
+    """
+    model = model or get_model()
+    if model is None:
+        raise RuntimeError("Attrition model is not loaded.")
+
+    raises = np.asarray(salary_raises, dtype=np.float32)
+    years = np.asarray(extra_years, dtype=np.float32)
+    n, n_features = X.shape
+    shape = (n, len(raises), len(years), n_features)
+    if np.prod(shape[:3]) > MAX_SIMULATION_CELLS:
+        raise ValueError(f"Simulation too large ({int(np.prod(shape[:3]))} scenarios, max {MAX_SIMULATION_CELLS}).")
+
+    grid = np.broadcast_to(X[:, None, None, :], shape).copy()
+    grid[..., model.feature_names.index('MonthlyIncome')] += raises[None, :, None]
+    grid[..., model.feature_names.index('YearsAtCompany')] += years[None, None, :]
+    return prediction_cache.predict(model, grid.reshape(-1, n_features)).reshape(shape[:3])
+
+
+def optimize_raise_budget(X, budget, step=100, max_raise=2000, model=None):
+    """
+    Splits a monthly raise budget across employees to minimize the expected
+    number of departures.
+
+    Every raise level (0, step, ..., max_raise) is scored for every employee
+    in one simulation. The allocation is a multiple-choice knapsack solved by
+    Lagrangian relaxation: for a price `lam` per euro each employee picks the
+    level maximizing `drop - lam * cost`, and `lam` is bisected until the
+    total fits the budget. Leftover budget is then spent greedily on the
+    best remaining drop per euro.
+
+    Args:
+        X (ndarray): Encoded employees, shape (n, n_features).
+        budget (float): Total monthly raise budget.
+        step (float): Granularity of the raises.
+        max_raise (float): Largest raise given to one employee.
+
+    Returns:
+        tuple: (raises, probabilities before, probabilities after), each of shape (n,).
+    """
+    levels = np.arange(0, max_raise + step / 2, step, dtype=np.float64)
+    proba = simulate_grid(X, levels, [0], model=model)[:, :, 0].astype(np.float64)
+    drop = proba[:, :1] - proba
+    rows = np.arange(len(X))
+
+    def allocate(lam):
+        choice = np.argmax(drop - lam * levels[None, :], axis=1)
+        return choice, levels[choice].sum()
+
+    choice, spent = allocate(0.0)
+    if spent > budget:
+        # Upper bound on the price: no raise is worth it at this rate
+        ratios = drop[:, 1:] / levels[None, 1:]
+        lo, hi = 0.0, float(max(ratios.max(), 0.0)) + 1e-9
+        for _ in range(60):
+            mid = (lo + hi) / 2
+            if allocate(mid)[1] > budget:
+                lo = mid
+            else:
+                hi = mid
+        choice, spent = allocate(hi)
+
+        # Greedy fill of the leftover with the best affordable upgrades
+        remaining = budget - spent
+        while remaining >= step:
+            extra = levels[None, :] - levels[choice][:, None]
+            gain = drop - drop[rows, choice][:, None]
+            affordable = (extra > 0) & (extra <= remaining) & (gain > 0)
+            if not affordable.any():
+                break
+            ratio = np.where(affordable, gain / np.where(extra > 0, extra, 1), -np.inf)
+            i, j = np.unravel_index(np.argmax(ratio), ratio.shape)
+            remaining -= extra[i, j]
+            choice[i] = j
+
+    return levels[choice], proba[:, 0], proba[rows, choice]
+
+
 def predict_attrition(employee_data, extra_years, extra_salary):
     """
-    Simulates attrition prediction logic based on employee data and potential changes.
-    
+    Predicts attrition for an employee based on potential changes.
+
     Args:
         employee_data (dict): Dictionary containing current employee details.
         extra_years (int): Additional years at company to simulate.
         extra_salary (float): Additional salary amount to simulate.
-        
+
     Returns:
         str: 'Partira' (Will leave) or 'Restera' (Will stay) based on the simulation.
     """
-    # Simplified logic for the example
-    # We adjust variables according to HR inputs
-    current_income = employee_data['MonthlyIncome'] + extra_salary
-    current_years = employee_data['YearsAtCompany'] + extra_years
-    
-    # Probability simulation (to be replaced by a real .predict() model)
-    chance = 0.15 if current_income > 5000 else 0.45
-    return "Partira" if chance > 0.4 else "Restera"
\ No newline at end of file
+    chance = predict_attrition_proba(employee_data, extra_years, extra_salary)
+    return "Partira" if chance > ATTRITION_THRESHOLD else "Restera"
+
+
+if __name__ == "__main__":
+    from .database import engine
+
+    trained = train_model(load_training_frame(engine))
+    print(f"Saved {save_model(trained)} with metrics {trained.metrics}")
@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlalchemy import Column, Integer, String, Float
 from .database import Base
 from pydantic import BaseModel
@@ -15,7 +16,7 @@ class Employee(Base):
     Attrition = Column(String)
     BusinessTravel = Column(String)
     DailyRate = Column(Integer)
-    Department = Column(String)
+    Department = Column(String, index=True)
     DistanceFromHome = Column(Integer)
     Education = Column(Integer)
     EducationField = Column(String)
@@ -54,7 +55,7 @@ class UserRH(Base):
     """
     __tablename__ = "users_rh"
     email = Column(String, primary_key=True, index=True)
-    password = Column(String) # In production, use a hash
+    password = Column(String) # bcrypt hash (see auth.hash_password)
     
 class Sales(Base):
     """
@@ -111,4 +112,63 @@ class HR(Base):
     RelationshipSatisfaction = Column(Integer)
     PerformanceRating = Column(Integer)
     JobSatisfaction = Column(Integer)
-    WorkLifeBalance = Column(Integer)
\ No newline at end of file
+    WorkLifeBalance = Column(Integer)
+
+class EmployeeOut(BaseModel):
+    """
+    Response schema of an employee (one row of the 'employees' table).
+    Documents the employee endpoints, which encode Core rows directly.
+    """
+    id: int
+    Age: Optional[int] = None
+    Attrition: Optional[str] = None
+    BusinessTravel: Optional[str] = None
+    DailyRate: Optional[int] = None
+    Department: Optional[str] = None
+    DistanceFromHome: Optional[int] = None
+    Education: Optional[int] = None
+    EducationField: Optional[str] = None
+    EnvironmentSatisfaction: Optional[int] = None
+    Gender: Optional[str] = None
+    HourlyRate: Optional[int] = None
+    JobInvolvement: Optional[int] = None
+    JobLevel: Optional[int] = None
+    JobRole: Optional[str] = None
+    JobSatisfaction: Optional[int] = None
+    MaritalStatus: Optional[str] = None
+    MonthlyIncome: Optional[int] = None
+    MonthlyRate: Optional[int] = None
+    NumCompaniesWorked: Optional[int] = None
+    OverTime: Optional[str] = None
+    PercentSalaryHike: Optional[int] = None
+    PerformanceRating: Optional[int] = None
+    RelationshipSatisfaction: Optional[int] = None
+    StandardHours: Optional[int] = None
+    StockOptionLevel: Optional[int] = None
+    TotalWorkingYears: Optional[int] = None
+    TrainingTimesLastYear: Optional[int] = None
+    WorkLifeBalance: Optional[int] = None
+    YearsAtCompany: Optional[int] = None
+    YearsInCurrentRole: Optional[int] = None
+    YearsSinceLastPromotion: Optional[int] = None
+    YearsWithCurrManager: Optional[int] = None
+    score: Optional[float] = None
+    evaluation_note: Optional[float] = None
+    comment: Optional[str] = None
+
+class DepartmentEmployeeOut(BaseModel):
+    """
+    Response schema of a row of the department tables ('sales', 'RD', 'HR').
+    """
+    id: int
+    Age: Optional[int] = None
+    Attrition: Optional[str] = None
+    Education: Optional[int] = None
+    JobRole: Optional[str] = None
+    MonthlyIncome: Optional[int] = None
+    EnvironmentSatisfaction: Optional[int] = None
+    JobInvolvement: Optional[int] = None
+    RelationshipSatisfaction: Optional[int] = None
+    PerformanceRating: Optional[int] = None
+    JobSatisfaction: Optional[int] = None
+    WorkLifeBalance: Optional[int] = None
@@ -0,0 +1,105 @@
+"""
+Prediction cache module.
+LRU/TTL cache in front of attrition inference, keyed by a hash of the
+encoded feature vector and the model version.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "20000"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+# Larger batches (bulk scoring, optimizer) bypass the cache
+PREDICTION_CACHE_MAX_BATCH = int(os.getenv("PREDICTION_CACHE_MAX_BATCH", "1000"))
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of attrition probabilities with a time-to-live.
+
+    Keys combine the model version with a hash of the encoded feature row:
+    when an employee row changes its features hash differently, and when
+    the model changes its version differs, so stale entries are never hit.
+    """
+
+    def __init__(self, maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @staticmethod
+    def make_key(row, model_version):
+        digest = hashlib.blake2b(np.ascontiguousarray(row).tobytes(), digest_size=16).digest()
+        return (model_version, digest)
+
+    def get(self, key):
+        """Returns the cached value for key, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def predict(self, model, X):
+        """
+        Returns model.predict_proba(X), reusing cached rows and scoring
+        only the missing ones in a single model call.
+        """
+        if len(X) > PREDICTION_CACHE_MAX_BATCH or not self.maxsize:
+            return model.predict_proba(X)
+
+        keys = [self.make_key(row, model.version) for row in X]
+        result = np.empty(len(X), dtype=np.float64)
+        missing = []
+        for i, key in enumerate(keys):
+            value = self.get(key)
+            if value is None:
+                missing.append(i)
+            else:
+                result[i] = value
+
+        if missing:
+            scores = model.predict_proba(X[missing])
+            result[missing] = scores
+            for i, score in zip(missing, scores):
+                self.put(keys[i], float(score))
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Returns hit/miss counters, hit rate and current size."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+            }
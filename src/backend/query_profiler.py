@@ -0,0 +1,131 @@
+"""
+SQL query profiler module.
+Uses the statement timings of the metrics engine hook to log slow queries with
+their SQLite query plan and flag statements repeated within one request (N+1).
+"""
+import os
+import threading
+from collections import deque
+
+from . import metrics
+
+QUERY_PROFILER_ENABLED = os.getenv("QUERY_PROFILER_ENABLED", "1") == "1"
+# Statements slower than this are logged with their EXPLAIN QUERY PLAN. Timings
+# cover statement execution, not fetching the rows or building ORM objects.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+# A statement run this many times in one request is reported as N+1
+REPEATED_QUERY_THRESHOLD = int(os.getenv("REPEATED_QUERY_THRESHOLD", "3"))
+# Slow queries and N+1 reports kept in memory for /profiler/queries
+PROFILER_HISTORY = int(os.getenv("PROFILER_HISTORY", "200"))
+
+
+class QueryProfiler:
+    """Keeps the recent slow queries and N+1 reports, and running totals."""
+
+    def __init__(self, history=PROFILER_HISTORY):
+        self.slow_queries = deque(maxlen=history)
+        self.repeated_queries = deque(maxlen=history)
+        self.statements = 0
+        self.slow = 0
+        # Statements finish in threadpool threads: counters are updated under it
+        self._lock = threading.Lock()
+
+    def count_statement(self):
+        with self._lock:
+            self.statements += 1
+
+    def record_slow(self, statement, parameters, elapsed_ms, plan):
+        with self._lock:
+            self.slow += 1
+        self.slow_queries.append({
+            "statement": statement,
+            "parameters": repr(parameters)[:200],
+            "elapsed_ms": round(elapsed_ms, 2),
+            "plan": plan,
+        })
+        print(f"Slow query ({elapsed_ms:.1f} ms): {' '.join(statement.split())[:200]}")
+        for line in plan:
+            print(f"    {line}")
+
+    def record_request(self, operation, profile):
+        repeated = profile.repeated(REPEATED_QUERY_THRESHOLD)
+        if repeated:
+            self.repeated_queries.append({"operation": operation, "queries": profile.count, "repeated": repeated})
+            for item in repeated:
+                print(f"Repeated query in {operation}: {item['executions']}x "
+                      f"{' '.join(item['statement'].split())[:120]}")
+
+    def stats(self):
+        return {
+            "statements": self.statements,
+            "slow": self.slow,
+            "slow_query_ms": SLOW_QUERY_MS,
+            "slow_queries": list(self.slow_queries),
+            "repeated_queries": list(self.repeated_queries),
+        }
+
+
+profiler = QueryProfiler()
+
+
+def _explain(cursor, statement, parameters):
+    """Returns SQLite's query plan for a SELECT, run on the raw DB-API connection."""
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return []
+    try:
+        plan_cursor = cursor.connection.cursor()
+        try:
+            rows = plan_cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ()).fetchall()
+        finally:
+            plan_cursor.close()
+    except Exception:
+        return []
+    return [row[-1] for row in rows]
+
+
+def _on_statement(conn, cursor, statement, parameters, elapsed_ms, executemany):
+    profiler.count_statement()
+    if elapsed_ms >= SLOW_QUERY_MS:
+        plan = [] if executemany or conn.dialect.name != "sqlite" else _explain(cursor, statement, parameters)
+        profiler.record_slow(statement, parameters, elapsed_ms, plan)
+
+
+def instrument_engine(engine):
+    """Times every statement executed on `engine` (through the metrics hook)."""
+    metrics.instrument_engine(engine)
+    if QUERY_PROFILER_ENABLED and _on_statement not in metrics.statement_hooks:
+        metrics.statement_hooks.append(_on_statement)
+
+
+class QueryProfilerMiddleware:
+    """
+    Pure ASGI middleware collecting the statements of each request. Adds the
+    `X-DB-Queries` and `X-DB-Time-Ms` response headers and reports repeated
+    statements once the request is done.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not QUERY_PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = metrics.track_request_queries()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-db-queries", str(profile.count).encode()),
+                    (b"x-db-time-ms", f"{profile.total_ms:.2f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.release_request_queries(token)
+            route = scope.get("route")
+            profiler.record_request(getattr(route, "operation_id", None) or scope["path"], profile)
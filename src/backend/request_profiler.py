@@ -0,0 +1,218 @@
+"""
+On-demand request profiler module.
+Runs a single API request under a stack sampler (folded stacks, ready for
+flamegraph.pl or speedscope) or tracemalloc (allocation summary) when an admin asks for it.
+"""
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from urllib.parse import parse_qs
+
+# Profiling is disabled (and the middleware not installed) without a token
+PROFILER_ADMIN_TOKEN = os.getenv("PROFILER_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", "10"))
+PROFILE_TOP_ALLOCATIONS = int(os.getenv("PROFILE_TOP_ALLOCATIONS", "30"))
+PROFILE_MODES = ("cpu", "memory")
+
+# Innermost Python function of an idle event loop (selector poll, or uvloop's C loop)
+IDLE_FUNCTIONS = {"select", "poll", "run_forever", "run_until_complete"}
+
+# One profiled request at a time: tracemalloc and the sampler are process-wide
+_busy = threading.Lock()
+
+
+def _frame_name(code):
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _stack(frame):
+    """Root-first list of the code objects on a thread's stack."""
+    codes = []
+    while frame is not None:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    return codes
+
+
+class StackSampler:
+    """
+    Samples the stacks of the threads serving one request every `interval`
+    seconds from a background thread and counts them as folded stacks.
+
+    The event loop thread is sampled when it is not idle; threadpool workers
+    only while they are running the request's endpoint (sync routes), so
+    other requests served concurrently by the pool are left out.
+    """
+
+    def __init__(self, loop_thread, scope, interval=PROFILE_SAMPLE_INTERVAL_MS / 1000):
+        self.loop_thread = loop_thread
+        self.scope = scope
+        self.interval = interval
+        self.samples = Counter()
+        self.total = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            route = self.scope.get("route")
+            endpoint = getattr(getattr(route, "endpoint", None), "__code__", None)
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                codes = _stack(frame)
+                if thread_id == self.loop_thread:
+                    if codes[-1].co_name in IDLE_FUNCTIONS:
+                        continue
+                elif endpoint is None or endpoint not in codes:
+                    continue
+                self.total += 1
+                self.samples[";".join(_frame_name(code) for code in codes)] += 1
+
+    def folded(self):
+        """Brendan Gregg's folded format: one `frame;frame;frame count` line per stack."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.samples.most_common())
+
+
+def allocation_summary(before, after, peak, top=PROFILE_TOP_ALLOCATIONS):
+    """Memory allocated during the request, grouped by source line (largest first)."""
+    stats = after.compare_to(before, "traceback")
+    return {
+        "peak_bytes": peak,
+        "net_bytes": sum(stat.size_diff for stat in stats),
+        "allocations": [
+            {
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            }
+            for stat in stats[:top] if stat.size_diff > 0
+        ],
+    }
+
+
+def requested_mode(scope):
+    """Profile mode asked by an admin (`X-Profile` header or `?profile=`), else None."""
+    mode = token = None
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            mode = value.decode("latin-1").strip().lower()
+        elif name == b"x-profile-token":
+            token = value.decode("latin-1")
+    if mode is None and b"profile=" in scope.get("query_string", b""):
+        mode = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [""])[0].lower()
+    if mode is None or token is None:
+        return None
+    # The token is only accepted in a header, never in the (logged) URL
+    if not hmac.compare_digest(token.encode(), PROFILER_ADMIN_TOKEN.encode()):
+        return None
+    return mode
+
+
+class RequestProfilerMiddleware:
+    """
+    Pure ASGI middleware profiling the requests an admin flags with
+    `X-Profile: cpu|memory` (or `?profile=cpu|memory`) and a valid
+    `X-Profile-Token`. The endpoint runs normally but its body is replaced by
+    the profile; its status is returned in `X-Profiled-Status`. Other
+    requests only pay for a scan of their headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not PROFILER_ADMIN_TOKEN:
+            await self.app(scope, receive, send)
+            return
+        mode = requested_mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if mode not in PROFILE_MODES:
+            await _send_profile(send, 400, "application/json",
+                                json.dumps({"detail": f"Profile mode must be one of {PROFILE_MODES}"}).encode(), {})
+            return
+        if not _busy.acquire(blocking=False):
+            await _send_profile(send, 409, "application/json",
+                                json.dumps({"detail": "Another request is being profiled"}).encode(), {})
+            return
+
+        response = {"status": 500, "size": 0}
+
+        async def discard_body(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+
+        try:
+            if mode == "cpu":
+                sampler = StackSampler(threading.get_ident(), scope)
+                sampler.start()
+                start = time.perf_counter()
+                try:
+                    await self.app(scope, receive, discard_body)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    sampler.stop()
+                body, media_type = sampler.folded().encode(), "text/plain; charset=utf-8"
+                extra = {"x-profile-samples": str(sampler.total)}
+            else:
+                # Left running if it was already enabled (PYTHONTRACEMALLOC)
+                was_tracing = tracemalloc.is_tracing()
+                if not was_tracing:
+                    tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+                try:
+                    before = tracemalloc.take_snapshot()
+                    tracemalloc.reset_peak()
+                    start = time.perf_counter()
+                    await self.app(scope, receive, discard_body)
+                    elapsed = time.perf_counter() - start
+                    _, peak = tracemalloc.get_traced_memory()
+                    after = tracemalloc.take_snapshot()
+                finally:
+                    if not was_tracing:
+                        tracemalloc.stop()
+                summary = allocation_summary(before, after, peak)
+                body, media_type = json.dumps(summary, indent=2).encode(), "application/json"
+                extra = {}
+        finally:
+            _busy.release()
+
+        print(f"Profiled {scope['method']} {scope['path']} ({mode}): {elapsed * 1000:.1f} ms")
+        await _send_profile(send, 200, media_type, body, {
+            "x-profiled-status": str(response["status"]),
+            "x-profiled-duration-ms": f"{elapsed * 1000:.2f}",
+            "x-profiled-response-bytes": str(response["size"]),
+            **extra,
+        })
+
+
+async def _send_profile(send, status, media_type, body, headers):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", media_type.encode()),
+            (b"content-length", str(len(body)).encode()),
+            (b"cache-control", b"no-store"),
+        ] + [(name.encode(), value.encode()) for name, value in headers.items()],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,179 @@
+"""
+Background retraining module.
+Retrains the attrition model in a separate process (on a schedule or after
+N data changes), validates it against the served model and hot-swaps it.
+"""
+import asyncio
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import ml_logic, workers
+
+# Seconds between scheduled retrainings (0 disables the schedule)
+RETRAIN_INTERVAL_SECONDS = float(os.getenv("RETRAIN_INTERVAL_SECONDS", "0"))
+# Number of data changes that triggers a retraining (0 disables the trigger)
+RETRAIN_AFTER_CHANGES = int(os.getenv("RETRAIN_AFTER_CHANGES", "50"))
+# A new model is accepted if its holdout ROC AUC is at most this much lower than
+# the served model's, both scored on the same holdout employees
+RETRAIN_AUC_TOLERANCE = float(os.getenv("RETRAIN_AUC_TOLERANCE", "0.01"))
+
+
+def _train_job(database_url, model_dir):
+    """
+    Runs in the child process: trains on the current database and saves the
+    artifact without promoting it. The served model is scored on the same
+    holdout as the new one. Returns the new version, its metrics and the
+    (version, ROC AUC) of the served model, None if there is none.
+    """
+    from sqlalchemy import create_engine
+
+    engine = create_engine(database_url)
+    try:
+        df = ml_logic.load_training_frame(engine)
+    finally:
+        engine.dispose()
+    model = ml_logic.train_model(df)
+    served = ml_logic.load_model(model_dir=model_dir)
+    baseline = (served.version, ml_logic.holdout_auc(served, df)) if served else None
+    ml_logic.save_model(model, model_dir, promote=False)
+    return model.version, model.metrics, baseline
+
+
+class RetrainingManager:
+    """
+    Schedules retraining jobs and swaps the served model when a job produces
+    a model that is at least as good as the current one.
+
+    Only one job runs at a time, across all worker processes (a file lock is
+    held while it runs). The new model is loaded and warmed up before the
+    swap, which is a single reference assignment: in-flight requests finish
+    on the model they started with. The other workers load the promoted
+    version on their next request (ml_logic.refresh_model).
+
+    Data changes are counted per worker: with N workers a change-triggered
+    retraining happens after `after_changes` writes to one of them.
+    """
+
+    def __init__(self, database_url, model_dir=ml_logic.MODEL_DIR,
+                 interval=RETRAIN_INTERVAL_SECONDS, after_changes=RETRAIN_AFTER_CHANGES):
+        self.database_url = database_url
+        self.model_dir = model_dir
+        self.interval = interval
+        self.after_changes = after_changes
+        self.changes = 0
+        self.last_result = None
+        self._future = None
+        self._task = None
+        self._lock = threading.Lock()
+        self._job_lock = workers.FileLock(workers.WORKER_STATE_DIR / "retraining.lock")
+        self._executor = ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn"))
+
+    @property
+    def running(self):
+        return self._future is not None and not self._future.done()
+
+    def record_change(self, count=1):
+        """Counts data changes and triggers a retraining past the threshold."""
+        with self._lock:
+            self.changes += count
+            due = self.after_changes and self.changes >= self.after_changes
+        if due:
+            self.trigger("changes")
+
+    def trigger(self, reason="manual"):
+        """Starts a retraining job. Returns False if one is already running."""
+        with self._lock:
+            if self.running or not self._job_lock.acquire(blocking=False):
+                return False
+            self.changes = 0
+            started = time.time()
+            try:
+                self._future = self._executor.submit(_train_job, self.database_url, self.model_dir)
+            except Exception:
+                self._job_lock.release()
+                raise
+        self._future.add_done_callback(lambda f: self._on_done(f, reason, started))
+        return True
+
+    def _on_done(self, future, reason, started):
+        result = {"reason": reason, "started_at": started, "duration_s": round(time.time() - started, 2)}
+        try:
+            version, metrics, baseline = future.result()
+            baseline_version, baseline_auc = baseline or (None, None)
+            result.update(version=version, metrics=metrics,
+                          baseline_version=baseline_version, baseline_roc_auc=baseline_auc)
+
+            if baseline_auc is not None and metrics["roc_auc"] < baseline_auc - RETRAIN_AUC_TOLERANCE:
+                result["status"] = "rejected"
+            else:
+                model = ml_logic.load_model(version, self.model_dir)
+                # Warm-up so the first request on the new model is not a cold start
+                model.predict_proba(np.zeros((1, model.n_features), dtype=np.float32))
+                ml_logic.promote_version(version, self.model_dir)
+                ml_logic.set_model(model)
+                result["status"] = "promoted"
+        except Exception as e:
+            result.update(status="failed", error=str(e))
+        finally:
+            self._job_lock.release()
+        self.last_result = result
+        print(f"Attrition model retraining ({reason}): {result['status']}")
+
+    async def _schedule(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            # Every worker keeps the schedule; only the leader retrains
+            if workers.is_leader():
+                self.trigger("schedule")
+
+    def start(self):
+        """Starts the schedule loop (inside the running event loop)."""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._schedule())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def status(self):
+        current = ml_logic.get_model()
+        return {
+            "running": self.running,
+            "served_version": current.version if current else None,
+            "changes_since_last_training": self.changes,
+            "retrain_after_changes": self.after_changes,
+            "interval_seconds": self.interval,
+            "last_result": self.last_result,
+        }
+
+
+# Created when the API starts (see app.fastapi_app)
+manager = None
+
+
+def start(database_url):
+    """Creates and starts the retraining manager of this process."""
+    global manager
+    manager = RetrainingManager(database_url)
+    manager.start()
+    return manager
+
+
+async def stop():
+    global manager
+    if manager is not None:
+        await manager.stop()
+        manager = None
+
+
+def record_change(count=1):
+    """Notifies the manager that employee data changed (no-op if not started)."""
+    if manager is not None:
+        manager.record_change(count)
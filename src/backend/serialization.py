@@ -0,0 +1,48 @@
+"""
+Fast JSON serialization module.
+Encodes Core result rows straight to JSON bytes with orjson, skipping ORM
+hydration and FastAPI's jsonable_encoder on the endpoints returning employees.
+"""
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Slower stdlib fallback
+    orjson = None
+
+
+def dumps(content):
+    """JSON bytes of `content` (dicts, lists, str, int, float, None)."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class JSONBytesResponse(JSONResponse):
+    """
+    JSON response taking already-encoded bytes as is. Returned from an
+    endpoint, FastAPI neither validates nor re-encodes it; the endpoint's
+    response_model still documents the schema in OpenAPI.
+    """
+
+    def render(self, content):
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def rows_to_dicts(keys, rows):
+    """Column-name dicts of Core row tuples, in column order."""
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def rows_response(keys, rows):
+    """JSON array of objects (one per row) as a response."""
+    return JSONBytesResponse(dumps(rows_to_dicts(keys, rows)))
+
+
+def row_response(keys, row):
+    """JSON object of a single row as a response."""
+    return JSONBytesResponse(dumps(dict(zip(keys, row))))
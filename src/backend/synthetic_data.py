@@ -0,0 +1,196 @@
+"""
+Synthetic workforce generator.
+Learns the distributions of the Employee columns from the real dataset and
+streams arbitrarily large realistic datasets into SQLite for scale testing.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import data_setup
+
+# Categorical columns sampled in this order, each conditioned on its parent
+CATEGORICAL_CHAIN = [
+    ("Department", None),
+    ("JobRole", "Department"),
+    ("JobLevel", "JobRole"),
+    ("EducationField", "Department"),
+    ("BusinessTravel", None),
+    ("Gender", None),
+    ("MaritalStatus", None),
+    ("OverTime", None),
+]
+# Numeric columns are drawn jointly per group of this column (Gaussian copula)
+COPULA_GROUP = "JobLevel"
+# Attrition is drawn from its smoothed rate given these columns
+ATTRITION_PARENTS = ["OverTime", "JobLevel", "MaritalStatus"]
+# Columns with more distinct values are interpolated instead of resampled
+CONTINUOUS_MIN_VALUES = 50
+# Weight of the identity matrix mixed into each group's correlation matrix
+CORRELATION_SHRINKAGE = 0.05
+# Pseudo-count pulling small attrition groups towards the overall rate
+ATTRITION_SMOOTHING = 20
+
+
+def _distribution(values):
+    counts = values.value_counts(normalize=True)
+    return counts.index.to_numpy(), counts.to_numpy()
+
+
+def _sample_conditional(rng, tables, marginal, parent_values):
+    """Draws one child value per parent value from the per-parent distributions."""
+    out = np.empty(len(parent_values), dtype=object)
+    for parent in pd.unique(parent_values):
+        mask = parent_values == parent
+        values, probs = tables.get(parent, marginal)
+        out[mask] = rng.choice(values, size=int(mask.sum()), p=probs)
+    return out
+
+
+class WorkforceGenerator:
+    """
+    Generative model of the employees table.
+
+    Categorical columns follow a chain of conditional distributions
+    (Department -> JobRole -> JobLevel, Department -> EducationField).
+    Numeric columns are drawn per JobLevel from a Gaussian copula, so their
+    correlations (age, seniority, income...) and exact marginals are kept.
+    Attrition is drawn from its rate given overtime, level and marital status.
+    """
+
+    def __init__(self, categorical, copulas, numeric_columns, attrition):
+        self.categorical = categorical
+        self.copulas = copulas
+        self.numeric_columns = numeric_columns
+        self.attrition = attrition
+
+    @classmethod
+    def from_frame(cls, df):
+        """Fits the generator on a DataFrame of real employees."""
+        from scipy.special import ndtri
+
+        from .models import Employee
+
+        numeric_columns = [
+            col.name for col in Employee.__table__.columns
+            if col.type.python_type is int and col.name not in ("id", COPULA_GROUP)
+        ]
+
+        categorical = {}
+        for column, parent in CATEGORICAL_CHAIN:
+            tables = {} if parent is None else {
+                value: _distribution(group[column]) for value, group in df.groupby(parent)
+            }
+            categorical[column] = (parent, tables, _distribution(df[column]))
+
+        copulas = {}
+        for level, group in df.groupby(COPULA_GROUP):
+            values = group[numeric_columns].to_numpy(dtype=np.float64)
+            # Normal scores of the ranks, then their correlation
+            ranks = pd.DataFrame(values).rank(method="average").to_numpy()
+            scores = ndtri((ranks - 0.5) / len(values))
+            if len(values) > 2:
+                # Constant columns (e.g. StandardHours) have no correlation: zeros
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    corr = np.nan_to_num(np.corrcoef(scores, rowvar=False))
+            else:
+                corr = np.eye(len(numeric_columns))
+            np.fill_diagonal(corr, 1.0)
+            corr = (1 - CORRELATION_SHRINKAGE) * corr + CORRELATION_SHRINKAGE * np.eye(len(corr))
+            copulas[level] = (np.linalg.cholesky(corr), np.sort(values, axis=0))
+
+        is_leaving = (df["Attrition"] == "Yes").astype(float)
+        overall = float(is_leaving.mean())
+        grouped = is_leaving.groupby([df[col] for col in ATTRITION_PARENTS]).agg(["sum", "count"])
+        rates = (grouped["sum"] + ATTRITION_SMOOTHING * overall) / (grouped["count"] + ATTRITION_SMOOTHING)
+        attrition = (overall, rates.to_dict())
+
+        return cls(categorical, copulas, numeric_columns, attrition)
+
+    def _sample_numeric(self, rng, levels):
+        from scipy.special import ndtr
+
+        out = np.empty((len(levels), len(self.numeric_columns)), dtype=np.int64)
+        for level, (chol, sorted_values) in self.copulas.items():
+            mask = levels == level
+            n = int(mask.sum())
+            if not n:
+                continue
+            u = ndtr(rng.standard_normal((n, len(chol))) @ chol.T)
+            m = len(sorted_values)
+            for j in range(sorted_values.shape[1]):
+                column = sorted_values[:, j]
+                if len(np.unique(column)) >= CONTINUOUS_MIN_VALUES:
+                    sampled = np.interp(u[:, j], (np.arange(m) + 0.5) / m, column)
+                else:
+                    sampled = column[np.minimum((u[:, j] * m).astype(np.int64), m - 1)]
+                out[mask, j] = np.rint(sampled)
+        return pd.DataFrame(out, columns=self.numeric_columns)
+
+    def sample(self, n, rng, start_id=1):
+        """Returns `n` synthetic employees with ids from `start_id`."""
+        frame = {}
+        for column, (parent, tables, marginal) in self.categorical.items():
+            if parent is None:
+                frame[column] = rng.choice(marginal[0], size=n, p=marginal[1])
+            else:
+                frame[column] = _sample_conditional(rng, tables, marginal, frame[parent])
+        frame[COPULA_GROUP] = frame[COPULA_GROUP].astype(np.int64)
+
+        df = pd.concat([pd.DataFrame(frame), self._sample_numeric(rng, frame[COPULA_GROUP])], axis=1)
+        df.insert(0, "id", np.arange(start_id, start_id + n, dtype=np.int64))
+
+        # Career consistency: nobody has worked longer than since 18 or
+        # been in a role, under a manager or unpromoted longer than at the company
+        df["TotalWorkingYears"] = df["TotalWorkingYears"].clip(upper=(df["Age"] - 18).clip(lower=0))
+        df["YearsAtCompany"] = df["YearsAtCompany"].clip(upper=df["TotalWorkingYears"])
+        for column in ("YearsInCurrentRole", "YearsWithCurrManager", "YearsSinceLastPromotion"):
+            df[column] = df[column].clip(upper=df["YearsAtCompany"])
+
+        overall, rates = self.attrition
+        keys = zip(*(df[col].tolist() for col in ATTRITION_PARENTS))
+        p_leave = np.fromiter((rates.get(key, overall) for key in keys), dtype=np.float64, count=n)
+        df["Attrition"] = np.where(rng.random(n) < p_leave, "Yes", "No")
+        return df
+
+
+def iter_synthetic(generator, n_rows, chunk_rows=data_setup.INGEST_CHUNK_ROWS, seed=0):
+    """Yields `n_rows` synthetic employees in chunks of `chunk_rows`."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, chunk_rows):
+        yield generator.sample(min(chunk_rows, n_rows - start), rng, start_id=start + 1)
+
+
+def generate_database(db_path, n_rows, source=None, chunk_rows=data_setup.INGEST_CHUNK_ROWS, seed=0):
+    """
+    Fits the generator on `source` (a DataFrame of real employees, by
+    default the application database) and streams `n_rows` synthetic
+    employees into the SQLite database `db_path`.
+
+    Returns:
+        dict: Rows loaded per table and ingestion throughput.
+    """
+    if source is None:
+        from .database import engine
+        source = pd.read_sql_table("employees", engine)
+    start = time.perf_counter()
+    generator = WorkforceGenerator.from_frame(source)
+    print(f"Generator fitted on {len(source)} employees in {time.perf_counter() - start:.2f}s.")
+    return data_setup.load_employees(db_path, iter_synthetic(generator, n_rows, chunk_rows, seed))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic HR database for scale testing.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of employees to generate.")
+    parser.add_argument("--output", default=str(data_setup.DB_PATH.with_name("hr_synthetic.db")),
+                        help="SQLite file to (re)create.")
+    parser.add_argument("--csv", help="Fit on this dataset CSV instead of the application database.")
+    parser.add_argument("--chunk-rows", type=int, default=data_setup.INGEST_CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    source = pd.concat(data_setup.read_dataset(args.csv)) if args.csv else None
+    generate_database(args.output, args.rows, source, args.chunk_rows, args.seed)
@@ -0,0 +1,280 @@
+"""
+Request tracing module.
+W3C trace-context propagation, spans for API requests and their SQL statements,
+a JSONL span exporter shared with the frontend and a Chrome trace converter.
+"""
+import json
+import os
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from sqlalchemy import event
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+TRACE_EXPORT_PATH = Path(os.getenv(
+    "TRACE_EXPORT_PATH", Path(__file__).resolve().parent.parent.parent / "data" / "traces.jsonl"
+))
+# SQL text kept on statement spans
+TRACE_STATEMENT_CHARS = int(os.getenv("TRACE_STATEMENT_CHARS", "500"))
+
+# Trace of the request being served; the Trace object is shared with the
+# threadpool copies of the context, so SQL spans of sync endpoints land in it
+_current_trace = ContextVar("current_trace", default=None)
+
+
+def new_trace_id():
+    return secrets.token_hex(16)
+
+
+def new_span_id():
+    return secrets.token_hex(8)
+
+
+def format_traceparent(trace_id, span_id, sampled=True):
+    return f"00-{trace_id}-{span_id}-{'01' if sampled else '00'}"
+
+
+def parse_traceparent(value):
+    """Returns (trace_id, parent span_id) from a `traceparent` header, or None if invalid."""
+    parts = value.strip().split("-") if value else []
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    trace_id, span_id = parts[1].lower(), parts[2].lower()
+    if len(trace_id) != 32 or len(span_id) != 16 or set(trace_id) == {"0"} or set(span_id) == {"0"}:
+        return None
+    try:
+        int(trace_id, 16), int(span_id, 16)
+    except ValueError:
+        return None
+    return trace_id, span_id
+
+
+def now_us():
+    return time.time_ns() // 1000
+
+
+def make_span(trace_id, span_id, parent_id, name, kind, service, start_us, end_us, attributes=None):
+    """One exported span (a JSONL line)."""
+    return {
+        "trace_id": trace_id,
+        "span_id": span_id,
+        "parent_id": parent_id,
+        "name": name,
+        "kind": kind,
+        "service": service,
+        "start_us": start_us,
+        "duration_us": end_us - start_us,
+        "attributes": attributes or {},
+    }
+
+
+class SpanExporter:
+    """Appends finished spans to a JSONL file, one batch (trace fragment) per write."""
+
+    def __init__(self, path=TRACE_EXPORT_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        if not spans:
+            return
+        data = "".join(json.dumps(span, separators=(",", ":")) + "\n" for span in spans)
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(data)
+        except OSError as e:
+            print(f"Span export failed: {e}")
+
+
+exporter = SpanExporter()
+
+
+class Trace:
+    """Spans recorded while serving one request, exported when it completes."""
+
+    __slots__ = ("trace_id", "span_id", "service", "spans")
+
+    def __init__(self, trace_id, span_id, service):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.service = service
+        self.spans = []
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware opening a server span per HTTP request, as a child
+    of the caller's `traceparent` when there is one (a new trace otherwise).
+    The span ids are returned in the `traceresponse` header.
+    """
+
+    def __init__(self, app, service="api", span_exporter=exporter):
+        self.app = app
+        self.service = service
+        self.exporter = span_exporter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+        trace_id, parent_id = parent if parent else (new_trace_id(), None)
+        trace = Trace(trace_id, new_span_id(), self.service)
+        token = _current_trace.set(trace)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"traceresponse", format_traceparent(trace.trace_id, trace.span_id).encode()),
+                ]
+            await send(message)
+
+        start = now_us()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            route = scope.get("route")
+            trace.spans.append(make_span(
+                trace.trace_id, trace.span_id, parent_id,
+                f"{scope['method']} {getattr(route, 'path', scope['path'])}", "server", self.service,
+                start, now_us(),
+                {
+                    "http.method": scope["method"],
+                    "http.target": scope["path"],
+                    "http.status_code": status["code"],
+                    "operation": getattr(route, "operation_id", None),
+                },
+            ))
+            self.exporter.export(trace.spans)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_trace.get() is not None:
+        conn.info.setdefault("trace_span_start", []).append(now_us())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    starts = conn.info.get("trace_span_start")
+    if not starts:
+        return
+    start = starts.pop()
+    words = statement.split(None, 1)
+    trace.spans.append(make_span(
+        trace.trace_id, new_span_id(), trace.span_id,
+        f"SQL {words[0].upper() if words else ''}", "client", trace.service, start, now_us(),
+        {
+            "db.system": conn.dialect.name,
+            "db.statement": statement[:TRACE_STATEMENT_CHARS],
+            "db.rows": cursor.rowcount if cursor.rowcount >= 0 else None,
+            "db.executemany": executemany,
+        },
+    ))
+
+
+def instrument_engine(engine):
+    """Records the statements executed on `engine` as child spans of the current request."""
+    if not event.contains(engine, "after_cursor_execute", _after_execute):
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
+
+
+def load_spans(path=TRACE_EXPORT_PATH, trace_id=None):
+    """Spans of the export file, grouped by trace id (in order of first appearance)."""
+    traces = {}
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            span = json.loads(line)
+            if trace_id is None or span["trace_id"] == trace_id:
+                traces.setdefault(span["trace_id"], []).append(span)
+    return traces
+
+
+def to_chrome_trace(spans):
+    """
+    Converts spans to the Chrome trace event format (chrome://tracing, Perfetto,
+    speedscope): one process per service, one track per top-level span of that
+    service, so a dashboard render reads as a single waterfall.
+    """
+    by_id = {span["span_id"]: span for span in spans}
+    services = {}
+    events = []
+    for span in sorted(spans, key=lambda s: s["start_us"]):
+        pid = services.setdefault(span["service"], len(services) + 1)
+        # Track = outermost ancestor within the same service
+        root = span
+        while root["parent_id"] in by_id and by_id[root["parent_id"]]["service"] == span["service"]:
+            root = by_id[root["parent_id"]]
+        events.append({
+            "name": span["name"],
+            "cat": span["kind"],
+            "ph": "X",
+            "ts": span["start_us"],
+            "dur": max(span["duration_us"], 1),
+            "pid": pid,
+            "tid": int(root["span_id"][:8], 16),
+            "args": {"span_id": span["span_id"], "parent_id": span["parent_id"], **span["attributes"]},
+        })
+    events += [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": service}}
+        for service, pid in services.items()
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def format_waterfall(spans):
+    """Text waterfall of one trace: offset, duration and indented span names."""
+    children = {}
+    for span in spans:
+        children.setdefault(span["parent_id"], []).append(span)
+    ids = {span["span_id"] for span in spans}
+    roots = [span for span in spans if span["parent_id"] not in ids]
+    origin = min(span["start_us"] for span in spans)
+    lines = []
+
+    def walk(span, depth):
+        lines.append(f"{(span['start_us'] - origin) / 1000:>9.1f} ms {span['duration_us'] / 1000:>9.2f} ms  "
+                     f"{'  ' * depth}{span['name']} [{span['service']}]")
+        for child in sorted(children.get(span["span_id"], []), key=lambda s: s["start_us"]):
+            walk(child, depth + 1)
+
+    for root in sorted(roots, key=lambda s: s["start_us"]):
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show a trace as a waterfall and convert it to Chrome trace format.")
+    parser.add_argument("input", nargs="?", default=str(TRACE_EXPORT_PATH), help="Span export (JSONL).")
+    parser.add_argument("--trace", help="Trace id (default: the most recent trace).")
+    parser.add_argument("--output", "-o", help="Write the trace as Chrome trace JSON (open in ui.perfetto.dev).")
+    args = parser.parse_args()
+
+    traces = load_spans(args.input, args.trace)
+    if not traces:
+        raise SystemExit("No matching trace.")
+    trace_id, spans = max(traces.items(), key=lambda item: max(s["start_us"] for s in item[1]))
+    print(f"Trace {trace_id}: {len(spans)} spans")
+    print(format_waterfall(spans))
+    if args.output:
+        Path(args.output).write_text(json.dumps(to_chrome_trace(spans)))
+        print(f"Chrome trace written to {args.output}")
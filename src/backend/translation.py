@@ -0,0 +1,269 @@
+"""
+Translation service module.
+Holds the Helsinki-NLP translation models for the API in an LRU registry
+and micro-batches concurrent translation requests before each forward pass.
+"""
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Inference settings for the translation model (overridable via env vars)
+TRANSLATOR_OPTIMIZED = os.getenv("TRANSLATOR_OPTIMIZED", "1") == "1"
+TRANSLATOR_NUM_THREADS = int(os.getenv("TRANSLATOR_NUM_THREADS", "2"))
+TRANSLATOR_BATCH_SIZE = int(os.getenv("TRANSLATOR_BATCH_SIZE", "8"))
+# How long the batcher waits for more requests before running a forward pass
+TRANSLATOR_MAX_WAIT_MS = float(os.getenv("TRANSLATOR_MAX_WAIT_MS", "5"))
+# Limits on the models kept in memory at the same time by one worker process
+# (0 disables the memory cap); the API holds WEB_CONCURRENCY times as many
+TRANSLATOR_MAX_MODELS = int(os.getenv("TRANSLATOR_MAX_MODELS", "2"))
+TRANSLATOR_MAX_MEMORY_MB = float(os.getenv("TRANSLATOR_MAX_MEMORY_MB", "0"))
+# Target languages offered for translation from English
+SUPPORTED_LANGUAGES = [lang.strip() for lang in os.getenv("TRANSLATOR_LANGUAGES", "fr,de,es,it").split(",") if lang.strip()]
+
+
+def build_translator(source_lang, target_lang, optimized=TRANSLATOR_OPTIMIZED,
+                     num_threads=TRANSLATOR_NUM_THREADS, batch_size=TRANSLATOR_BATCH_SIZE):
+    """
+    Builds the Helsinki-NLP translation pipeline for a language pair.
+
+    In optimized mode the Linear layers of the model are dynamically quantized
+    to int8, torch is limited to `num_threads` intra-op threads and the
+    pipeline never runs more than `batch_size` sentences per forward pass.
+
+    Args:
+        source_lang (str): Source language code (e.g. 'en').
+        target_lang (str): Target language code (e.g. 'fr').
+        optimized (bool): Enables int8 quantization and thread tuning.
+        num_threads (int): Intra-op thread count used by torch.
+        batch_size (int): Maximum number of sentences per forward pass.
+
+    Returns:
+        Pipeline: The translation pipeline.
+    """
+    from transformers import pipeline
+
+    model_name = f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}"
+    if not optimized:
+        return pipeline("translation", model=model_name)
+
+    import torch
+
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    translator = pipeline("translation", model=model_name, batch_size=batch_size)
+    translator.model = torch.quantization.quantize_dynamic(
+        translator.model.eval(), {torch.nn.Linear}, dtype=torch.qint8
+    )
+    return translator
+
+
+def translate_batch(translator, labels, batch_size=TRANSLATOR_BATCH_SIZE):
+    """
+    Translates a list of labels, never sending more than `batch_size`
+    sentences to the model at once.
+    """
+    translated = []
+    for start in range(0, len(labels), batch_size):
+        chunk = labels[start:start + batch_size]
+        res = translator(chunk, batch_size=batch_size)
+        translated.extend(r['translation_text'] for r in res)
+    return translated
+
+
+def model_size_bytes(translator):
+    """Estimates the memory held by a pipeline's model (weights and buffers)."""
+    def tensor_bytes(value):
+        if isinstance(value, (tuple, list)):
+            return sum(tensor_bytes(v) for v in value)
+        if hasattr(value, "element_size") and hasattr(value, "nelement"):
+            return value.element_size() * value.nelement()
+        return 0
+
+    try:
+        # state_dict also covers the packed weights of quantized Linear layers
+        return sum(tensor_bytes(v) for v in translator.model.state_dict().values())
+    except Exception:
+        return 0
+
+
+class TranslatorRegistry:
+    """
+    Loads translation pipelines per language pair on demand and keeps the
+    most recently used ones in memory.
+
+    When more than `max_models` pipelines are resident, or their estimated
+    size exceeds `max_memory_mb`, the least recently used one is evicted.
+    """
+
+    def __init__(self, max_models=TRANSLATOR_MAX_MODELS, max_memory_mb=TRANSLATOR_MAX_MEMORY_MB,
+                 loader=None):
+        self.max_models = max_models
+        self.max_bytes = max_memory_mb * 1024 * 1024
+        self._loader = loader
+        self._models = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "hits": 0, "evictions": 0}
+
+    def get(self, source_lang, target_lang):
+        """Returns the pipeline for a language pair, loading it if needed."""
+        key = (source_lang, target_lang)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._models[key]
+
+        # Loading takes seconds: do it outside the lock
+        loader = self._loader or build_translator
+        translator = loader(source_lang, target_lang)
+        size = model_size_bytes(translator)
+
+        with self._lock:
+            self._models[key] = translator
+            self._sizes[key] = size
+            self._stats["loads"] += 1
+            self._evict()
+        return translator
+
+    def _evict(self):
+        # The model that was just loaded (last entry) is never evicted
+        while len(self._models) > 1 and (
+            len(self._models) > self.max_models
+            or (self.max_bytes and sum(self._sizes.values()) > self.max_bytes)
+        ):
+            key, _ = self._models.popitem(last=False)
+            self._sizes.pop(key, None)
+            self._stats["evictions"] += 1
+
+    def stats(self):
+        """Returns load/hit/eviction counters and the resident models."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["loads"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "resident": [f"{src}-{tgt}" for src, tgt in self._models],
+                "resident_memory_mb": round(sum(self._sizes.values()) / (1024 * 1024), 1),
+                "max_models": self.max_models,
+                "max_memory_mb": self.max_bytes / (1024 * 1024) or None,
+            }
+
+    def clear(self):
+        """Drops every resident model."""
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+
+
+registry = TranslatorRegistry()
+
+
+class TranslationBatcher:
+    """
+    Collects concurrent translation requests for one language pair and runs
+    them through the model together.
+
+    The first request of a batch waits at most `max_wait_ms` for others to
+    arrive (or until `max_batch_size` texts are queued). Forward passes run
+    one at a time on a dedicated thread so the event loop is never blocked.
+    """
+
+    def __init__(self, source_lang, target_lang, max_batch_size=TRANSLATOR_BATCH_SIZE,
+                 max_wait_ms=TRANSLATOR_MAX_WAIT_MS):
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._worker = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translator")
+
+    async def translate(self, texts):
+        """Queues `texts` for translation and waits for the result."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((list(texts), future))
+        return await future
+
+    async def close(self):
+        """Stops the batching worker and releases the model thread."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._executor.shutdown(wait=False)
+
+    def _forward(self, texts):
+        # Runs on the model thread: the registry loads the model on first use
+        translator = registry.get(self.source_lang, self.target_lang)
+        return translate_batch(translator, texts, self.max_batch_size)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            queued = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+
+            # Gather more requests until the batch is full or the window closes
+            while queued < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                queued += len(item[0])
+
+            # Identical labels are only translated once per batch
+            unique = list(dict.fromkeys(text for texts, _ in batch for text in texts))
+            try:
+                results = await loop.run_in_executor(self._executor, self._forward, unique)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            translated = dict(zip(unique, results))
+            for texts, future in batch:
+                if not future.done():
+                    future.set_result([translated[text] for text in texts])
+
+
+# One batcher per language pair; the models themselves live in `registry`
+_batchers = {}
+
+
+def is_supported(source_lang, target_lang):
+    """Checks that a language pair is one the service is configured to offer."""
+    return source_lang == "en" and target_lang in SUPPORTED_LANGUAGES
+
+
+async def translate(texts, source_lang="en", target_lang="fr"):
+    """
+    Translates `texts` from `source_lang` to `target_lang` through the
+    shared micro-batching worker of that language pair.
+    """
+    key = (source_lang, target_lang)
+    if key not in _batchers:
+        _batchers[key] = TranslationBatcher(source_lang, target_lang)
+    return await _batchers[key].translate(texts)
+
+
+async def shutdown():
+    """Stops every batching worker (called when the API shuts down)."""
+    for batcher in _batchers.values():
+        await batcher.close()
+    _batchers.clear()
+    registry.clear()
@@ -0,0 +1,211 @@
+"""
+Multi-worker support module.
+Lets several API worker processes share one SQLite database: a data-version
+counter kept by triggers, caches keyed on it, and file locks coordinating
+startup and background tasks between the workers.
+"""
+import functools
+import os
+import threading
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker deployments only
+    fcntl = None
+
+# Worker processes started by uvicorn/gunicorn (both read WEB_CONCURRENCY).
+# Translation models are loaded per worker (see translation.TranslatorRegistry)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+# Lock files and shared secrets of the workers
+WORKER_STATE_DIR = Path(os.getenv(
+    "WORKER_STATE_DIR", Path(__file__).resolve().parent.parent.parent / "data" / "workers"
+))
+STATS_CACHE_ENABLED = os.getenv("STATS_CACHE_ENABLED", "1") == "1"
+
+# Tables whose writes change the data version
+TRACKED_TABLES = ("employees", "sales", "RD", "HR")
+# HR follow-up columns, written one employee at a time and in bulk by scoring:
+# no cached result reads them, so their updates leave the version unchanged
+UNTRACKED_COLUMNS = {"score", "evaluation_note", "comment"}
+
+
+def install_data_version(conn):
+    """
+    Creates the data_version counter and the triggers bumping it on every
+    insert and delete of TRACKED_TABLES, and on updates of their columns but
+    UNTRACKED_COLUMNS. Triggers live in the database, so writes from any
+    process or tool are counted. Idempotent; run it again after adding
+    columns so the update triggers cover them.
+    """
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS data_version (id INTEGER PRIMARY KEY CHECK (id = 0), version INTEGER NOT NULL)"
+    )
+    conn.exec_driver_sql("INSERT OR IGNORE INTO data_version (id, version) VALUES (0, 0)")
+    bump = "BEGIN UPDATE data_version SET version = version + 1 WHERE id = 0; END"
+    for table in TRACKED_TABLES:
+        columns = [row[1] for row in conn.exec_driver_sql(f'PRAGMA table_info("{table}")')]
+        if not columns:
+            continue
+        tracked = ", ".join(f'"{name}"' for name in columns if name not in UNTRACKED_COLUMNS)
+        for operation, event in (("insert", "INSERT"), ("delete", "DELETE"), ("update", f"UPDATE OF {tracked}")):
+            name = f"{table}_{operation}_data_version"
+            conn.exec_driver_sql(f'DROP TRIGGER IF EXISTS "{name}"')
+            conn.exec_driver_sql(f'CREATE TRIGGER "{name}" AFTER {event} ON "{table}" {bump}')
+
+
+def bump_data_version(conn):
+    """Marks the data as changed (writes that bypass the triggers, e.g. table rebuilds)."""
+    conn.exec_driver_sql("UPDATE data_version SET version = version + 1 WHERE id = 0")
+
+
+def data_version(db):
+    """Current data version (a single-row read; None if the counter is not installed)."""
+    try:
+        return db.connection().exec_driver_sql("SELECT version FROM data_version WHERE id = 0").scalar()
+    except OperationalError:
+        db.rollback()
+        return None
+
+
+class VersionedCache:
+    """
+    In-process cache whose entries are valid for one data version.
+
+    A value is computed after the version was read, so it is never older than
+    the version it is stored under; any write in any worker moves the version
+    and the next lookup recomputes.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, compute):
+        if version is None:
+            return compute()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = compute()
+        with self._lock:
+            current = self._entries.get(key)
+            # A slower request must not replace a value of a newer version
+            if current is None or current[0] < version:
+                self._entries[key] = (version, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+# Analytics results (see cached_by_data_version)
+stats_cache = VersionedCache()
+
+
+def cached_by_data_version(func):
+    """
+    Caches the result of an endpoint taking a `db` session until the data
+    version changes. Costs one single-row query per call instead of the
+    endpoint's work; exceptions (e.g. 404) are not cached.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, db, **kwargs):
+        if not STATS_CACHE_ENABLED:
+            return func(*args, db=db, **kwargs)
+        key = (func.__name__, tuple(sorted(kwargs.items())))
+        return stats_cache.get(key, data_version(db), lambda: func(*args, db=db, **kwargs))
+    return wrapper
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, serializing processes (a no-op without fcntl)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._fd = None
+
+    def acquire(self, blocking=True):
+        """Takes the lock; with `blocking=False`, returns False if another process holds it."""
+        if fcntl is None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    @property
+    def held(self):
+        return self._fd is not None
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def startup_lock():
+    """Held while a worker migrates the database and builds the model and feature store."""
+    return FileLock(WORKER_STATE_DIR / "startup.lock")
+
+
+_leader_lock = FileLock(WORKER_STATE_DIR / "leader.lock")
+
+
+def is_leader():
+    """
+    True in exactly one worker: the first to take the leader lock keeps it
+    for its lifetime (the OS releases it if the process dies, and the next
+    worker asking takes over). Periodic tasks run in the leader only.
+    """
+    return _leader_lock.held or _leader_lock.acquire(blocking=False)
+
+
+def shared_secret(name, nbytes=32):
+    """
+    Random secret shared by the workers through WORKER_STATE_DIR/<name>:
+    the first process publishes it with an atomic link (readable by the
+    owner only), every other one reads that file.
+    """
+    path = WORKER_STATE_DIR / name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{name}.{os.getpid()}.tmp")
+        with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+            f.write(os.urandom(nbytes))
+        try:
+            os.link(tmp, path)
+        except FileExistsError:  # another worker was first
+            pass
+        finally:
+            tmp.unlink()
+    return path.read_bytes()
@@ -4,11 +4,13 @@ Provides a form to input employee data and sends it to the backend.
 """
 import os
 import streamlit as st
-import requests
 import pandas as pd
 
+from .profiler import fetch, parse_json, phase, profiled
+
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 
+@profiled("add_employee")
 def render_add_employee():
     """
     Renders the Add Employee view with a comprehensive form covering all data points.
@@ -152,10 +154,10 @@ def render_add_employee():
             }
             
             try:
-                response = requests.post(f"{API_URL}/add_employee", json=payload, timeout=10)
+                response = fetch("post", f"{API_URL}/add_employee", json=payload, timeout=10)
                 
                 if response.status_code == 200:
-                    resp_data = response.json()
+                    resp_data = parse_json(response)
                     new_id_created = resp_data.get("id")
                     final_data = resp_data.get("data", payload)
                     final_data['id'] = new_id_created # Ensure ID is correct
@@ -190,4 +192,5 @@ def render_add_employee():
                 c3.metric("Years at Company", emp.get('YearsAtCompany'))
                 c4.metric("Job Satisfaction", f"{emp.get('JobSatisfaction')}/4")
                 
-                st.dataframe(pd.DataFrame([emp]), width="stretch", hide_index=True)
+                with phase("render"):
+                    st.dataframe(pd.DataFrame([emp]), width="stretch", hide_index=True)
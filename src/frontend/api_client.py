@@ -0,0 +1,92 @@
+"""
+HTTP client of the Streamlit frontend.
+Every call to the backend goes through `request`, which sends the session's
+access token, propagates the trace context (W3C `traceparent`) of the page
+render and records client spans.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+import requests
+import streamlit as st
+from urllib3.util.request import ACCEPT_ENCODING
+
+from ..backend import tracing
+
+SERVICE_NAME = "frontend"
+# Every encoding urllib3 can decode here (zstd and br when their modules are
+# installed), so the API compresses large payloads with its preferred codec
+DEFAULT_HEADERS = {"Accept-Encoding": ACCEPT_ENCODING}
+
+# Trace of the page being rendered (one per script run of a session)
+_render_trace = ContextVar("render_trace", default=None)
+
+
+@contextmanager
+def traced_render(view):
+    """Opens the root span of a page render; the API calls made inside become its children."""
+    if not tracing.TRACING_ENABLED or _render_trace.get() is not None:
+        yield
+        return
+    trace = tracing.Trace(tracing.new_trace_id(), tracing.new_span_id(), SERVICE_NAME)
+    token = _render_trace.set(trace)
+    start = tracing.now_us()
+    try:
+        yield
+    finally:
+        _render_trace.reset(token)
+        trace.spans.append(tracing.make_span(
+            trace.trace_id, trace.span_id, None, f"render {view}", "internal", SERVICE_NAME,
+            start, tracing.now_us(), {"view": view},
+        ))
+        tracing.exporter.export(trace.spans)
+
+
+def request(method, url, **kwargs):
+    """requests.request authenticated with the session's token (see the API's auth module)."""
+    headers = {**DEFAULT_HEADERS, **(kwargs.get("headers") or {})}
+    token = st.session_state.get("auth_token")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    kwargs["headers"] = headers
+    response = _traced_request(method, url, **kwargs)
+
+    refreshed = response.headers.get("X-Refreshed-Token")
+    if refreshed:
+        st.session_state.auth_token = refreshed
+    elif token and response.status_code == 401:
+        # Expired or invalid token: back to the login form at the next rerun
+        st.session_state.pop("auth_token", None)
+        st.session_state.logged_in = False
+    return response
+
+
+def _traced_request(method, url, **kwargs):
+    """requests.request with trace propagation (a new trace when no page render is traced)."""
+    if not tracing.TRACING_ENABLED:
+        return requests.request(method, url, **kwargs)
+
+    trace = _render_trace.get()
+    trace_id = trace.trace_id if trace else tracing.new_trace_id()
+    span_id = tracing.new_span_id()
+    kwargs["headers"]["traceparent"] = tracing.format_traceparent(trace_id, span_id)
+    attributes = {"http.method": method.upper(), "http.url": url}
+    start = tracing.now_us()
+    try:
+        response = requests.request(method, url, **kwargs)
+        attributes["http.status_code"] = response.status_code
+        return response
+    except requests.RequestException as e:
+        attributes["error"] = repr(e)
+        raise
+    finally:
+        span = tracing.make_span(
+            trace_id, span_id, trace.span_id if trace else None,
+            f"{method.upper()} {urlsplit(url).path or '/'}",
+            "client", SERVICE_NAME, start, tracing.now_us(), attributes,
+        )
+        if trace:
+            trace.spans.append(span)
+        else:
+            tracing.exporter.export([span])
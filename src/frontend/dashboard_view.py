@@ -4,10 +4,11 @@ Contains logic for rendering KPIs, charts, and employee search results.
 """
 import os
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
 
+from .profiler import fetch, parse_json, phase, profiled
+
 
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 
@@ -44,6 +45,7 @@ def end_card():
     """Ends the styled container for KPI cards."""
     st.markdown('</div>', unsafe_allow_html=True)
 
+@profiled("search")
 def render_search_view():
     """Renders the isolated search result view with evaluation and comment actions."""
     emp_id = st.session_state.search_emp_id
@@ -95,7 +97,7 @@ def render_search_view():
     st.title("🔍 Search Result")
 
     try:
-        res = requests.get(f"{API_URL}/employee/{emp_id}", timeout=5)
+        res = fetch("get", f"{API_URL}/employee/{emp_id}", timeout=5)
     except Exception as e:
         st.error(f"Network error: {e}")
         if st.button("🏠 Return to Home"):
@@ -117,7 +119,7 @@ def render_search_view():
             st.rerun()
         return
 
-    emp = res.json()
+    emp = parse_json(res)
 
     # Employee Card Display
     st.markdown(f"""
@@ -157,8 +159,8 @@ def render_search_view():
         
         if st.form_submit_button("💾 Save Changes", use_container_width=True):
             try:
-                requests.post(f"{API_URL}/update_evaluation_note", json={"id": emp_id, "evaluation_note": new_note}, timeout=5)
-                requests.post(f"{API_URL}/update_comment", json={"id": emp_id, "comment": new_comment}, timeout=5)
+                fetch("post", f"{API_URL}/update_evaluation_note", json={"id": emp_id, "evaluation_note": new_note}, timeout=5)
+                fetch("post", f"{API_URL}/update_comment", json={"id": emp_id, "comment": new_comment}, timeout=5)
                 st.success("Information saved successfully!")
                 st.rerun()
             except Exception as e:
@@ -169,6 +171,7 @@ def render_search_view():
         del st.session_state.search_emp_id
         st.rerun()
 
+@profiled("dashboard")
 def render_dashboard():
     """Renders the main dashboard view with KPIs and visualizations."""
     
@@ -180,7 +183,7 @@ def render_dashboard():
     st.title("🟩 Performance Hub")
     # Header & KPI
     try:
-        stats = requests.get(f"{API_URL}/stats", timeout=5).json()
+        stats = parse_json(fetch("get", f"{API_URL}/stats", timeout=5))
     except Exception as e:
         st.error(f"Unable to retrieve statistics: {e}")
         return
@@ -265,59 +268,63 @@ def render_dashboard():
     with cl1:
         st.subheader("Performance by Department")
         try:
-            res = requests.get(f"{API_URL}/employee", timeout=5)
+            res = fetch("get", f"{API_URL}/employee", timeout=5)
         except Exception as e:
             st.error(f"Network error: {e}")
     
         if res.status_code == 200:
-            emp = res.json()
-            data_df = pd.DataFrame(emp)
+            emp = parse_json(res)
+            with phase("parse"):
+                data_df = pd.DataFrame(emp)
             
         def plot_performance_by_department(df: pd.DataFrame):
             """
             Plots the average performance rating by department as a bar chart.
             """
-            # Select required columns
-            subset = df[['Department', 'PerformanceRating']]
+            with phase("transform"):
+                # Select required columns
+                subset = df[['Department', 'PerformanceRating']]
             
-            # Group by department and compute mean performance rating
-            grouped = (
-                subset
-                .groupby('Department', as_index=False)
-                .agg(AveragePerformance=('PerformanceRating', 'mean'))
-                .sort_values('AveragePerformance', ascending=False)
-            )
+                # Group by department and compute mean performance rating
+                grouped = (
+                    subset
+                    .groupby('Department', as_index=False)
+                    .agg(AveragePerformance=('PerformanceRating', 'mean'))
+                    .sort_values('AveragePerformance', ascending=False)
+                )
             
-            # Create interactive bar chart
-            fig = px.bar(
-                grouped,
-                x='Department',
-                y='AveragePerformance',
-                text=grouped['AveragePerformance'].round(2),
-                template='plotly_white'
-            )
+            with phase("figure"):
+                # Create interactive bar chart
+                fig = px.bar(
+                    grouped,
+                    x='Department',
+                    y='AveragePerformance',
+                    text=grouped['AveragePerformance'].round(2),
+                    template='plotly_white'
+                )
             
-            # Improve layout and readability
-            fig.update_layout(
-                yaxis=dict(
-                    title='Average Performance Rating',
-                    range=[0, 8],          # Logical scale
-                    tickmode='linear',
-                    tick0=0,
-                    dtick=0.5
+                # Improve layout and readability
+                fig.update_layout(
+                    yaxis=dict(
+                        title='Average Performance Rating',
+                        range=[0, 8],          # Logical scale
+                        tickmode='linear',
+                        tick0=0,
+                        dtick=0.5
+                    )
                 )
-            )
             
-            fig.update_traces(
-                textposition='outside',
-                hovertemplate=(
-                    "<b>%{x}</b><br>"
-                    "Average Rating: %{y:.2f}/4<extra></extra>"
+                fig.update_traces(
+                    textposition='outside',
+                    hovertemplate=(
+                        "<b>%{x}</b><br>"
+                        "Average Rating: %{y:.2f}/4<extra></extra>"
+                    )
                 )
-            )
             
-            # Display in Streamlit
-            st.plotly_chart(fig, use_container_width=True)
+            with phase("render"):
+                # Display in Streamlit
+                st.plotly_chart(fig, use_container_width=True)
             
         card_container()            
         plot_performance_by_department(data_df)
@@ -331,48 +338,51 @@ def render_dashboard():
             showing Work-Life Balance levels across all departments.
             """
             
-            # 1. Create a local copy to avoid modifying the original dataframe
-            df_plot = df.copy()
-
-            # 2. Mapping numerical values to English labels
-            # Based on: 1 'Bad', 2 'Good', 3 'Better', 4 'Best'
-            wlb_mapping = {
-                1: '1-Bad',
-                2: '2-Good',
-                3: '3-Better',
-                4: '4-Best'
-            }
-            df_plot['WLB_Status'] = df_plot['WorkLifeBalance'].map(wlb_mapping)
-
-            # 3. Create the stacked bar chart
-            # 'barnorm=percent' automatically handles the grouping and percentage calculation
-            fig = px.histogram(
-                df_plot, 
-                x="Department", 
-                color="WLB_Status",
-                category_orders={"WLB_Status": ["1-Bad", "2-Good", "3-Better", "4-Best"]},
-                barnorm='percent', 
-                text_auto='.1f',   # Shows the percentage label on each bar
-                color_discrete_map={
-                    "1-Bad": "#FF4B4B",    # Red for alert
-                    "2-Good": "#FFAA00",   # Orange
-                    "3-Better": "#00CC96", # Green
-                    "4-Best": "#0068C9"    # Blue
+            with phase("transform"):
+                # 1. Create a local copy to avoid modifying the original dataframe
+                df_plot = df.copy()
+
+                # 2. Mapping numerical values to English labels
+                # Based on: 1 'Bad', 2 'Good', 3 'Better', 4 'Best'
+                wlb_mapping = {
+                    1: '1-Bad',
+                    2: '2-Good',
+                    3: '3-Better',
+                    4: '4-Best'
                 }
-            )
-
-            # 4. Styling the layout for an HR-friendly look
-            fig.update_layout(
-                yaxis_title="Percentage of Employees (%)",
-                xaxis_title="Department",
-                legend_title="WLB Rating",
-                template="plotly_white",
-                uniformtext_minsize=8, 
-                uniformtext_mode='hide'
-            )
-
-            # 5. Render in Streamlit
-            st.plotly_chart(fig, use_container_width=True)
+                df_plot['WLB_Status'] = df_plot['WorkLifeBalance'].map(wlb_mapping)
+
+            with phase("figure"):
+                # 3. Create the stacked bar chart
+                # 'barnorm=percent' automatically handles the grouping and percentage calculation
+                fig = px.histogram(
+                    df_plot, 
+                    x="Department", 
+                    color="WLB_Status",
+                    category_orders={"WLB_Status": ["1-Bad", "2-Good", "3-Better", "4-Best"]},
+                    barnorm='percent', 
+                    text_auto='.1f',   # Shows the percentage label on each bar
+                    color_discrete_map={
+                        "1-Bad": "#FF4B4B",    # Red for alert
+                        "2-Good": "#FFAA00",   # Orange
+                        "3-Better": "#00CC96", # Green
+                        "4-Best": "#0068C9"    # Blue
+                    }
+                )
+
+                # 4. Styling the layout for an HR-friendly look
+                fig.update_layout(
+                    yaxis_title="Percentage of Employees (%)",
+                    xaxis_title="Department",
+                    legend_title="WLB Rating",
+                    template="plotly_white",
+                    uniformtext_minsize=8, 
+                    uniformtext_mode='hide'
+                )
+
+            with phase("render"):
+                # 5. Render in Streamlit
+                st.plotly_chart(fig, use_container_width=True)
             
         card_container()            
         display_wlb_by_department(data_df)
@@ -394,13 +404,14 @@ useful_cols = ['id','Age',
 
 
 # Sales department data view
+@profiled("sales")
 def render_sales_data():
     """Renders the Sales department dashboard view with KPIs and visualizations."""
     
     st.title("🟩 Performance Hub")
     # Header & KPI
     try:
-        sales_stats = requests.get(f"{API_URL}/sales/sales_stats", timeout=5).json()
+        sales_stats = parse_json(fetch("get", f"{API_URL}/sales/sales_stats", timeout=5))
     except Exception as e:
         st.error(f"Unable to retrieve statistics: {e}")
         return
@@ -477,52 +488,56 @@ def render_sales_data():
     with cl1:
         st.subheader("Attrition Rate (%) by Job Role")
         try:
-            res = requests.get(f"{API_URL}/sales", timeout=5)
+            res = fetch("get", f"{API_URL}/sales", timeout=5)
         except Exception as e:
             st.error(f"Network error: {e}")
     
         if res.status_code == 200:
-            emp = res.json()
-            data_df = pd.DataFrame(emp)
+            emp = parse_json(res)
+            with phase("parse"):
+                data_df = pd.DataFrame(emp)
             
         def display_attrition_by_role(df: pd.DataFrame):
             """
             Calculates the attrition rate per job role and displays 
             a sorted horizontal bar chart.
             """
-            # 1. Prepare data: Convert 'Yes'/'No' to 1/0 to calculate the mean (rate)
-            df_temp = df.copy()
-            df_temp['Attrition_Numeric'] = df_temp['Attrition'].apply(lambda x: 1 if x == 'Yes' else 0)
+            with phase("transform"):
+                # 1. Prepare data: Convert 'Yes'/'No' to 1/0 to calculate the mean (rate)
+                df_temp = df.copy()
+                df_temp['Attrition_Numeric'] = df_temp['Attrition'].apply(lambda x: 1 if x == 'Yes' else 0)
             
-            # 2. Group by Job Role and calculate the average
-            attrition_data = df_temp.groupby('JobRole')['Attrition_Numeric'].mean().reset_index()
-            attrition_data['Attrition_Rate'] = attrition_data['Attrition_Numeric'] * 100
+                # 2. Group by Job Role and calculate the average
+                attrition_data = df_temp.groupby('JobRole')['Attrition_Numeric'].mean().reset_index()
+                attrition_data['Attrition_Rate'] = attrition_data['Attrition_Numeric'] * 100
             
-            # 3. Sort for better visualization
-            attrition_data = attrition_data.sort_values(by='Attrition_Rate', ascending=True)
-
-            # 4. Create the Plotly Horizontal Bar Chart
-            fig = px.bar(
-                attrition_data,
-                x='Attrition_Rate',
-                y='JobRole',
-                orientation='h',
-                text_auto='.1f',
-                color='Attrition_Rate',
-                color_continuous_scale='Reds' # Darker red for higher attrition roles
-            )
-
-            # 5. UI Layout adjustments
-            fig.update_layout(
-                xaxis_title="Attrition Rate (Percentage)",
-                yaxis_title="Position / Job Role",
-                showlegend=False,
-                template="plotly_white",
-                margin=dict(l=20, r=20, t=40, b=20)
-            )
-
-            # 6. Render in Streamlit
-            st.plotly_chart(fig, use_container_width=True)
+                # 3. Sort for better visualization
+                attrition_data = attrition_data.sort_values(by='Attrition_Rate', ascending=True)
+
+            with phase("figure"):
+                # 4. Create the Plotly Horizontal Bar Chart
+                fig = px.bar(
+                    attrition_data,
+                    x='Attrition_Rate',
+                    y='JobRole',
+                    orientation='h',
+                    text_auto='.1f',
+                    color='Attrition_Rate',
+                    color_continuous_scale='Reds' # Darker red for higher attrition roles
+                )
+
+                # 5. UI Layout adjustments
+                fig.update_layout(
+                    xaxis_title="Attrition Rate (Percentage)",
+                    yaxis_title="Position / Job Role",
+                    showlegend=False,
+                    template="plotly_white",
+                    margin=dict(l=20, r=20, t=40, b=20)
+                )
+
+            with phase("render"):
+                # 6. Render in Streamlit
+                st.plotly_chart(fig, use_container_width=True)
 
         card_container()            
         display_attrition_by_role(data_df)
@@ -537,46 +552,49 @@ def render_sales_data():
             displaying a 100% stacked bar chart.
             """
             
-            # 1. Create a copy and map numerical values to English labels
-            # Based on your mapping: 1 'Low', 2 'Medium', 3 'High', 4 'Very High'
-            df_plot = df.copy()
-            satisfaction_mapping = {
-                1: '1-Low',
-                2: '2-Medium',
-                3: '3-High',
-                4: '4-Very High'
-            }
-            df_plot['Satisfaction_Level'] = df_plot['JobSatisfaction'].map(satisfaction_mapping)
-
-            # 2. Create the 100% stacked bar chart
-            # 'barnorm=percent' handles the distribution calculation automatically
-            fig = px.histogram(
-                df_plot, 
-                y="JobRole", 
-                color="Satisfaction_Level",
-                category_orders={"Satisfaction_Level": ["1-Low", "2-Medium", "3-High", "4-Very High"]},
-                barnorm='percent', 
-                text_auto='.1f',
-                orientation='h', # Horizontal for easier reading of role names
-                color_discrete_map={
-                    "1-Low": "#E74C3C",        # Red
-                    "2-Medium": "#F39C12",     # Orange
-                    "3-High": "#3498DB",       # Blue
-                    "4-Very High": "#27AE60"   # Green
+            with phase("transform"):
+                # 1. Create a copy and map numerical values to English labels
+                # Based on your mapping: 1 'Low', 2 'Medium', 3 'High', 4 'Very High'
+                df_plot = df.copy()
+                satisfaction_mapping = {
+                    1: '1-Low',
+                    2: '2-Medium',
+                    3: '3-High',
+                    4: '4-Very High'
                 }
-            )
-
-            # 3. Styling the layout
-            fig.update_layout(
-                xaxis_title="Percentage of Employees (%)",
-                yaxis_title="Job Role",
-                legend_title="Satisfaction Level",
-                template="plotly_white",
-                margin=dict(l=20, r=20, t=50, b=20)
-            )
-
-            # 4. Display in Streamlit
-            st.plotly_chart(fig, use_container_width=True)
+                df_plot['Satisfaction_Level'] = df_plot['JobSatisfaction'].map(satisfaction_mapping)
+
+            with phase("figure"):
+                # 2. Create the 100% stacked bar chart
+                # 'barnorm=percent' handles the distribution calculation automatically
+                fig = px.histogram(
+                    df_plot, 
+                    y="JobRole", 
+                    color="Satisfaction_Level",
+                    category_orders={"Satisfaction_Level": ["1-Low", "2-Medium", "3-High", "4-Very High"]},
+                    barnorm='percent', 
+                    text_auto='.1f',
+                    orientation='h', # Horizontal for easier reading of role names
+                    color_discrete_map={
+                        "1-Low": "#E74C3C",        # Red
+                        "2-Medium": "#F39C12",     # Orange
+                        "3-High": "#3498DB",       # Blue
+                        "4-Very High": "#27AE60"   # Green
+                    }
+                )
+
+                # 3. Styling the layout
+                fig.update_layout(
+                    xaxis_title="Percentage of Employees (%)",
+                    yaxis_title="Job Role",
+                    legend_title="Satisfaction Level",
+                    template="plotly_white",
+                    margin=dict(l=20, r=20, t=50, b=20)
+                )
+
+            with phase("render"):
+                # 4. Display in Streamlit
+                st.plotly_chart(fig, use_container_width=True)
         
         card_container()            
         display_satisfaction_by_role(data_df)
@@ -588,28 +606,31 @@ def render_sales_data():
     
     st.subheader("Sales Department data")
     
-    response = requests.get(f"{API_URL}/sales", timeout=5)
+    response = fetch("get", f"{API_URL}/sales", timeout=5)
 
     if response.status_code == 200:
-        sales_data = response.json()
+        sales_data = parse_json(response)
     else:
         st.error("Unable to retrieve Sales data.")
         st.stop()
      
-    df_sales = pd.DataFrame(sales_data)
-    df_sales = df_sales[useful_cols]
+    with phase("parse"):
+        df_sales = pd.DataFrame(sales_data)
+        df_sales = df_sales[useful_cols]
     
-    st.dataframe(df_sales, width="stretch", hide_index=True)
+    with phase("render"):
+        st.dataframe(df_sales, width="stretch", hide_index=True)
     
     
 # R&D department data view
+@profiled("rd")
 def render_rd_data():
     """Renders the R&D department dashboard view with KPIs and visualizations."""
     
     st.title("🟩 Talent Performance Hub")
     # Header & KPI
     try:
-        rd_stats = requests.get(f"{API_URL}/rd/rd_stats", timeout=5).json()
+        rd_stats = parse_json(fetch("get", f"{API_URL}/rd/rd_stats", timeout=5))
     except Exception as e:
         st.error(f"Unable to retrieve statistics: {e}")
         return
@@ -686,52 +707,56 @@ def render_rd_data():
     with cl1:
         st.subheader("Attrition Rate (%) by Job Role")
         try:
-            res = requests.get(f"{API_URL}/rd", timeout=5)
+            res = fetch("get", f"{API_URL}/rd", timeout=5)
         except Exception as e:
             st.error(f"Network error: {e}")
     
         if res.status_code == 200:
-            emp = res.json()
-            data_df = pd.DataFrame(emp)
+            emp = parse_json(res)
+            with phase("parse"):
+                data_df = pd.DataFrame(emp)
             
         def display_attrition_by_role(df: pd.DataFrame):
             """
             Calculates the attrition rate per job role and displays 
             a sorted horizontal bar chart.
             """
-            # 1. Prepare data: Convert 'Yes'/'No' to 1/0 to calculate the mean (rate)
-            df_temp = df.copy()
-            df_temp['Attrition_Numeric'] = df_temp['Attrition'].apply(lambda x: 1 if x == 'Yes' else 0)
+            with phase("transform"):
+                # 1. Prepare data: Convert 'Yes'/'No' to 1/0 to calculate the mean (rate)
+                df_temp = df.copy()
+                df_temp['Attrition_Numeric'] = df_temp['Attrition'].apply(lambda x: 1 if x == 'Yes' else 0)
             
-            # 2. Group by Job Role and calculate the average
-            attrition_data = df_temp.groupby('JobRole')['Attrition_Numeric'].mean().reset_index()
-            attrition_data['Attrition_Rate'] = attrition_data['Attrition_Numeric'] * 100
+                # 2. Group by Job Role and calculate the average
+                attrition_data = df_temp.groupby('JobRole')['Attrition_Numeric'].mean().reset_index()
+                attrition_data['Attrition_Rate'] = attrition_data['Attrition_Numeric'] * 100
             
-            # 3. Sort for better visualization
-            attrition_data = attrition_data.sort_values(by='Attrition_Rate', ascending=True)
-
-            # 4. Create the Plotly Horizontal Bar Chart
-            fig = px.bar(
-                attrition_data,
-                x='Attrition_Rate',
-                y='JobRole',
-                orientation='h',
-                text_auto='.1f',
-                color='Attrition_Rate',
-                color_continuous_scale='Reds' # Darker red for higher attrition roles
-            )
-
-            # 5. UI Layout adjustments
-            fig.update_layout(
-                xaxis_title="Attrition Rate (Percentage)",
-                yaxis_title="Position / Job Role",
-                showlegend=False,
-                template="plotly_white",
-                margin=dict(l=20, r=20, t=40, b=20)
-            )
-
-            # 6. Render in Streamlit
-            st.plotly_chart(fig, use_container_width=True)
+                # 3. Sort for better visualization
+                attrition_data = attrition_data.sort_values(by='Attrition_Rate', ascending=True)
+
+            with phase("figure"):
+                # 4. Create the Plotly Horizontal Bar Chart
+                fig = px.bar(
+                    attrition_data,
+                    x='Attrition_Rate',
+                    y='JobRole',
+                    orientation='h',
+                    text_auto='.1f',
+                    color='Attrition_Rate',
+                    color_continuous_scale='Reds' # Darker red for higher attrition roles
+                )
+
+                # 5. UI Layout adjustments
+                fig.update_layout(
+                    xaxis_title="Attrition Rate (Percentage)",
+                    yaxis_title="Position / Job Role",
+                    showlegend=False,
+                    template="plotly_white",
+                    margin=dict(l=20, r=20, t=40, b=20)
+                )
+
+            with phase("render"):
+                # 6. Render in Streamlit
+                st.plotly_chart(fig, use_container_width=True)
 
         card_container()            
         display_attrition_by_role(data_df)
@@ -746,46 +771,49 @@ def render_rd_data():
             displaying a 100% stacked bar chart.
             """
             
-            # 1. Create a copy and map numerical values to English labels
-            # Based on your mapping: 1 'Low', 2 'Medium', 3 'High', 4 'Very High'
-            df_plot = df.copy()
-            satisfaction_mapping = {
-                1: '1-Low',
-                2: '2-Medium',
-                3: '3-High',
-                4: '4-Very High'
-            }
-            df_plot['Satisfaction_Level'] = df_plot['JobSatisfaction'].map(satisfaction_mapping)
-
-            # 2. Create the 100% stacked bar chart
-            # 'barnorm=percent' handles the distribution calculation automatically
-            fig = px.histogram(
-                df_plot, 
-                y="JobRole", 
-                color="Satisfaction_Level",
-                category_orders={"Satisfaction_Level": ["1-Low", "2-Medium", "3-High", "4-Very High"]},
-                barnorm='percent', 
-                text_auto='.1f',
-                orientation='h', # Horizontal for easier reading of role names
-                color_discrete_map={
-                    "1-Low": "#E74C3C",        # Red
-                    "2-Medium": "#F39C12",     # Orange
-                    "3-High": "#3498DB",       # Blue
-                    "4-Very High": "#27AE60"   # Green
+            with phase("transform"):
+                # 1. Create a copy and map numerical values to English labels
+                # Based on your mapping: 1 'Low', 2 'Medium', 3 'High', 4 'Very High'
+                df_plot = df.copy()
+                satisfaction_mapping = {
+                    1: '1-Low',
+                    2: '2-Medium',
+                    3: '3-High',
+                    4: '4-Very High'
                 }
-            )
-
-            # 3. Styling the layout
-            fig.update_layout(
-                xaxis_title="Percentage of Employees (%)",
-                yaxis_title="Job Role",
-                legend_title="Satisfaction Level",
-                template="plotly_white",
-                margin=dict(l=20, r=20, t=50, b=20)
-            )
-
-            # 4. Display in Streamlit
-            st.plotly_chart(fig, use_container_width=True)
+                df_plot['Satisfaction_Level'] = df_plot['JobSatisfaction'].map(satisfaction_mapping)
+
+            with phase("figure"):
+                # 2. Create the 100% stacked bar chart
+                # 'barnorm=percent' handles the distribution calculation automatically
+                fig = px.histogram(
+                    df_plot, 
+                    y="JobRole", 
+                    color="Satisfaction_Level",
+                    category_orders={"Satisfaction_Level": ["1-Low", "2-Medium", "3-High", "4-Very High"]},
+                    barnorm='percent', 
+                    text_auto='.1f',
+                    orientation='h', # Horizontal for easier reading of role names
+                    color_discrete_map={
+                        "1-Low": "#E74C3C",        # Red
+                        "2-Medium": "#F39C12",     # Orange
+                        "3-High": "#3498DB",       # Blue
+                        "4-Very High": "#27AE60"   # Green
+                    }
+                )
+
+                # 3. Styling the layout
+                fig.update_layout(
+                    xaxis_title="Percentage of Employees (%)",
+                    yaxis_title="Job Role",
+                    legend_title="Satisfaction Level",
+                    template="plotly_white",
+                    margin=dict(l=20, r=20, t=50, b=20)
+                )
+
+            with phase("render"):
+                # 4. Display in Streamlit
+                st.plotly_chart(fig, use_container_width=True)
         
         card_container()            
         display_satisfaction_by_role(data_df)
@@ -797,27 +825,30 @@ def render_rd_data():
     # RD department data display
     st.subheader("Research & Development Department data")
     
-    response = requests.get(f"{API_URL}/rd", timeout=5)
+    response = fetch("get", f"{API_URL}/rd", timeout=5)
 
     if response.status_code == 200:
-        rd_data = response.json()
+        rd_data = parse_json(response)
     else:
         st.error("Unable to retrieve R&D data.")
         st.stop()
      
-    df_rd = pd.DataFrame(rd_data)
-    df_rd = df_rd[useful_cols]
+    with phase("parse"):
+        df_rd = pd.DataFrame(rd_data)
+        df_rd = df_rd[useful_cols]
     
-    st.dataframe(df_rd, width="stretch", hide_index=True)
+    with phase("render"):
+        st.dataframe(df_rd, width="stretch", hide_index=True)
     
 # HR department data view
+@profiled("hr")
 def render_hr_data():
     """Renders the HR department dashboard view with KPIs and visualizations."""
     
     st.title("🟩 Talent Performance Hub")
     # Header & KPI
     try:
-        hr_stats = requests.get(f"{API_URL}/hr/hr_stats", timeout=5).json()
+        hr_stats = parse_json(fetch("get", f"{API_URL}/hr/hr_stats", timeout=5))
     except Exception as e:
         st.error(f"Unable to retrieve statistics: {e}")
         return  
@@ -884,52 +915,56 @@ def render_hr_data():
     with cl1:
         st.subheader("Attrition Rate (%) by Job Role")
         try:
-            res = requests.get(f"{API_URL}/hr", timeout=5)
+            res = fetch("get", f"{API_URL}/hr", timeout=5)
         except Exception as e:
             st.error(f"Network error: {e}")
     
         if res.status_code == 200:
-            emp = res.json()
-            data_df = pd.DataFrame(emp)
+            emp = parse_json(res)
+            with phase("parse"):
+                data_df = pd.DataFrame(emp)
             
         def display_attrition_by_role(df: pd.DataFrame):
             """
             Calculates the attrition rate per job role and displays 
             a sorted horizontal bar chart.
             """
-            # 1. Prepare data: Convert 'Yes'/'No' to 1/0 to calculate the mean (rate)
-            df_temp = df.copy()
-            df_temp['Attrition_Numeric'] = df_temp['Attrition'].apply(lambda x: 1 if x == 'Yes' else 0)
+            with phase("transform"):
+                # 1. Prepare data: Convert 'Yes'/'No' to 1/0 to calculate the mean (rate)
+                df_temp = df.copy()
+                df_temp['Attrition_Numeric'] = df_temp['Attrition'].apply(lambda x: 1 if x == 'Yes' else 0)
             
-            # 2. Group by Job Role and calculate the average
-            attrition_data = df_temp.groupby('JobRole')['Attrition_Numeric'].mean().reset_index()
-            attrition_data['Attrition_Rate'] = attrition_data['Attrition_Numeric'] * 100
+                # 2. Group by Job Role and calculate the average
+                attrition_data = df_temp.groupby('JobRole')['Attrition_Numeric'].mean().reset_index()
+                attrition_data['Attrition_Rate'] = attrition_data['Attrition_Numeric'] * 100
             
-            # 3. Sort for better visualization
-            attrition_data = attrition_data.sort_values(by='Attrition_Rate', ascending=True)
-
-            # 4. Create the Plotly Horizontal Bar Chart
-            fig = px.bar(
-                attrition_data,
-                x='Attrition_Rate',
-                y='JobRole',
-                orientation='h',
-                text_auto='.1f',
-                color='Attrition_Rate',
-                color_continuous_scale='Reds' # Darker red for higher attrition roles
-            )
-
-            # 5. UI Layout adjustments
-            fig.update_layout(
-                xaxis_title="Attrition Rate (Percentage)",
-                yaxis_title="Position / Job Role",
-                showlegend=False,
-                template="plotly_white",
-                margin=dict(l=20, r=20, t=40, b=20)
-            )
-
-            # 6. Render in Streamlit
-            st.plotly_chart(fig, use_container_width=True)
+                # 3. Sort for better visualization
+                attrition_data = attrition_data.sort_values(by='Attrition_Rate', ascending=True)
+
+            with phase("figure"):
+                # 4. Create the Plotly Horizontal Bar Chart
+                fig = px.bar(
+                    attrition_data,
+                    x='Attrition_Rate',
+                    y='JobRole',
+                    orientation='h',
+                    text_auto='.1f',
+                    color='Attrition_Rate',
+                    color_continuous_scale='Reds' # Darker red for higher attrition roles
+                )
+
+                # 5. UI Layout adjustments
+                fig.update_layout(
+                    xaxis_title="Attrition Rate (Percentage)",
+                    yaxis_title="Position / Job Role",
+                    showlegend=False,
+                    template="plotly_white",
+                    margin=dict(l=20, r=20, t=40, b=20)
+                )
+
+            with phase("render"):
+                # 6. Render in Streamlit
+                st.plotly_chart(fig, use_container_width=True)
 
         card_container()            
         display_attrition_by_role(data_df)
@@ -944,46 +979,49 @@ def render_hr_data():
             displaying a 100% stacked bar chart.
             """
             
-            # 1. Create a copy and map numerical values to English labels
-            # Based on your mapping: 1 'Low', 2 'Medium', 3 'High', 4 'Very High'
-            df_plot = df.copy()
-            satisfaction_mapping = {
-                1: '1-Low',
-                2: '2-Medium',
-                3: '3-High',
-                4: '4-Very High'
-            }
-            df_plot['Satisfaction_Level'] = df_plot['JobSatisfaction'].map(satisfaction_mapping)
-
-            # 2. Create the 100% stacked bar chart
-            # 'barnorm=percent' handles the distribution calculation automatically
-            fig = px.histogram(
-                df_plot, 
-                y="JobRole", 
-                color="Satisfaction_Level",
-                category_orders={"Satisfaction_Level": ["1-Low", "2-Medium", "3-High", "4-Very High"]},
-                barnorm='percent', 
-                text_auto='.1f',
-                orientation='h', # Horizontal for easier reading of role names
-                color_discrete_map={
-                    "1-Low": "#E74C3C",        # Red
-                    "2-Medium": "#F39C12",     # Orange
-                    "3-High": "#3498DB",       # Blue
-                    "4-Very High": "#27AE60"   # Green
+            with phase("transform"):
+                # 1. Create a copy and map numerical values to English labels
+                # Based on your mapping: 1 'Low', 2 'Medium', 3 'High', 4 'Very High'
+                df_plot = df.copy()
+                satisfaction_mapping = {
+                    1: '1-Low',
+                    2: '2-Medium',
+                    3: '3-High',
+                    4: '4-Very High'
                 }
-            )
-
-            # 3. Styling the layout
-            fig.update_layout(
-                xaxis_title="Percentage of Employees (%)",
-                yaxis_title="Job Role",
-                legend_title="Satisfaction Level",
-                template="plotly_white",
-                margin=dict(l=20, r=20, t=50, b=20)
-            )
-
-            # 4. Display in Streamlit
-            st.plotly_chart(fig, use_container_width=True)
+                df_plot['Satisfaction_Level'] = df_plot['JobSatisfaction'].map(satisfaction_mapping)
+
+            with phase("figure"):
+                # 2. Create the 100% stacked bar chart
+                # 'barnorm=percent' handles the distribution calculation automatically
+                fig = px.histogram(
+                    df_plot, 
+                    y="JobRole", 
+                    color="Satisfaction_Level",
+                    category_orders={"Satisfaction_Level": ["1-Low", "2-Medium", "3-High", "4-Very High"]},
+                    barnorm='percent', 
+                    text_auto='.1f',
+                    orientation='h', # Horizontal for easier reading of role names
+                    color_discrete_map={
+                        "1-Low": "#E74C3C",        # Red
+                        "2-Medium": "#F39C12",     # Orange
+                        "3-High": "#3498DB",       # Blue
+                        "4-Very High": "#27AE60"   # Green
+                    }
+                )
+
+                # 3. Styling the layout
+                fig.update_layout(
+                    xaxis_title="Percentage of Employees (%)",
+                    yaxis_title="Job Role",
+                    legend_title="Satisfaction Level",
+                    template="plotly_white",
+                    margin=dict(l=20, r=20, t=50, b=20)
+                )
+
+            with phase("render"):
+                # 4. Display in Streamlit
+                st.plotly_chart(fig, use_container_width=True)
         
         card_container()            
         display_satisfaction_by_role(data_df)
@@ -991,16 +1029,18 @@ def render_hr_data():
             
     st.divider()
     st.subheader("Human Resources Department data") 
-    response = requests.get(f"{API_URL}/hr", timeout=5)
+    response = fetch("get", f"{API_URL}/hr", timeout=5)
     if response.status_code == 200:
-        hr_data = response.json()
+        hr_data = parse_json(response)
     else:
         st.error("Unable to retrieve HR data.")
         st.stop()
-    df_hr = pd.DataFrame(hr_data)
-    df_hr = df_hr[useful_cols]
+    with phase("parse"):
+        df_hr = pd.DataFrame(hr_data)
+        df_hr = df_hr[useful_cols]
     
-    st.dataframe(df_hr, width="stretch", hide_index=True)
+    with phase("render"):
+        st.dataframe(df_hr, width="stretch", hide_index=True)
     
     
 
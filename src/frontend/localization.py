@@ -1,11 +1,16 @@
 """
 Localization module for the application.
-Handles translation logic using a manual dictionary and an offline NLP model.
+Handles translation logic using a manual dictionary and the backend translation service.
 """
+import os
 import streamlit as st
-from transformers import pipeline
 
-LANGUAGE_OPTIONS = ["EN", "FR"]
+from . import api_client
+
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+
+# Languages offered in the UI; anything but EN/FR is translated by the backend model
+LANGUAGE_OPTIONS = ["EN", "FR", "DE", "ES", "IT"]
 
 # Dictionary for manual translations (English -> French)
 MANUAL_TRANSLATIONS = {
@@ -44,20 +49,6 @@ MANUAL_TRANSLATIONS = {
     "Help & Contacts": "Aide & Contacts",
 }
 
-@st.cache_resource
-def load_translator(source_lang, target_lang):
-    """
-    Loads the translation model (Helsinki-NLP) and caches it.
-    The model is downloaded locally upon first use.
-    """
-    model_name = f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}"
-    try:
-        # pipeline handles downloading and disk caching automatically
-        return pipeline("translation", model=model_name)
-    except Exception as e:
-        st.error(f"Error loading translation model ({source_lang}->{target_lang}): {e}")
-        return None
-
 def translate_label(label: str) -> str:
     """
     Translates a given label based on the selected language in session state.
@@ -72,30 +63,33 @@ def translate_label(label: str) -> str:
     if lang == "EN":
         return label
         
-    # If language is FR
-    if lang == "FR":
-        # 1. Manual dictionary (priority)
-        if label in MANUAL_TRANSLATIONS:
-            return MANUAL_TRANSLATIONS[label]
-            
-        # 2. Session cache for automatic translations already done
-        if "auto_translations" not in st.session_state:
-            st.session_state.auto_translations = {}
+    # 1. Manual dictionary (priority, French only)
+    if lang == "FR" and label in MANUAL_TRANSLATIONS:
+        return MANUAL_TRANSLATIONS[label]
         
-        if label in st.session_state.auto_translations:
-            return st.session_state.auto_translations[label]
+    # 2. Session cache for automatic translations already done
+    if "auto_translations" not in st.session_state:
+        st.session_state.auto_translations = {}
+    
+    cache_key = (lang, label)
+    if cache_key in st.session_state.auto_translations:
+        return st.session_state.auto_translations[cache_key]
+        
+    # 3. Automatic translation (EN -> lang) by the backend translation service
+    try:
+        res = api_client.request(
+            "post",
+            f"{API_URL}/translate",
+            json={"texts": [label], "source": "en", "target": lang.lower()},
+            timeout=10,
+        )
+        if res.status_code == 200:
+            translated_text = res.json()["translations"][0]
+            st.session_state.auto_translations[cache_key] = translated_text
+            return translated_text
+    except Exception:
+        pass
             
-        # 3. Automatic translation (EN -> FR)
-        translator = load_translator("en", "fr")
-        if translator:
-            try:
-                res = translator(label)
-                translated_text = res[0]['translation_text']
-                st.session_state.auto_translations[label] = translated_text
-                return translated_text
-            except Exception:
-                pass
-                
     return label
 
 t = translate_label
\ No newline at end of file
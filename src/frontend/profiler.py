@@ -0,0 +1,170 @@
+"""
+Render profiler for the Streamlit views (opt-in).
+Times the fetch, parse, transform, figure and render phases of each page,
+shows the breakdown in a sidebar panel and can append it to a JSONL log.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+
+import streamlit as st
+
+from . import api_client
+
+# Profiling is off unless enabled here or from the sidebar panel
+FRONTEND_PROFILER = os.getenv("FRONTEND_PROFILER", "0") == "1"
+FRONTEND_PROFILE_LOG = Path(os.getenv(
+    "FRONTEND_PROFILE_LOG", Path(__file__).resolve().parent.parent.parent / "data" / "frontend_profile.jsonl"
+))
+PHASES = ["fetch", "parse", "transform", "figure", "render"]
+# Renders kept per session for the panel averages
+HISTORY_SIZE = 20
+
+_current = ContextVar("render_profile", default=None)
+
+
+class RenderProfile:
+    """Exclusive time per phase of one page render (nested phases are not double counted)."""
+
+    def __init__(self, view):
+        self.view = view
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self._stack = []  # [name, start, time spent in nested phases]
+        self.start = time.perf_counter()
+        self.total = 0.0
+
+    def enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        name, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed - nested
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def to_dict(self):
+        phases_ms = {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()}
+        total_ms = round(self.total * 1000, 2)
+        # Streamlit layout calls and plain Python outside the named phases
+        phases_ms["other"] = round(max(total_ms - sum(phases_ms.values()), 0.0), 2)
+        return {"view": self.view, "total_ms": total_ms, "phases_ms": phases_ms}
+
+
+def is_enabled():
+    return st.session_state.get("profiler_enabled", FRONTEND_PROFILER)
+
+
+@contextmanager
+def phase(name):
+    """Attributes the time spent in the block to `name` (no-op when not profiling)."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    profile.enter(name)
+    try:
+        yield
+    finally:
+        profile.exit()
+
+
+def profiled(view):
+    """
+    Decorator timing a render function; the innermost profiled view names the
+    record. The render is also the root span of its trace when tracing is on.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with api_client.traced_render(view):
+                if not is_enabled():
+                    return func(*args, **kwargs)
+                outer = _current.get()
+                if outer is not None:
+                    outer.view = view
+                    return func(*args, **kwargs)
+
+                profile = RenderProfile(view)
+                token = _current.set(profile)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    # Also runs on st.stop()/st.rerun(), which raise to end the script
+                    profile.total = time.perf_counter() - profile.start
+                    _current.reset(token)
+                    _record(profile.to_dict())
+        return wrapper
+    return decorator
+
+
+def fetch(method, url, **kwargs):
+    """API call (api_client.request) timed as the fetch phase."""
+    with phase("fetch"):
+        return api_client.request(method, url, **kwargs)
+
+
+def parse_json(response):
+    """response.json() timed as the parse phase."""
+    with phase("parse"):
+        return response.json()
+
+
+def _record(entry):
+    history = st.session_state.setdefault("profiler_history", [])
+    history.append(entry)
+    del history[:-HISTORY_SIZE]
+    if st.session_state.get("profiler_log", False):
+        entry = {"timestamp": time.time(), **entry}
+        try:
+            FRONTEND_PROFILE_LOG.parent.mkdir(parents=True, exist_ok=True)
+            with FRONTEND_PROFILE_LOG.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
+
+
+def render_profiler_panel():
+    """Sidebar debug panel: toggles and the phase breakdown of the last renders."""
+    with st.sidebar.expander("⏱️ Render profiler", expanded=is_enabled()):
+        st.checkbox("Profile page rendering", value=FRONTEND_PROFILER, key="profiler_enabled")
+        st.checkbox(f"Append timings to {FRONTEND_PROFILE_LOG.name}", key="profiler_log")
+        history = st.session_state.get("profiler_history", [])
+        if not history:
+            st.caption("No profiled render yet.")
+            return
+
+        import pandas as pd
+
+        last = history[-1]
+        st.markdown(f"**{last['view']}**: {last['total_ms']:.0f} ms")
+        same_view = [entry for entry in history if entry["view"] == last["view"]]
+        breakdown = pd.DataFrame({
+            "last (ms)": last["phases_ms"],
+            f"mean of {len(same_view)} (ms)": pd.DataFrame([e["phases_ms"] for e in same_view]).mean().round(1),
+        })
+        breakdown["share"] = (breakdown["last (ms)"] / max(last["total_ms"], 1e-9) * 100).round(1).astype(str) + "%"
+        st.dataframe(breakdown, width="stretch")
+
+
+def summarize(path=FRONTEND_PROFILE_LOG):
+    """Aggregates a profile log: p50/p95 per view and phase, in milliseconds."""
+    import pandas as pd
+
+    rows = []
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            rows.append({"view": entry["view"], "total": entry["total_ms"], **entry["phases_ms"]})
+    df = pd.DataFrame(rows)
+    return df.groupby("view").quantile([0.5, 0.95]).round(1)
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(summarize(sys.argv[1] if len(sys.argv) > 1 else FRONTEND_PROFILE_LOG).to_string())
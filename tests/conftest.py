@@ -0,0 +1,77 @@
+"""
+Shared test setup.
+The API runs on a copy of the bundled database; the model, feature store and
+worker state live in a temporary folder. The environment is set here, before
+any test module imports the backend (its settings are read at import time).
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+TMP_DIR = Path(tempfile.mkdtemp(prefix="hr-tests-"))
+shutil.copy(ROOT / "data" / "hr_database.db", TMP_DIR / "hr_database.db")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{TMP_DIR / 'hr_database.db'}",
+    "MODEL_DIR": str(TMP_DIR / "models"),
+    "FEATURE_STORE_DIR": str(TMP_DIR / "feature_store"),
+    "WORKER_STATE_DIR": str(TMP_DIR / "workers"),
+    "AUTH_SECRET": "test-secret",
+    "BCRYPT_ROUNDS": "4",
+    # Retraining is exercised directly, never triggered by the API tests
+    "RETRAIN_AFTER_CHANGES": "0",
+    "RETRAIN_INTERVAL_SECONDS": "0",
+})
+
+
+def legacy_database(path):
+    """
+    Copies the bundled database to `path` as shipped, before versioning:
+    a local start may already have stamped and migrated the working copy.
+    """
+    shutil.copy(ROOT / "data" / "hr_database.db", path)
+    conn = sqlite3.connect(str(path))
+    try:
+        triggers = conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall()
+        for (name,) in triggers:
+            conn.execute(f'DROP TRIGGER "{name}"')
+        conn.execute("DROP TABLE IF EXISTS schema_migrations")
+        conn.execute("DROP TABLE IF EXISTS data_version")
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+@pytest.fixture(scope="session")
+def client():
+    """API client; startup migrates the copy and trains the first model."""
+    from fastapi.testclient import TestClient
+    from app.fastapi_app import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    """Bearer token of an HR user (created directly: registration is closed)."""
+    from src.backend import auth, crud
+    from src.backend.database import SessionLocal
+
+    with SessionLocal() as db:
+        crud.create_rh_user(db, "tests@example.com", auth.hash_password("pw-tests"))
+    response = client.post("/login", json={"email": "tests@example.com", "password": "pw-tests"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(TMP_DIR, ignore_errors=True)
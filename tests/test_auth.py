@@ -0,0 +1,59 @@
+"""Tests of the access tokens, the auth middleware and closed registration (src/backend/auth.py)."""
+import time
+
+from src.backend import auth
+
+
+def test_token_round_trip_and_tampering():
+    token = auth.create_token("hr@example.com")
+    assert auth.verify_token(token)["sub"] == "hr@example.com"
+
+    payload, signature = token.split(".")
+    forged = auth.create_token("admin@example.com").split(".")[0]
+    assert auth.verify_token(f"{forged}.{signature}") is None
+    assert auth.verify_token(f"{payload}.{signature[:-2]}") is None
+    assert auth.verify_token("not-a-token") is None
+
+
+def test_token_expires():
+    token = auth.create_token("hr@example.com", ttl=60, now=1000)
+    assert auth.verify_token(token, now=1059) is not None
+    assert auth.verify_token(token, now=1060) is None
+
+
+def test_bearer_claims():
+    token = auth.create_token("hr@example.com")
+    assert auth.bearer_claims([(b"authorization", f"Bearer {token}".encode())])[0]["sub"] == "hr@example.com"
+    assert auth.bearer_claims([(b"authorization", f"Basic {token}".encode())]) == (None, "Invalid or expired token")
+    assert auth.bearer_claims([]) == (None, "Not authenticated")
+
+
+def test_protected_routes_need_a_valid_token(client, auth_headers):
+    assert client.get("/stats").status_code == 401
+    assert client.get("/stats", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert client.get("/stats", headers=auth_headers).status_code == 200
+
+
+def test_expiring_token_is_refreshed(client, auth_headers):
+    old = auth.create_token("tests@example.com", now=time.time() - auth.AUTH_TOKEN_TTL_SECONDS * 0.75)
+    response = client.get("/stats", headers={"Authorization": f"Bearer {old}"})
+    assert response.status_code == 200
+    assert auth.verify_token(response.headers["x-refreshed-token"])["sub"] == "tests@example.com"
+
+
+def test_translate_is_public(client):
+    # Labels of the login page are translated before any token exists
+    response = client.post("/translate", json={})
+    assert response.status_code == 400
+
+
+def test_registration_is_closed(client, auth_headers, monkeypatch):
+    account = {"email": "new@example.com", "password": "pw-new"}
+    response = client.post("/register", json=account)
+    assert response.status_code == 403
+
+    assert client.post("/register", json=account, headers=auth_headers).status_code == 200
+    assert client.post("/login", json=account).json()["status"] == "success"
+
+    monkeypatch.setattr(auth, "AUTH_OPEN_REGISTRATION", True)
+    assert client.post("/register", json={"email": "open@example.com", "password": "pw"}).status_code == 200
@@ -0,0 +1,53 @@
+"""Tests of the database bootstrap decisions (src/backend/data_setup.py)."""
+import sqlite3
+
+import pytest
+
+from conftest import legacy_database
+from src.backend import data_setup
+
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    """Records the rebuilds instead of downloading and ingesting the dataset."""
+    calls = []
+    monkeypatch.setattr(data_setup, "setup_db", lambda db_path, *args: calls.append(db_path))
+    return calls
+
+
+def _query(db_path, sql):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(sql).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_unversioned_database_with_current_schema_is_stamped(tmp_path, rebuilds):
+    db_path = legacy_database(tmp_path / "hr.db")
+    employees = _query(db_path, "SELECT count(*) FROM employees")
+    assert data_setup.database_version(db_path) == 0
+
+    assert data_setup.bootstrap_db(db_path) is False
+    assert rebuilds == []
+    assert data_setup.database_version(db_path) == data_setup.DATA_VERSION
+    assert _query(db_path, "SELECT count(*) FROM employees") == employees
+
+    # Up to date from now on: nothing to check or rebuild
+    assert data_setup.bootstrap_db(db_path) is False
+    assert rebuilds == []
+
+
+def test_outdated_schema_is_rebuilt(tmp_path, rebuilds):
+    db_path = legacy_database(tmp_path / "hr.db")
+    conn = sqlite3.connect(str(db_path))
+    conn.execute('DROP TABLE "RD"')
+    conn.close()
+
+    assert data_setup.bootstrap_db(db_path) is True
+    assert rebuilds == [db_path]
+
+
+def test_missing_database_is_built(tmp_path, rebuilds):
+    assert data_setup.bootstrap_db(tmp_path / "new.db") is True
+    assert rebuilds == [tmp_path / "new.db"]
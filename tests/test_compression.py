@@ -0,0 +1,50 @@
+"""Tests of the Accept-Encoding negotiation and the compression middleware (src/backend/compression.py)."""
+import gzip
+
+import pytest
+
+from src.backend import compression
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip, br, zstd", "zstd"),
+    ("gzip;q=1.0, zstd;q=0.5", "gzip"),
+    ("br;q=0.8, gzip;q=0.8", "br"),
+    ("zstd;q=0, gzip", "gzip"),
+    ("*", "zstd"),
+    ("*;q=0.1, gzip;q=0", "zstd"),
+    ("identity", None),
+    ("gzip;q=bad", None),
+])
+def test_negotiate(header, expected):
+    assert compression.negotiate(header, available=["zstd", "br", "gzip"]) == expected
+
+
+def test_levels_per_route():
+    assert compression.route_level("get_all_employees", "zstd") == compression.BULK_LEVELS["zstd"]
+    assert compression.route_level("get_global_stats", "gzip") == compression.DEFAULT_LEVELS["gzip"]
+
+
+@pytest.mark.parametrize("encoding", sorted(compression.CODECS))
+def test_large_responses_are_compressed(client, auth_headers, encoding):
+    plain = client.get("/employee", headers={**auth_headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    response = client.get("/employee", headers={**auth_headers, "Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(plain.content) / 4
+    # The test client decodes the body
+    assert response.content == plain.content
+
+
+def test_small_responses_are_sent_as_is(client):
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json()["message"]
+
+
+def test_gzip_body_is_a_gzip_stream():
+    data = b'{"employees": []}' * 200
+    assert gzip.decompress(compression.compress(data, "gzip")) == data
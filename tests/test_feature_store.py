@@ -0,0 +1,70 @@
+"""Tests of the feature store upserts and staleness checks (src/backend/feature_store.py)."""
+import numpy as np
+
+from src.backend import crud, feature_store, ml_logic, workers
+from src.backend.database import SessionLocal, engine
+
+
+def _new_employee(client, auth_headers, **fields):
+    with SessionLocal() as db:
+        template = crud.get_employee(db, crud.get_max_id(db))
+        record = {col: getattr(template, col) for col in ml_logic.NUMERIC_FEATURES + ml_logic.CATEGORICAL_FEATURES}
+    record.update(fields, auto_id=True)
+    response = client.post("/add_employee", json=record, headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def _store_row(db, emp_id):
+    model = ml_logic.get_model()
+    ids, X = feature_store.employee_matrix(db, model, ids=[emp_id])
+    assert ids.tolist() == [emp_id]
+    return dict(zip(model.feature_names, X[0]))
+
+
+def test_added_employee_is_patched_in_without_rebuild(client, auth_headers):
+    store = feature_store.store
+    generation = store.generation
+    emp_id = _new_employee(client, auth_headers, Age=61)
+
+    with SessionLocal() as db:
+        assert store.data_version == workers.data_version(db)
+        assert _store_row(db, emp_id)["Age"] == 61
+    assert store.generation == generation
+
+
+def test_write_outside_the_api_rebuilds_on_next_read(client, auth_headers):
+    store = feature_store.store
+    emp_id = _new_employee(client, auth_headers, Age=40)
+    generation = store.generation
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE employees SET Age = 44 WHERE id = ?", (emp_id,))
+    with SessionLocal() as db:
+        assert store.data_version != workers.data_version(db)
+        assert _store_row(db, emp_id)["Age"] == 44
+        assert store.data_version == workers.data_version(db)
+    assert store.generation == generation + 1
+
+
+def test_upsert_does_not_hide_a_concurrent_write(client, auth_headers):
+    store = feature_store.store
+    with SessionLocal() as db:
+        version = workers.data_version(db)
+    assert store.data_version == version
+
+    # Another process wrote between this worker's commit and its upsert
+    record = {col: 1 for col in ml_logic.NUMERIC_FEATURES} | {"id": 10 ** 9}
+    store.upsert(record, version + 2)
+    assert store.data_version == version
+    store.upsert(record, version + 1)
+    assert store.data_version == version + 1
+
+
+def test_matrix_matches_the_encoder(client):
+    model = ml_logic.get_model()
+    with SessionLocal() as db:
+        ids, X = feature_store.employee_matrix(db, model, department="Sales")
+        df = crud.get_employee_features(db, ml_logic.NUMERIC_FEATURES + ml_logic.CATEGORICAL_FEATURES, "Sales", None)
+    expected = model.encode_frame(df.set_index("id").loc[ids].reset_index())
+    np.testing.assert_array_equal(X, expected)
@@ -0,0 +1,54 @@
+"""Tests of the NumPy forest export (src/backend/forest.py) and its serving path."""
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from conftest import ROOT
+
+
+def test_numpy_forest_matches_sklearn():
+    from sklearn.ensemble import RandomForestClassifier
+    from src.backend import forest, ml_logic
+    from src.backend.database import engine
+
+    df = ml_logic.load_training_frame(engine)
+    encoder = ml_logic.FeatureEncoder.from_frame(df)
+    X = encoder.encode_frame(df)
+    y = (df[ml_logic.TARGET] == 'Yes').to_numpy()
+    estimator = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+
+    exported = forest.NumpyForest.from_sklearn(estimator)
+    # Several chunks, the last one partial
+    assert len(X) > 2 * forest.CHUNK_ROWS
+    np.testing.assert_allclose(exported.predict_proba(X), estimator.predict_proba(X), atol=1e-9)
+
+    restored = forest.NumpyForest.from_arrays(exported.to_arrays())
+    np.testing.assert_allclose(restored.predict_proba(X[:7]), estimator.predict_proba(X[:7]), atol=1e-9)
+    assert restored.predict_proba(X[:0]).shape == (0, 2)
+
+
+def test_large_simulation_does_not_import_sklearn(client):
+    """
+    The API serves the NumPy export: a what-if grid of many employees (tens
+    of thousands of scored rows) must not load the pickled estimator.
+    """
+    script = (
+        "import json, sys\n"
+        "from fastapi.testclient import TestClient\n"
+        "from app.fastapi_app import app\n"
+        "with TestClient(app) as c:\n"
+        "    r = c.post('/simulate_attrition', json={'department': 'Sales'})\n"
+        "    print(json.dumps({'status': r.status_code, 'employees': r.json().get('employees'),\n"
+        "                      'sklearn': any(m.split('.')[0] == 'sklearn' for m in sys.modules)}))\n"
+    )
+    env = {**os.environ, "AUTH_REQUIRED": "0"}
+    env.pop("ATTRITION_BATCH_ESTIMATOR_ROWS", None)
+    out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                         capture_output=True, text=True, timeout=300, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["status"] == 200
+    assert result["employees"] > 100
+    assert result["sklearn"] is False
@@ -0,0 +1,61 @@
+"""Tests of the versioned migration runner (src/backend/migrate_db.py)."""
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from conftest import legacy_database
+from src.backend import auth, migrate_db
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """Copy of the bundled database, built before the runner existed."""
+    engine = create_engine(f"sqlite:///{legacy_database(tmp_path / 'hr.db')}")
+    yield engine
+    engine.dispose()
+
+
+def test_pending_migrations_run_once_in_order(legacy_engine):
+    assert migrate_db.current_version(legacy_engine) == 0
+    versions = [number for number, _, _ in migrate_db.MIGRATIONS]
+    assert versions == sorted(versions)
+
+    assert migrate_db.migrate_database(legacy_engine) == versions
+    assert migrate_db.current_version(legacy_engine) == versions[-1]
+    assert migrate_db.migrate_database(legacy_engine) == []
+    with legacy_engine.connect() as conn:
+        recorded = conn.exec_driver_sql("SELECT version, name FROM schema_migrations ORDER BY version").all()
+    assert recorded == [(number, name) for number, name, _ in migrate_db.MIGRATIONS]
+
+
+def test_only_new_migrations_run(legacy_engine, monkeypatch):
+    migrate_db.migrate_database(legacy_engine)
+    calls = []
+    monkeypatch.setattr(migrate_db, "MIGRATIONS", migrate_db.MIGRATIONS + [(99, "test_step", calls.append)])
+    assert migrate_db.migrate_database(legacy_engine) == [99]
+    assert calls == [legacy_engine]
+
+
+def test_data_migrations(legacy_engine):
+    with legacy_engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE employees SET score = NULL, comment = NULL WHERE id % 2 = 0")
+        conn.exec_driver_sql("DELETE FROM users_rh")
+        conn.exec_driver_sql("INSERT INTO users_rh (email, password) VALUES ('old@example.com', 'plaintext')")
+
+    migrate_db.migrate_database(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        assert conn.exec_driver_sql(
+            "SELECT count(*) FROM employees WHERE score IS NULL OR comment IS NULL").scalar() == 0
+        password = conn.exec_driver_sql("SELECT password FROM users_rh").scalar()
+        assert conn.exec_driver_sql("SELECT version FROM data_version").scalar() == 0
+    assert auth.verify_password("plaintext", password)
+    assert {"score", "evaluation_note", "comment"} <= {c["name"] for c in inspect(legacy_engine).get_columns("employees")}
+
+
+def test_fresh_database_gets_the_declared_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    try:
+        migrate_db.migrate_database(engine)
+        assert {"employees", "sales", "RD", "HR", "users_rh", "data_version"} <= set(inspect(engine).get_table_names())
+    finally:
+        engine.dispose()
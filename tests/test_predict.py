@@ -0,0 +1,39 @@
+"""Tests of the input validation of /predict_attrition."""
+import pytest
+
+from src.backend import crud, ml_logic
+from src.backend.database import SessionLocal
+
+
+@pytest.fixture(scope="module")
+def employee():
+    with SessionLocal() as db:
+        emp = crud.get_employee(db, crud.get_max_id(db))
+        return {col: getattr(emp, col) for col in ml_logic.NUMERIC_FEATURES + ml_logic.CATEGORICAL_FEATURES}
+
+
+def test_complete_employee_is_scored(client, auth_headers, employee):
+    response = client.post("/predict_attrition", json={"employee": employee}, headers=auth_headers)
+    assert response.status_code == 200
+    assert 0.0 <= response.json()["probability"] <= 1.0
+
+    as_strings = {col: str(value) for col, value in employee.items()}
+    same = client.post("/predict_attrition", json={"employee": as_strings}, headers=auth_headers)
+    assert same.json()["probability"] == response.json()["probability"]
+
+
+@pytest.mark.parametrize("change, detail", [
+    ({"Age": None, "OverTime": ""}, "Missing required fields: Age, OverTime."),
+    ({"MonthlyIncome": "a lot"}, "Non-numeric values for: MonthlyIncome."),
+])
+def test_bad_employee_fields_are_rejected(client, auth_headers, employee, change, detail):
+    response = client.post("/predict_attrition", json={"employee": {**employee, **change}}, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+def test_missing_field_is_reported(client, auth_headers, employee):
+    partial = {col: value for col, value in employee.items() if col != "JobLevel"}
+    response = client.post("/predict_attrition", json={"employee": partial}, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Missing required fields: JobLevel."
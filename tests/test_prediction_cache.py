@@ -0,0 +1,47 @@
+"""Tests of the attrition prediction cache (src/backend/prediction_cache.py)."""
+import numpy as np
+
+from src.backend.prediction_cache import PredictionCache
+
+
+class CountingModel:
+    def __init__(self, version):
+        self.version = version
+        self.rows = 0
+
+    def predict_proba(self, X):
+        self.rows += len(X)
+        return X[:, 0] * 0.1 + self.version
+
+
+def test_only_missing_rows_are_scored():
+    cache, model = PredictionCache(maxsize=100, ttl=60), CountingModel(1)
+    X = np.arange(12, dtype=np.float32).reshape(6, 2)
+    np.testing.assert_allclose(cache.predict(model, X[:4]), model.predict_proba(X[:4]))
+    model.rows = 0
+
+    np.testing.assert_allclose(cache.predict(model, X), X[:, 0] * 0.1 + 1)
+    assert model.rows == 2
+
+
+def test_new_model_version_and_changed_rows_miss():
+    cache = PredictionCache(maxsize=100, ttl=60)
+    X = np.ones((3, 2), dtype=np.float32)
+    cache.predict(CountingModel(1), X)
+
+    newer = CountingModel(2)
+    np.testing.assert_allclose(cache.predict(newer, X), 1.1 + 1)
+    assert newer.rows == 3
+    changed = X.copy()
+    changed[1, 1] = 5
+    cache.predict(newer, changed)
+    assert newer.rows == 4
+
+
+def test_expired_and_evicted_entries_are_dropped():
+    cache, model = PredictionCache(maxsize=2, ttl=-1), CountingModel(1)
+    X = np.arange(6, dtype=np.float32).reshape(3, 2)
+    cache.predict(model, X)
+    assert cache.stats()["size"] == 2 and cache.stats()["evictions"] == 1
+    cache.predict(model, X[2:])
+    assert cache.stats()["expirations"] == 1
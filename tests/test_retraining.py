@@ -0,0 +1,62 @@
+"""Tests of the training holdout and of the retraining promotion (src/backend/retraining.py)."""
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from src.backend import ml_logic, retraining
+from src.backend.database import SQLALCHEMY_DATABASE_URL, engine
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return ml_logic.load_training_frame(engine)
+
+
+def test_holdout_depends_on_the_id_only():
+    ids = np.arange(1, 20001)
+    mask = ml_logic.holdout_mask(ids)
+    assert 0.18 < mask.mean() < 0.22
+    subset = ids[::7][::-1]
+    np.testing.assert_array_equal(ml_logic.holdout_mask(subset), mask[subset - 1])
+
+
+def test_model_is_not_trained_on_the_holdout(frame):
+    model = ml_logic.train_model(frame, n_estimators=10)
+    held_out = ml_logic.holdout_mask(frame['id'])
+    assert model.metrics["n_train_rows"] == int((~held_out).sum())
+    assert model.metrics["roc_auc"] == ml_logic.holdout_auc(model, frame)
+
+
+def test_train_job_scores_the_served_model_on_the_same_holdout(frame, tmp_path):
+    served = ml_logic.train_model(frame, n_estimators=10, random_state=1)
+    ml_logic.save_model(served, tmp_path)
+
+    version, metrics, baseline = retraining._train_job(SQLALCHEMY_DATABASE_URL, tmp_path)
+    assert version == 2 and ml_logic.current_version(tmp_path) == 1
+    assert baseline == (1, ml_logic.holdout_auc(ml_logic.load_model(1, tmp_path), frame))
+    assert metrics["roc_auc"] == ml_logic.holdout_auc(ml_logic.load_model(2, tmp_path), frame)
+
+
+@pytest.mark.parametrize("candidate, baseline, status", [
+    (0.80, 0.80, "promoted"),
+    (0.80, 0.805, "promoted"),
+    (0.78, 0.80, "rejected"),
+    (0.70, None, "promoted"),
+])
+def test_promotion_compares_the_two_holdout_scores(frame, tmp_path, monkeypatch, candidate, baseline, status):
+    ml_logic.save_model(ml_logic.train_model(frame, n_estimators=5), tmp_path, promote=False)
+    swapped = []
+    monkeypatch.setattr(ml_logic, "set_model", swapped.append)
+    monkeypatch.setattr(retraining, "RETRAIN_AUC_TOLERANCE", 0.01)
+
+    manager = retraining.RetrainingManager(SQLALCHEMY_DATABASE_URL, model_dir=tmp_path)
+    future = Future()
+    future.set_result((1, {"roc_auc": candidate}, None if baseline is None else (7, baseline)))
+    manager._on_done(future, "test", 0.0)
+    manager._executor.shutdown()
+
+    assert manager.last_result["status"] == status
+    assert manager.last_result["baseline_roc_auc"] == baseline
+    assert bool(swapped) == (status == "promoted")
+    assert (tmp_path / ml_logic.CURRENT_POINTER).exists() == (status == "promoted")
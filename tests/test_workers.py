@@ -0,0 +1,76 @@
+"""Tests of the data version, the caches keyed on it and the worker file locks (src/backend/workers.py)."""
+from src.backend import workers
+from src.backend.database import SessionLocal, engine
+
+
+def _version():
+    with SessionLocal() as db:
+        return workers.data_version(db)
+
+
+def test_triggers_count_tracked_writes_only(client):
+    with engine.begin() as conn:
+        emp_id = conn.exec_driver_sql("SELECT min(id) FROM employees").scalar()
+    start = _version()
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE employees SET score = 0.5, comment = 'x', evaluation_note = 3 WHERE id = ?", (emp_id,))
+    assert _version() == start
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE employees SET JobSatisfaction = JobSatisfaction WHERE id = ?", (emp_id,))
+    assert _version() == start + 1
+    with engine.begin() as conn:
+        conn.exec_driver_sql('UPDATE "HR" SET Age = Age WHERE id = (SELECT min(id) FROM "HR")')
+    assert _version() == start + 2
+
+
+def test_versioned_cache():
+    cache = workers.VersionedCache()
+    calls = []
+
+    def compute(value):
+        return lambda: calls.append(value) or value
+
+    assert cache.get("k", 1, compute("a")) == "a"
+    assert cache.get("k", 1, compute("b")) == "a"
+    assert cache.get("k", 2, compute("c")) == "c"
+    # A slow request of an older version does not replace the newer value
+    assert cache.get("k", 1, compute("old")) == "old"
+    assert cache.get("k", 2, compute("d")) == "c"
+    # No version (counter not installed): never cached
+    assert cache.get("k", None, compute("e")) == "e"
+    assert calls == ["a", "c", "old", "e"]
+    assert cache.stats()["hits"] == 2
+
+
+def test_stats_are_recomputed_after_a_write(client, auth_headers):
+    before = client.get("/stats", headers=auth_headers).json()
+    hits = workers.stats_cache.hits
+    assert client.get("/stats", headers=auth_headers).json() == before
+    assert workers.stats_cache.hits == hits + 1
+
+    # Written outside the API, as another worker or a script would
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE employees SET Attrition = 'Yes' WHERE id IN "
+                             "(SELECT id FROM employees WHERE Attrition = 'No' LIMIT 50)")
+    after = client.get("/stats", headers=auth_headers).json()
+    assert after["total"] == before["total"]
+    assert float(after["attrition"].rstrip("%")) > float(before["attrition"].rstrip("%"))
+
+
+def test_file_lock_is_exclusive_across_holders(tmp_path):
+    first = workers.FileLock(tmp_path / "job.lock")
+    second = workers.FileLock(tmp_path / "job.lock")
+    assert first.acquire(blocking=False)
+    assert not second.acquire(blocking=False)
+    first.release()
+    assert second.acquire(blocking=False)
+    second.release()
+
+
+def test_shared_secret_is_drawn_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(workers, "WORKER_STATE_DIR", tmp_path)
+    secret = workers.shared_secret("key")
+    assert len(secret) == 32
+    assert workers.shared_secret("key") == secret